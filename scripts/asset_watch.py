@@ -0,0 +1,60 @@
+"""
+Source polling for the asset scripts' --watch modes
+
+Polls directories with os.scandir (no inotify dependency, works the same on
+Windows and inside Blender) and yields debounced batches of changed paths, so
+an editor's save-rename-touch sequence triggers one rebuild.
+"""
+
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+POLL_INTERVAL = 0.5  # Seconds between directory scans
+DEBOUNCE = 0.75  # Quiet period before a batch is released
+
+
+def snapshot(roots: Iterable[str], suffixes: Tuple[str, ...]) -> Dict[str, Tuple[int, int]]:
+    """(mtime_ns, size) for every file directly inside roots whose name ends with one of suffixes"""
+    state = {}
+    for root in roots:
+        try:
+            entries = list(os.scandir(root))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(suffixes):
+                try:
+                    stat = entry.stat()
+                except OSError:  # Removed or replaced between scandir and stat
+                    continue
+                state[os.path.normpath(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def diff(before: Dict[str, Tuple[int, int]], after: Dict[str, Tuple[int, int]]) -> List[str]:
+    """Paths added, removed or modified between two snapshots"""
+    return sorted(path for path in set(before) | set(after) if before.get(path) != after.get(path))
+
+
+def watch(roots: Iterable[str], suffixes: Tuple[str, ...],
+          interval: float = POLL_INTERVAL, debounce: float = DEBOUNCE) -> Iterator[List[str]]:
+    """Yield sorted lists of changed paths, each released once the sources have been quiet for `debounce`"""
+    roots = list(roots)
+    suffixes = tuple(suffix.lower() for suffix in suffixes)
+    state = snapshot(roots, suffixes)
+    pending = set()
+    last_change = 0.0
+
+    while True:
+        time.sleep(interval)
+        current = snapshot(roots, suffixes)
+        changed = diff(state, current)
+        state = current
+        if changed:
+            pending.update(changed)
+            last_change = time.monotonic()
+        elif pending and time.monotonic() - last_change >= debounce:
+            batch = sorted(pending)
+            pending.clear()
+            yield batch
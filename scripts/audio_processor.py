@@ -8,191 +8,849 @@ import os
 import glob
 import subprocess
 import json
+import mmap
+import struct
+import collections
+import hashlib
+import tempfile
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
-
-# Audio categories based on AUDIO_LIST.md
-AUDIO_CATEGORIES = {
-    'combat': [
-        'shotgun_fire', 'shotgun_empty', 'shotgun_reload',
-        'hatchet_swing', 'hatchet_hit_flesh', 'hatchet_miss',
-        'Heavy_double-barrel', 'Dry_click_of_empty', 'Shotgun_shell_loadin',
-        'Fast_whoosh_sound'
-    ],
-    'nightman': [
-        'nightman_footstep_heavy', 'nightman_footstep_light',
-        'nightman_growl_low', 'nightman_growl_aggressive',
-        'nightman_attack_swing', 'nightman_attack_hit',
-        'nightman_damaged', 'nightman_death',
-        'Massive_creature_foo', 'Heavy_human-sized_fo',
-        'Deep_guttural_monste', 'guttural_demon_hunti',
-        'Massive_creature_arm', 'Heavy_impact_of_mons',
-        'Monster_pain_roar', 'Massive_creature_dyi'
-    ],
-    'transformation': [
-        'bone_crack_1', 'bone_crack_2', 'bone_crack_3',
-        'transformation_whoosh', 'transformation_complete',
-        'Wet_bone_snapping', 'Multiple_bones_break',
-        'Final_massive_bone', 'Dark_ethereal_whoosh',
-        'Ominous_low_rumble'
-    ],
-    'environment': [
-        'window_tap_light', 'window_tap_heavy', 'window_scratch',
-        'window_break', 'door_creak', 'door_rattle',
-        'door_bang_heavy', 'door_splinter',
-        'Light_tapping_on_woo', 'Heavy_pounding_on_wo',
-        'Sharp_claws_scratchi', 'wooden_board_shatter',
-        'Door_handle_rattling', 'Massive_impact_on_wo',
-        'Wood_door_splinterin', 'qubodup-DoorClose08',
-        'qubodup-DoorOpen08'
-    ],
-    'items': [
-        'ammo_pickup', 'wood_pickup', 'board_hammer',
-        'pickup_ammo_sound', 'wood_pickup_sound',
-        'Hammering_nail_into', 'tree_falls_down'
-    ],
-    'player': [
-        'player_hit_light', 'player_hit_heavy',
-        'player_death', 'player_heartbeat',
-        'Male_grunt_of_pain', 'Male_scream_of_agony',
-        'Male_death_scream', 'Realistic_heartbeat'
-    ],
-    'ambient': [
-        'forest_night_loop', 'wind_trees',
-        'cabin_ambience', 'nightman_roar_distant',
-        'stepdirt_1', 'stepdirt_2', 'stepwood_1', 'stepwood_2'
-    ]
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import asset_watch
+import build_trace
+
+try:
+    import numpy as np
+except ImportError:  # Level analysis is skipped and loudnorm falls back to one dynamic pass
+    np = None
+
+# Canonical naming: source file -> (category, sound name). The sound name is
+# both the optimized filename and the AUDIO_MAP key; sources not listed here
+# fall back to a cleaned-up version of their filename in 'ambient'.
+AUDIO_NAME_MAP = {
+    # Combat
+    'Dry_click_of_empty_s_#2-1763683111170.wav': ('combat', 'shotgun_empty'),
+    'Fast_whoosh_sound_of_#3-1763683219815.wav': ('combat', 'hatchet_swing'),
+    'Heavy_double-barrel__#2-1763683055686.wav': ('combat', 'shotgun_fire'),
+    'Shotgun_shell_loadin_#1-1763683158583.wav': ('combat', 'shotgun_reload'),
+
+    # Environment
+    'Door_handle_rattling_#2-1763684186572.wav': ('environment', 'door_rattle'),
+    'Heavy_pounding_on_wo_#4-1763684029508.wav': ('environment', 'door_pound'),
+    'Light_tapping_on_woo_#2-1763683991424.wav': ('environment', 'door_tap'),
+    'Massive_impact_on_wo_#1-1763684246255.wav': ('environment', 'door_massive_impact'),
+    'Sharp_claws_scratchi_#1-1763684067918.wav': ('environment', 'door_scratch'),
+    'Wood_door_splinterin_#4-1763684274266.wav': ('environment', 'door_splinter'),
+    'wooden_board_shatter_#2-1763684119044.wav': ('environment', 'board_shatter'),
+    'qubodup-DoorOpen08.ogg': ('environment', 'door_open'),
+    'qubodup-DoorClose08.ogg': ('environment', 'door_close'),
+
+    # Items
+    'Hammering_nail_into__#3-1763684400437.wav': ('items', 'board_hammer'),
+    'pickup_ammo_sound_#1-1763684347169.wav': ('items', 'pickup_ammo'),
+    'tree_falls_down_quic_#2-1763683271220.wav': ('items', 'tree_fall'),
+    'wood_pickup_sound_#2-1763684367832.wav': ('items', 'pickup_wood'),
+
+    # Player
+    'Male_death_scream_fa_#4-1763684477796.wav': ('player', 'player_death'),
+    'Male_grunt_of_pain,__#2-1763684423615.wav': ('player', 'player_hurt_light'),
+    'Male_scream_of_agony_#2-1763684450948.wav': ('player', 'player_hurt_heavy'),
+    'Realistic_heartbeat__#1-1763684522415.wav': ('player', 'player_heartbeat'),
+
+    # Transformation
+    'Dark_ethereal_whoosh_#2-1763683876072.wav': ('transformation', 'transform_whoosh'),
+    'Final_massive_bone_r_#3-1763683841953.wav': ('transformation', 'transform_bones_final'),
+    'Multiple_bones_break_#3-1763683811146.wav': ('transformation', 'transform_bones_break'),
+    'Ominous_low_rumble_w_#4-1763683913346.wav': ('transformation', 'transform_rumble'),
+    'Wet_bone_snapping_an_#3-1763683777763.wav': ('transformation', 'transform_bones_snap'),
+
+    # Nightman (monster sounds)
+    'Deep_guttural_monste_#4-1763683426669.wav': ('nightman', 'nightman_growl'),
+    'Heavy_human-sized_fo_#2-1763683393491.wav': ('nightman', 'nightman_footsteps'),
+    'Heavy_impact_of_mons_#3-1763683663265.wav': ('nightman', 'nightman_impact'),
+    'Massive_creature_arm_#2-1763683621031.wav': ('nightman', 'nightman_arm_swing'),
+    'Massive_creature_dyi_#2-1763683738671.wav': ('nightman', 'nightman_death'),
+    'Massive_creature_foo_#1-1763683353068.wav': ('nightman', 'nightman_stomp'),
+    'Monster_pain_roar,_a_#2-1763683706293.wav': ('nightman', 'nightman_pain'),
+    'guttural_demon_hunti_#4-1763683577323.wav': ('nightman', 'nightman_hunt'),
+
+    # Ambient
+    'forest_night_loop.ogg': ('ambient', 'forest_night_loop'),
+    'wind_trees.ogg': ('ambient', 'wind_trees'),
+    'stepdirt_1.wav': ('ambient', 'stepdirt_1'),
+    'stepdirt_2.wav': ('ambient', 'stepdirt_2'),
+    'stepwood_1.wav': ('ambient', 'stepwood_1'),
+    'stepwood_2.wav': ('ambient', 'stepwood_2'),
 }
 
+# Sound names per category, derived from the naming table
+AUDIO_CATEGORIES = {}
+for _category, _name in AUDIO_NAME_MAP.values():
+    AUDIO_CATEGORIES.setdefault(_category, []).append(_name)
+
+# Persistent build cache (kept out of public/ so it is never deployed)
+CACHE_PATH = Path('.cache/audio_processor.json')
+CACHE_VERSION = 6
+
+# Categories packed into one sprite file each; ambient loops stream on their own
+SPRITE_CATEGORIES = ['combat', 'environment', 'items', 'player', 'nightman', 'transformation']
+SPRITE_PADDING = 0.1  # Seconds of silence between clips
+
+# Loudness target for categories with 'normalize' (EBU R128 style, web SFX level)
+LOUDNORM_TARGET = {'I': -16.0, 'TP': -1.5, 'LRA': 11.0}
+
+# Level analysis
+SILENCE_THRESHOLD_DB = -60.0  # Samples below this (dBFS) count as silence
+TRIM_PADDING = 0.005  # Seconds kept either side of the sound when trimming silence
+
+ANALYSIS_SEGMENTS_PER_BLOCK = 10  # 100 ms segments per block read from disk
+TRUE_PEAK_OVERSAMPLING = 4
+
+# Sounds played with setLoop(true): get loop points instead of silence trimming
+LOOP_SOUNDS = {'forest_night_loop', 'wind_trees'}
+LOOP_SEARCH_SECONDS = 1.0  # Region at each end searched for loop points
+LOOP_MATCH_SECONDS = 0.01  # Waveform compared after each candidate point
+LOOP_MAX_CANDIDATES = 512
+
+# Opus output (--opus): libopus only runs at 48 kHz and WebM plays in more
+# browsers than Ogg Opus. Order is the runtime preference.
+OPUS_SAMPLE_RATE = 48000
+AUDIO_FORMATS = ['webm', 'ogg']
+
+# Decoded AudioBuffers are float32 at the AudioContext rate, not the file rate
+DECODED_SAMPLE_RATE = 48000
+DECODED_BYTES_PER_SAMPLE = 4
+
+# Preload tiers, first matching rule wins. 'critical' is decoded at boot,
+# 'lazy' on first use, 'stream' plays through a media element and is never
+# decoded whole. A rule matches when all of its conditions hold: categories, keys, min_duration.
+PRELOAD_TIER_RULES = [
+    {'tier': 'stream', 'categories': ['ambient'], 'min_duration': 10.0},
+    {'tier': 'critical', 'categories': ['combat', 'player']},
+    {'tier': 'critical', 'keys': ['door_open', 'door_close']},
+    {'tier': 'lazy'},
+]
+CRITICAL_BUDGET_KB = 6144  # Decoded memory allowed for the critical tier
+
+# Per-file Vorbis quality search: candidates up to the profile's 'quality' are
+# scored by log-spectral distance to the processed source, score = exp(-LSD_dB / 10)
+QUALITY_SEARCH_LEVELS = [0, 1, 2, 3, 4, 5, 6, 7, 8]
+QUALITY_SEARCH_MIN_SCORE = 0.9  # ~1 dB mean log-spectral distance
+SPECTRAL_FRAME = 2048  # Samples per analysis frame
+SPECTRAL_BANDS = 32  # Log-spaced bands from SPECTRAL_MIN_HZ to Nyquist
+SPECTRAL_MIN_HZ = 50.0
+SPECTRAL_FLOOR_DB = 60.0  # Band powers this far below the loudest band are clamped
+
 # Optimization settings per category
 OPTIMIZATION_PROFILES = {
     'combat': {
         'format': 'ogg',
         'bitrate': '96k',  # High quality for impact
+        'opus_bitrate': '48k',  # Opus needs about half the Vorbis rate on short mono SFX
         'sample_rate': 44100,
         'channels': 1,  # Mono for SFX
         'normalize': True,
         'compression': 'vorbis',
-        'quality': 6  # 0-10, 6 = ~96kbps
+        'quality': 6,  # 0-10, 6 = ~96kbps
+        'silence_threshold_db': -55.0  # Keep quiet mechanical pre-clicks
     },
     'nightman': {
         'format': 'ogg',
         'bitrate': '80k',  # Good quality for creature sounds
+        'opus_bitrate': '40k',
         'sample_rate': 44100,
         'channels': 1,
         'normalize': True,
         'compression': 'vorbis',
-        'quality': 5
+        'quality': 5,
+        'silence_threshold_db': -50.0
     },
     'transformation': {
         'format': 'ogg',
         'bitrate': '96k',  # Higher quality for dramatic effect
+        'opus_bitrate': '48k',
         'sample_rate': 44100,
         'channels': 1,
         'normalize': True,
         'compression': 'vorbis',
-        'quality': 6
+        'quality': 6,
+        'silence_threshold_db': -55.0
     },
     'environment': {
         'format': 'ogg',
         'bitrate': '64k',  # Medium quality for ambient
+        'opus_bitrate': '32k',
         'sample_rate': 44100,
         'channels': 1,
         'normalize': True,
         'compression': 'vorbis',
-        'quality': 4
+        'quality': 4,
+        'silence_threshold_db': -50.0
     },
     'items': {
         'format': 'ogg',
         'bitrate': '64k',
+        'opus_bitrate': '32k',
         'sample_rate': 44100,
         'channels': 1,
         'normalize': True,
         'compression': 'vorbis',
-        'quality': 4
+        'quality': 4,
+        'silence_threshold_db': -50.0
     },
     'player': {
         'format': 'ogg',
         'bitrate': '80k',
+        'opus_bitrate': '40k',
         'sample_rate': 44100,
         'channels': 1,
         'normalize': True,
         'compression': 'vorbis',
-        'quality': 5
+        'quality': 5,
+        'silence_threshold_db': -50.0
     },
     'ambient': {
         'format': 'ogg',
         'bitrate': '96k',  # Higher for loops
+        'opus_bitrate': '64k',
         'sample_rate': 44100,
         'channels': 2,  # Stereo for ambient
         'normalize': False,  # Keep dynamic range
         'compression': 'vorbis',
-        'quality': 6
+        'quality': 6,
+        'silence_threshold_db': -60.0
     }
 }
 
 
-def analyze_audio_file(filepath: str) -> Dict:
-    """Analyze audio file using ffprobe"""
-    try:
-        cmd = [
-            'ffprobe',
-            '-v', 'quiet',
-            '-print_format', 'json',
-            '-show_format',
-            '-show_streams',
-            filepath
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        data = json.loads(result.stdout)
-
-        if 'streams' in data and len(data['streams']) > 0:
-            stream = data['streams'][0]
-            format_info = data.get('format', {})
+# WAVE format tags -> ffprobe codec names (PCM widths resolved in wav_codec_name)
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_ALAW = 0x0006
+WAVE_FORMAT_MULAW = 0x0007
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def wav_codec_name(format_tag: int, bits_per_sample: int) -> Optional[str]:
+    """Map a WAVE format tag and sample width to ffprobe's codec_name"""
+    if format_tag == WAVE_FORMAT_PCM:
+        if bits_per_sample == 8:
+            return 'pcm_u8'
+        if bits_per_sample in (16, 24, 32):
+            return f'pcm_s{bits_per_sample}le'
+    elif format_tag == WAVE_FORMAT_IEEE_FLOAT and bits_per_sample in (32, 64):
+        return f'pcm_f{bits_per_sample}le'
+    elif format_tag == WAVE_FORMAT_ALAW:
+        return 'pcm_alaw'
+    elif format_tag == WAVE_FORMAT_MULAW:
+        return 'pcm_mulaw'
+    return None
+
+
+def read_wav_header(data: memoryview) -> Optional[Dict]:
+    """Read codec, rate, channels and sample count from RIFF/WAVE fmt/data chunks"""
+    if len(data) < 12 or data[0:4] != b'RIFF' or data[8:12] != b'WAVE':
+        return None
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = bytes(data[offset:offset + 4])
+        chunk_size, = struct.unpack_from('<I', data, offset + 4)
+        body = offset + 8
 
+        if chunk_id == b'fmt ' and chunk_size >= 16:
+            format_tag, channels, sample_rate, _, block_align, bits = struct.unpack_from('<HHIIHH', data, body)
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                # First two bytes of the SubFormat GUID hold the real format tag
+                format_tag, = struct.unpack_from('<H', data, body + 24)
+            fmt = (format_tag, channels, sample_rate, block_align, bits)
+        elif chunk_id == b'data' and fmt:
+            format_tag, channels, sample_rate, block_align, bits = fmt
+            codec = wav_codec_name(format_tag, bits)
+            if not codec or not sample_rate or not block_align:
+                return None
+            # Streamed/truncated files can claim more data than they hold
+            data_size = min(chunk_size, len(data) - body)
             return {
+                'codec': codec,
+                'sample_rate': sample_rate,
+                'channels': channels,
+                'samples': data_size // block_align,
+                'data_offset': body,
+                'data_size': data_size
+            }
+
+        offset = body + chunk_size + (chunk_size & 1)  # Chunks are word aligned
+
+    return None
+
+
+def read_ogg_header(data: memoryview, mm: mmap.mmap) -> Optional[Dict]:
+    """Read codec, rate and channels from the first Ogg packet and length from the last granule"""
+    if len(data) < 27 or data[0:4] != b'OggS':
+        return None
+
+    serial, = struct.unpack_from('<I', data, 14)
+    segments = data[26]
+    packet = 27 + segments
+    head = bytes(data[packet:packet + 19])
+
+    if head[:7] == b'\x01vorbis':
+        codec = 'vorbis'
+        channels = head[11]
+        sample_rate, = struct.unpack_from('<I', head, 12)
+        pre_skip = 0
+    elif head[:8] == b'OpusHead':
+        # Opus always decodes at 48 kHz regardless of the input rate field
+        codec = 'opus'
+        channels = head[9]
+        pre_skip, = struct.unpack_from('<H', head, 10)
+        sample_rate = 48000
+    else:
+        return None
+
+    # Walk back from the end to the last page of this stream with a granule position
+    end = len(data)
+    while True:
+        page = mm.rfind(b'OggS', 0, end)
+        if page < 0 or page + 27 > len(data):
+            return None
+        granule, = struct.unpack_from('<q', data, page + 6)
+        page_serial, = struct.unpack_from('<I', data, page + 14)
+        if page_serial == serial and granule >= 0:
+            break
+        end = page
+
+    return {
+        'codec': codec,
+        'sample_rate': sample_rate,
+        'channels': channels,
+        'samples': max(0, granule - pre_skip)
+    }
+
+
+def read_audio_header(filepath: str) -> Optional[Dict]:
+    """Parse WAV/Ogg headers in-process, mapping the file instead of reading it"""
+    try:
+        with open(filepath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = memoryview(mm)
+                try:
+                    header = read_wav_header(data) or read_ogg_header(data, mm)
+                finally:
+                    data.release()
+    except (OSError, ValueError, struct.error):
+        return None
+
+    if not header or not header['sample_rate'] or not header['samples']:
+        return None
+
+    # Match ffprobe: duration rounds to whole microseconds and the container
+    # bit rate is file size over that duration
+    size = os.path.getsize(filepath)
+    duration_us = (header['samples'] * 1000000 + header['sample_rate'] // 2) // header['sample_rate']
+    return {
+        'codec': header['codec'],
+        'sample_rate': header['sample_rate'],
+        'channels': header['channels'],
+        'bitrate': (size * 8 * 1000000 // duration_us) // 1000 if duration_us else 0,
+        'duration': duration_us / 1000000
+    }
+
+
+def probe_audio_file(filepath: str) -> Optional[Dict]:
+    """Read stream properties with ffprobe"""
+    cmd = [
+        'ffprobe',
+        '-v', 'quiet',
+        '-print_format', 'json',
+        '-show_format',
+        '-show_streams',
+        filepath
+    ]
+    result = build_trace.run(cmd, file=filepath, capture_output=True, text=True)
+    data = json.loads(result.stdout)
+
+    if 'streams' in data and len(data['streams']) > 0:
+        stream = data['streams'][0]
+        format_info = data.get('format', {})
+
+        return {
+            'codec': stream.get('codec_name', 'unknown'),
+            'sample_rate': int(stream.get('sample_rate', 0)),
+            'channels': stream.get('channels', 0),
+            'bitrate': int(format_info.get('bit_rate', 0)) // 1000 if 'bit_rate' in format_info else 0,
+            'duration': float(format_info.get('duration', 0))
+        }
+    return None
+
+
+def analyze_audio_file(filepath: str, levels: bool = False,
+                       silence_db: float = SILENCE_THRESHOLD_DB, loop: bool = False) -> Dict:
+    """Analyze audio file from its headers, falling back to ffprobe for unknown formats"""
+    try:
+        with build_trace.span('probe', 'analyze', file=filepath):
+            stream = read_audio_header(filepath) or probe_audio_file(filepath)
+        if stream:
+            info = {
                 'file': os.path.basename(filepath),
                 'size_kb': os.path.getsize(filepath) / 1024,
-                'codec': stream.get('codec_name', 'unknown'),
-                'sample_rate': int(stream.get('sample_rate', 0)),
-                'channels': stream.get('channels', 0),
-                'bitrate': int(format_info.get('bit_rate', 0)) // 1000 if 'bit_rate' in format_info else 0,
-                'duration': float(format_info.get('duration', 0))
+                **stream
             }
+            if levels and np is not None:
+                with build_trace.span('levels', 'analyze', file=filepath, bytes=int(info['size_kb'] * 1024)):
+                    info['levels'] = measure_levels(filepath, stream['channels'], silence_db)
+                if loop:
+                    with build_trace.span('loop_points', 'analyze', file=filepath):
+                        info['loop'] = find_loop_points(filepath, stream['channels'])
+            return info
     except Exception as e:
         print(f"Error analyzing {filepath}: {e}")
         return None
 
 
+def verify_audio_headers(filepaths: List[str]) -> int:
+    """Compare the in-process header reader against ffprobe, returning the mismatch count"""
+    mismatches = 0
+    for filepath in filepaths:
+        ours = read_audio_header(filepath)
+        theirs = probe_audio_file(filepath)
+        if ours is None:
+            print(f"  [FALLBACK] {os.path.basename(filepath)}: not parseable in-process")
+        elif ours != theirs:
+            mismatches += 1
+            print(f"  [MISMATCH] {os.path.basename(filepath)}")
+            print(f"    header:  {ours}")
+            print(f"    ffprobe: {theirs}")
+    return mismatches
+
+
+def iter_wav_blocks(filepath: str, block_frames: int) -> Optional[Iterator]:
+    """Yield float64 (frames, channels) blocks from a memory-mapped WAV"""
+    f = open(filepath, 'rb')
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mm)
+    try:
+        header = read_wav_header(view)
+    finally:
+        view.release()
+    if not header or header['codec'] in ('pcm_alaw', 'pcm_mulaw'):
+        mm.close()
+        f.close()
+        return None
+
+    def blocks():
+        raw = None
+        try:
+            channels = header['channels']
+            codec = header['codec']
+            width = {'pcm_u8': 1, 'pcm_s16le': 2, 'pcm_s24le': 3, 'pcm_s32le': 4,
+                     'pcm_f32le': 4, 'pcm_f64le': 8}[codec]
+            frame_bytes = width * channels
+            offset = header['data_offset']
+            end = offset + header['samples'] * frame_bytes
+
+            while offset < end:
+                count = min(block_frames * frame_bytes, end - offset)
+                raw = np.frombuffer(mm, dtype=np.uint8, count=count, offset=offset)
+                if codec == 'pcm_u8':
+                    samples = (raw.astype(np.float64) - 128.0) / 128.0
+                elif codec == 'pcm_s16le':
+                    samples = raw.view('<i2') / 32768.0
+                elif codec == 'pcm_s24le':
+                    b = raw.reshape(-1, 3).astype(np.int32)
+                    samples = ((b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) << 8 >> 8) / 8388608.0
+                elif codec == 'pcm_s32le':
+                    samples = raw.view('<i4') / 2147483648.0
+                else:
+                    samples = raw.view('<f4' if width == 4 else '<f8').astype(np.float64)
+                yield samples.reshape(-1, channels)
+                offset += count
+        finally:
+            # Views into the map must be dropped before it can close
+            del raw
+            mm.close()
+            f.close()
+
+    return blocks()
+
+
+def iter_decoded_blocks(filepath: str, channels: int, block_frames: int,
+                        decode_args: Optional[List[str]] = None) -> Iterator:
+    """Yield float64 (frames, channels) blocks decoded by an ffmpeg pipe (non-WAV sources)
+
+    decode_args (filters, -ac/-ar) go between the input and the raw output; they
+    must leave the stream with `channels` channels.
+    """
+    cmd = (['ffmpeg', '-v', 'quiet', '-i', filepath] + (decode_args or [])
+           + ['-f', 'f32le', '-acodec', 'pcm_f32le', '-'])
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    block_bytes = block_frames * channels * 4
+    try:
+        while True:
+            chunk = proc.stdout.read(block_bytes)
+            # Keep whole frames only
+            chunk = chunk[:len(chunk) - len(chunk) % (channels * 4)]
+            if not chunk:
+                break
+            yield np.frombuffer(chunk, dtype='<f4').astype(np.float64).reshape(-1, channels)
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+
+def iter_pcm_blocks(filepath: str, channels: int, block_frames: int) -> Iterator:
+    """Yield float64 sample blocks, memory-mapping WAVs and decoding anything else"""
+    blocks = iter_wav_blocks(filepath, block_frames)
+    if blocks is None:
+        blocks = iter_decoded_blocks(filepath, channels, block_frames)
+    return blocks
+
+
+def k_weighting_power(sample_rate: int, n: int):
+    """Power response of the BS.1770 K-weighting filter at the rfft bins of an n-point block"""
+    def biquad_power(b, a, w):
+        z = np.exp(-1j * w)
+        return np.abs((b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)) ** 2
+
+    w = 2 * np.pi * np.fft.rfftfreq(n)
+
+    # Stage 1: +4 dB high shelf at 1500 Hz (head diffraction)
+    A = 10 ** (4.0 / 40)
+    w0 = 2 * np.pi * 1500.0 / sample_rate
+    alpha = np.sin(w0) / (2 * (1 / np.sqrt(2)))
+    cos_w0 = np.cos(w0)
+    shelf_b = [A * ((A + 1) + (A - 1) * cos_w0 + 2 * np.sqrt(A) * alpha),
+               -2 * A * ((A - 1) + (A + 1) * cos_w0),
+               A * ((A + 1) + (A - 1) * cos_w0 - 2 * np.sqrt(A) * alpha)]
+    shelf_a = [(A + 1) - (A - 1) * cos_w0 + 2 * np.sqrt(A) * alpha,
+               2 * ((A - 1) - (A + 1) * cos_w0),
+               (A + 1) - (A - 1) * cos_w0 - 2 * np.sqrt(A) * alpha]
+
+    # Stage 2: RLB high pass at 38 Hz
+    w0 = 2 * np.pi * 38.0 / sample_rate
+    alpha = np.sin(w0) / (2 * 0.5)
+    cos_w0 = np.cos(w0)
+    hp_b = [(1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2]
+    hp_a = [1 + alpha, -2 * cos_w0, 1 - alpha]
+
+    return biquad_power(shelf_b, shelf_a, w) * biquad_power(hp_b, hp_a, w)
+
+
+def true_peak_phases(oversampling: int, taps_per_phase: int = 12):
+    """Polyphase windowed-sinc interpolation filters for true-peak estimation"""
+    n = np.arange(oversampling * taps_per_phase) - (oversampling * taps_per_phase - 1) / 2
+    h = np.sinc(n / oversampling) * np.hanning(len(n))
+    return [h[p::oversampling] for p in range(oversampling)]
+
+
+def gated_loudness(energies, gate_offset: float) -> Tuple[Optional[float], Optional[float]]:
+    """Apply the -70 LUFS absolute gate and a relative gate, returning (loudness, threshold)"""
+    loudness = -0.691 + 10 * np.log10(np.maximum(energies, 1e-20))
+    above_abs = energies[loudness > -70.0]
+    if not above_abs.size:
+        return None, None
+    threshold = -0.691 + 10 * np.log10(above_abs.mean()) + gate_offset
+    gated = energies[(loudness > -70.0) & (loudness > threshold)]
+    return -0.691 + 10 * np.log10(gated.mean()), threshold
+
+
+def measure_levels(filepath: str, channels: int, silence_db: float = SILENCE_THRESHOLD_DB) -> Optional[Dict]:
+    """Block-wise level analysis: sample/true peak, RMS, BS.1770 loudness, LRA, silence, DC
+
+    K-weighted energy is computed per 100 ms segment in the frequency domain,
+    which keeps the whole pass vectorized at the cost of ignoring filter state
+    across segment boundaries (well under 0.1 LU on real material).
+    """
+    header = read_audio_header(filepath)
+    if not header:
+        return None
+    sample_rate = header['sample_rate']
+    segment = int(round(sample_rate * 0.1))
+    block_frames = segment * ANALYSIS_SEGMENTS_PER_BLOCK
+
+    blocks = iter_pcm_blocks(filepath, channels, block_frames)
+
+    # Parseval weights for a real FFT: interior bins appear twice in the full spectrum
+    bin_weights = np.full(segment // 2 + 1, 2.0)
+    bin_weights[0] = 1.0
+    if segment % 2 == 0:
+        bin_weights[-1] = 1.0
+    bin_weights *= k_weighting_power(sample_rate, segment) / (segment * segment)
+
+    phases = true_peak_phases(TRUE_PEAK_OVERSAMPLING)
+    history = None
+    silence = 10 ** (silence_db / 20)
+
+    peak = true_peak = 0.0
+    sum_squares = sum_samples = 0.0
+    total_frames = 0
+    first_sound = last_sound = None
+    segment_energy = []
+
+    for block in blocks:
+        frames = len(block)
+        magnitude = np.abs(block).max(axis=1)
+        peak = max(peak, float(magnitude.max()))
+        sum_squares += float(np.square(block).sum())
+        sum_samples += float(block.sum())
+
+        loud = np.flatnonzero(magnitude > silence)
+        if loud.size:
+            if first_sound is None:
+                first_sound = total_frames + int(loud[0])
+            last_sound = total_frames + int(loud[-1])
+
+        # Incomplete trailing segments are ignored, as BS.1770 ignores partial blocks
+        whole = frames // segment
+        if whole:
+            spectra = np.fft.rfft(block[:whole * segment].reshape(whole, segment, -1), axis=1)
+            energy = (np.abs(spectra) ** 2 * bin_weights[None, :, None]).sum(axis=1)
+            segment_energy.append(energy.sum(axis=1))  # Channel weights are 1.0 for mono/stereo
+
+        # Interpolate between samples, carrying filter history across blocks
+        history = block[:0] if history is None else history
+        extended = np.concatenate([history, block])
+        for phase in phases:
+            for channel in range(extended.shape[1]):
+                interpolated = np.convolve(extended[:, channel], phase, mode='valid')
+                if interpolated.size:
+                    true_peak = max(true_peak, float(np.abs(interpolated).max()))
+        history = extended[-(len(phases[0]) - 1):]
+
+        total_frames += frames
+
+    if not total_frames:
+        return None
+    true_peak = max(true_peak, peak)
+
+    def to_db(value):
+        return round(20 * float(np.log10(value)), 2) if value > 0 else None
+
+    levels = {
+        'peak_dbfs': to_db(peak),
+        'true_peak_dbtp': to_db(true_peak),
+        'rms_dbfs': to_db(np.sqrt(sum_squares / (total_frames * channels))),
+        'lufs': None,
+        'lra': 0.0,
+        'loudness_threshold': None,
+        'silence_threshold_db': silence_db,
+        'leading_silence': round((first_sound if first_sound is not None else total_frames) / sample_rate, 4),
+        'trailing_silence': round((total_frames - 1 - last_sound if last_sound is not None else total_frames) / sample_rate, 4),
+        'dc_offset': round(sum_samples / (total_frames * channels), 6)
+    }
+
+    if segment_energy:
+        energies = np.concatenate(segment_energy)
+        cumulative = np.concatenate([[0.0], np.cumsum(energies)])
+
+        # Momentary blocks: 400 ms with 75% overlap -> integrated loudness
+        if len(energies) >= 4:
+            momentary = (cumulative[4:] - cumulative[:-4]) / 4
+            lufs, threshold = gated_loudness(momentary, -10.0)
+            if lufs is not None:
+                levels['lufs'] = round(float(lufs), 2)
+                levels['loudness_threshold'] = round(float(threshold), 2)
+
+        # Short-term windows: 3 s -> loudness range (EBU Tech 3342)
+        if len(energies) >= 30:
+            short_term = (cumulative[30:] - cumulative[:-30]) / 30
+            loudness = -0.691 + 10 * np.log10(np.maximum(short_term, 1e-20))
+            _, threshold = gated_loudness(short_term, -20.0)
+            if threshold is not None:
+                gated = loudness[(loudness > -70.0) & (loudness > threshold)]
+                if gated.size:
+                    levels['lra'] = round(float(np.percentile(gated, 95) - np.percentile(gated, 10)), 2)
+
+    return levels
+
+
+def find_loop_points(filepath: str, channels: int) -> Optional[Dict]:
+    """Pick zero-crossing loop start/end points whose following waveforms match best
+
+    Only the first and last LOOP_SEARCH_SECONDS are kept while streaming the
+    file. Every rising zero crossing near the start is compared against every
+    one near the end in a single matrix product.
+    """
+    header = read_audio_header(filepath)
+    if not header:
+        return None
+    sample_rate = header['sample_rate']
+    search = int(sample_rate * LOOP_SEARCH_SECONDS)
+    match = int(sample_rate * LOOP_MATCH_SECONDS)
+    keep = search + match
+
+    head = []
+    head_frames = 0
+    tail = collections.deque()
+    tail_frames = 0
+    total_frames = 0
+    for block in iter_pcm_blocks(filepath, channels, sample_rate):
+        mono = block.mean(axis=1)
+        if head_frames < keep:
+            head.append(mono[:keep - head_frames])
+            head_frames += len(head[-1])
+        tail.append(mono)
+        tail_frames += len(mono)
+        while tail_frames - len(tail[0]) >= keep:
+            tail_frames -= len(tail.popleft())
+        total_frames += len(mono)
+
+    if total_frames < 2 * keep:
+        return None
+    head = np.concatenate(head)
+    tail = np.concatenate(tail)[-keep:]
+    tail_offset = total_frames - keep
+
+    def rising_crossings(x):
+        crossings = np.flatnonzero((x[:search - 1] < 0) & (x[1:search] >= 0)) + 1
+        if len(crossings) > LOOP_MAX_CANDIDATES:
+            crossings = crossings[np.linspace(0, len(crossings) - 1, LOOP_MAX_CANDIDATES).astype(int)]
+        return crossings
+
+    starts = rising_crossings(head)
+    ends = rising_crossings(tail)
+    if not starts.size or not ends.size:
+        return None
+
+    windows = np.lib.stride_tricks.sliding_window_view
+    a = windows(head, match)[starts]
+    b = windows(tail, match)[ends]
+    # ||a - b||^2 for every (start, end) pair
+    cost = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2 * a @ b.T
+    best_start, best_end = np.unravel_index(np.argmin(cost), cost.shape)
+
+    start = int(starts[best_start])
+    end = tail_offset + int(ends[best_end])
+    return {
+        'start': round(start / sample_rate, 6),
+        'end': round(end / sample_rate, 6),
+        'discontinuity': round(float(np.sqrt(max(cost[best_start, best_end], 0.0) / match)), 6)
+    }
+
+
+def silence_trim(info: Dict, profile: Dict) -> Optional[Tuple[float, float]]:
+    """(start, end) seconds to keep once leading/trailing silence is removed, or None"""
+    levels = info.get('levels')
+    if not levels or levels.get('silence_threshold_db') != profile['silence_threshold_db']:
+        return None
+    duration = info['duration']
+    start = max(0.0, levels['leading_silence'] - TRIM_PADDING)
+    end = min(duration, duration - levels['trailing_silence'] + TRIM_PADDING)
+    if end <= start or (start < 0.001 and duration - end < 0.001):
+        return None
+    return round(start, 4), round(end, 4)
+
+
+def audio_key(filename: str) -> str:
+    """Clean a raw source filename into a key (used for unmapped files and legacy aliases)"""
+    key = filename.replace('.wav', '').replace('.ogg', '')
+    # Clean up the generated filenames
+    key = key.replace('#1-', '').replace('#2-', '').replace('#3-', '').replace('#4-', '')
+    return key.replace('_#', '')
+
+
+def canonical_name(filename: str) -> Tuple[str, str]:
+    """Look up a source file's category and canonical sound name"""
+    if filename in AUDIO_NAME_MAP:
+        return AUDIO_NAME_MAP[filename]
+    return 'ambient', audio_key(filename)  # Default
+
+
 def categorize_file(filename: str) -> str:
     """Determine which category a file belongs to"""
-    for category, keywords in AUDIO_CATEGORIES.items():
-        for keyword in keywords:
-            if keyword.lower() in filename.lower():
-                return category
-    return 'ambient'  # Default
+    return canonical_name(filename)[0]
+
+
+def loudnorm_filter(levels: Optional[Dict]) -> str:
+    """loudnorm filter string; with measured levels it runs as a single linear gain"""
+    target = f"I={LOUDNORM_TARGET['I']}:TP={LOUDNORM_TARGET['TP']}:LRA={LOUDNORM_TARGET['LRA']}"
+    if not levels or levels.get('lufs') is None or levels.get('true_peak_dbtp') is None:
+        return f'loudnorm={target}'
+
+    # Linear mode is only honoured when the target LRA covers the measured one
+    lra = min(max(LOUDNORM_TARGET['LRA'], levels['lra']), 20.0)
+    target = f"I={LOUDNORM_TARGET['I']}:TP={LOUDNORM_TARGET['TP']}:LRA={lra}"
+    return (f"loudnorm={target}"
+            f":measured_I={max(levels['lufs'], -99.0)}"
+            f":measured_TP={min(max(levels['true_peak_dbtp'], -99.0), 99.0)}"
+            f":measured_LRA={min(levels['lra'], 99.0)}"
+            f":measured_thresh={max(levels['loudness_threshold'], -99.0)}"
+            f":offset=0:linear=true:print_format=none")
+
+
+def encode_filters(profile: Dict, levels: Optional[Dict] = None,
+                   trim: Optional[Tuple[float, float]] = None) -> List[str]:
+    """Audio filters applied before encoding (trim, then loudness normalization)"""
+    filters = []
+    if trim:
+        filters.append(f'atrim=start={trim[0]}:end={trim[1]},asetpts=PTS-STARTPTS')
+
+    # Add normalization filter
+    if profile['normalize']:
+        filters.append(loudnorm_filter(levels))
 
+    return filters
 
-def optimize_audio_file(input_path: str, output_path: str, profile: Dict) -> bool:
-    """Convert and optimize audio file using ffmpeg"""
+
+def build_ffmpeg_command(input_path: str, output_path: str, profile: Dict,
+                         levels: Optional[Dict] = None,
+                         trim: Optional[Tuple[float, float]] = None) -> List[str]:
+    """Build the ffmpeg command line that encodes a file with the given profile"""
+    cmd = [
+        'ffmpeg',
+        '-i', input_path,
+        '-y',  # Overwrite output
+        '-acodec', 'libvorbis',
+        '-ac', str(profile['channels']),
+        '-ar', str(profile['sample_rate']),
+        '-q:a', str(profile['quality']),
+    ]
+
+    filters = encode_filters(profile, levels, trim)
+    if filters:
+        cmd.extend(['-af', ','.join(filters)])
+
+    cmd.append(output_path)
+    return cmd
+
+
+def build_opus_command(input_path: str, output_path: str, profile: Dict,
+                       levels: Optional[Dict] = None,
+                       trim: Optional[Tuple[float, float]] = None) -> List[str]:
+    """Build the ffmpeg command line that encodes a file to WebM/Opus with the given profile"""
+    cmd = [
+        'ffmpeg',
+        '-i', input_path,
+        '-y',  # Overwrite output
+        '-acodec', 'libopus',
+        '-b:a', profile['opus_bitrate'],
+        '-vbr', 'on',
+        '-ac', str(profile['channels']),
+        '-ar', str(OPUS_SAMPLE_RATE),
+    ]
+
+    filters = encode_filters(profile, levels, trim)
+    if filters:
+        cmd.extend(['-af', ','.join(filters)])
+
+    cmd.append(output_path)
+    return cmd
+
+
+def optimize_audio_file(input_path: str, output_path: str, profile: Dict,
+                        levels: Optional[Dict] = None,
+                        trim: Optional[Tuple[float, float]] = None) -> bool:
+    """Convert and optimize audio file using ffmpeg; .webm outputs are encoded as Opus"""
     try:
-        cmd = [
-            'ffmpeg',
-            '-i', input_path,
-            '-y',  # Overwrite output
-            '-acodec', 'libvorbis',
-            '-ac', str(profile['channels']),
-            '-ar', str(profile['sample_rate']),
-            '-q:a', str(profile['quality']),
-        ]
-
-        # Add normalization filter
-        if profile['normalize']:
-            cmd.extend(['-af', 'loudnorm=I=-16:TP=-1.5:LRA=11'])
-
-        cmd.append(output_path)
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        if output_path.endswith('.webm'):
+            cmd = build_opus_command(input_path, output_path, profile, levels, trim)
+        else:
+            cmd = build_ffmpeg_command(input_path, output_path, profile, levels, trim)
+        result = build_trace.run(cmd, file=input_path, capture_output=True, text=True)
         return result.returncode == 0
 
     except Exception as e:
@@ -200,6 +858,164 @@ def optimize_audio_file(input_path: str, output_path: str, profile: Dict) -> boo
         return False
 
 
+def band_spectrogram(filepath: str, profile: Dict, filters: Optional[List[str]] = None) -> Optional:
+    """(frames, SPECTRAL_BANDS) power of a file decoded at the profile's rate/channels
+
+    Channels are mixed to mono and each non-overlapping Hann frame is summed into
+    log-spaced bands, so only the small band matrix is kept in memory.
+    """
+    sample_rate = profile['sample_rate']
+    channels = profile['channels']
+    decode_args = ['-ac', str(channels), '-ar', str(sample_rate)]
+    if filters:
+        decode_args += ['-af', ','.join(filters)]
+
+    edges = np.geomspace(SPECTRAL_MIN_HZ, sample_rate / 2, SPECTRAL_BANDS + 1)
+    bins = np.fft.rfftfreq(SPECTRAL_FRAME, 1 / sample_rate)
+    band_of_bin = np.clip(np.searchsorted(edges, bins, side='right') - 1, 0, SPECTRAL_BANDS - 1)
+    in_range = bins >= SPECTRAL_MIN_HZ
+    window = np.hanning(SPECTRAL_FRAME)
+
+    bands = []
+    pending = np.zeros(0)
+    for block in iter_decoded_blocks(filepath, channels, sample_rate, decode_args):
+        pending = np.concatenate([pending, block.mean(axis=1)])
+        usable = len(pending) - len(pending) % SPECTRAL_FRAME
+        if not usable:
+            continue
+        frames = pending[:usable].reshape(-1, SPECTRAL_FRAME) * window
+        pending = pending[usable:]
+        power = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+        frame_bands = np.zeros((len(frames), SPECTRAL_BANDS))
+        np.add.at(frame_bands.T, band_of_bin[in_range], power[:, in_range].T)
+        bands.append(frame_bands)
+
+    if not bands:
+        return None
+    return np.concatenate(bands)
+
+
+def spectral_score(reference, candidate) -> float:
+    """Similarity in (0, 1] from the mean log-spectral distance over non-silent frames"""
+    frames = min(len(reference), len(candidate))
+    reference, candidate = reference[:frames], candidate[:frames]
+    floor = max(reference.max(), 1e-20) * 10 ** (-SPECTRAL_FLOOR_DB / 10)
+    ref_db = 10 * np.log10(np.maximum(reference, floor))
+    cand_db = 10 * np.log10(np.maximum(candidate, floor))
+    active = ref_db.max(axis=1) > 10 * np.log10(floor) + 1.0
+    if not active.any():
+        return 1.0
+    lsd = np.sqrt(((ref_db[active] - cand_db[active]) ** 2).mean(axis=1)).mean()
+    return round(float(np.exp(-lsd / 10)), 4)
+
+
+def encode_quality_candidate(input_path: str, profile: Dict, quality: float,
+                             levels: Optional[Dict] = None,
+                             trim: Optional[Tuple[float, float]] = None) -> Optional[Tuple[float, object]]:
+    """Encode one quality level to a temp file, returning (size_kb, band spectrogram)"""
+    fd, temp_path = tempfile.mkstemp(suffix='.ogg')
+    os.close(fd)
+    try:
+        with build_trace.span(f'q{quality}', 'quality_search', file=input_path):
+            if not optimize_audio_file(input_path, temp_path, dict(profile, quality=quality), levels, trim):
+                return None
+            spectrogram = band_spectrogram(temp_path, profile)
+        if spectrogram is None:
+            return None
+        return os.path.getsize(temp_path) / 1024, spectrogram
+    finally:
+        os.unlink(temp_path)
+
+
+def quality_search_key(encode_key: str, min_score: float) -> str:
+    """Key a quality search on the ceiling encode plus the search settings"""
+    payload = json.dumps([encode_key, QUALITY_SEARCH_LEVELS, min_score, SPECTRAL_FRAME,
+                          SPECTRAL_BANDS, SPECTRAL_MIN_HZ, SPECTRAL_FLOOR_DB])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def choose_quality(profile: Dict, candidates: List[Dict], min_score: float) -> Dict:
+    """Smallest candidate scoring at least min_score, else the profile's own quality"""
+    passing = [c for c in candidates if c['score'] >= min_score]
+    if passing:
+        return min(passing, key=lambda c: c['size_kb'])
+    ceiling = [c for c in candidates if c['quality'] == profile['quality']]
+    return ceiling[0] if ceiling else {'quality': profile['quality'], 'score': None}
+
+
+def hash_file(filepath: str) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_pcm(filepath: str) -> Optional[str]:
+    """SHA-256 of a WAV's sample format and PCM payload, ignoring metadata chunks"""
+    try:
+        with open(filepath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = memoryview(mm)
+                try:
+                    header = read_wav_header(data)
+                    if not header:
+                        return None
+                    digest = hashlib.sha256(
+                        f"{header['codec']}:{header['sample_rate']}:{header['channels']}:".encode('utf-8'))
+                    digest.update(data[header['data_offset']:header['data_offset'] + header['data_size']])
+                    return digest.hexdigest()
+                finally:
+                    data.release()
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def fingerprint_source(filepath: str, cached: Optional[Dict]) -> Dict:
+    """Stat and hash a source file, reusing the cached hashes if size and mtime are unchanged"""
+    stat = os.stat(filepath)
+    if cached and cached.get('size') == stat.st_size and cached.get('mtime_ns') == stat.st_mtime_ns:
+        content_hash, pcm_hash = cached['hash'], cached['pcm_hash']
+    else:
+        content_hash, pcm_hash = hash_file(filepath), hash_pcm(filepath)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': content_hash, 'pcm_hash': pcm_hash}
+
+
+def encode_cache_key(content_hash: str, profile: Dict, output_name: str,
+                     levels: Optional[Dict] = None,
+                     trim: Optional[Tuple[float, float]] = None,
+                     opus: bool = False) -> str:
+    """Key an encode on source content, resolved profile, output name and ffmpeg command line(s)"""
+    cmd = build_ffmpeg_command('{input}', '{output}', profile, levels, trim)
+    if opus:
+        cmd += build_opus_command('{input}', '{output}', profile, levels, trim)
+    payload = json.dumps([content_hash, profile, output_name, cmd], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_build_cache(cache_path: Path) -> Dict:
+    """Load the build cache, discarding it if unreadable or from another version"""
+    empty = {'sources': {}, 'sprites': {}}
+    try:
+        with open(cache_path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if data.get('version') != CACHE_VERSION:
+        return empty
+    return {section: data.get(section, {}) for section in empty}
+
+
+def save_build_cache(cache_path: Path, cache: Dict):
+    """Atomically write the build cache"""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': CACHE_VERSION, **cache}, f, indent=2)
+    os.replace(tmp_path, cache_path)
+
+
 def create_audio_sprite_manifest(files: List[Tuple[str, Dict]]) -> Dict:
     """Generate manifest for audio sprite (multiple sounds in one file)"""
     manifest = {
@@ -208,20 +1024,380 @@ def create_audio_sprite_manifest(files: List[Tuple[str, Dict]]) -> Dict:
     }
 
     current_time = 0.0
-    for filepath, info in files:
+    for key, info in files:
         if info and info['duration'] > 0:
-            filename = Path(filepath).stem
-            manifest['spritemap'][filename] = {
-                'start': current_time,
-                'end': current_time + info['duration'],
+            manifest['spritemap'][key] = {
+                'start': round(current_time, 6),
+                'end': round(current_time + info['duration'], 6),
                 'loop': False
             }
-            current_time += info['duration'] + 0.1  # 100ms padding
+            current_time += info['duration'] + SPRITE_PADDING
 
     return manifest
 
 
+def build_sprite_command(clips: List[Tuple[str, List[str]]], output_path: str, profile: Dict) -> List[str]:
+    """Build the ffmpeg command that renders each source through its encode filters,
+    pads and concatenates the renders, and encodes the result to Vorbis once"""
+    cmd = ['ffmpeg', '-y']
+    for source_path, _ in clips:
+        cmd.extend(['-i', source_path])
+
+    # loudnorm works at 192 kHz, so every render is brought back to the
+    # profile format before concat, which needs identical inputs
+    layout = 'mono' if profile['channels'] == 1 else 'stereo'
+    chains = ''.join(
+        f"[{i}:a]{''.join(f + ',' for f in filters)}aresample={profile['sample_rate']},"
+        f"aformat=sample_fmts=fltp:channel_layouts={layout},apad=pad_dur={SPRITE_PADDING}[a{i}];"
+        for i, (_, filters) in enumerate(clips))
+    inputs = ''.join(f'[a{i}]' for i in range(len(clips)))
+    cmd.extend([
+        '-filter_complex', f'{chains}{inputs}concat=n={len(clips)}:v=0:a=1[out]',
+        '-map', '[out]',
+        '-acodec', 'libvorbis',
+        '-ac', str(profile['channels']),
+        '-ar', str(profile['sample_rate']),
+        '-q:a', str(profile['quality']),
+        output_path
+    ])
+    return cmd
+
+
+def build_audio_sprite(category: str, entries: List[Dict], audio_dir: Path,
+                       output_dir: Path) -> Tuple[List[str], Optional[Dict]]:
+    """Render a category's sources into one sprite file, encoded once"""
+    profile = OPTIMIZATION_PROFILES[category]
+    output_path = output_dir / 'sprites' / f'{category}.ogg'
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Offsets come from the encoded clips' durations, so resampling and
+    # trimming are already accounted for; the audio comes from the sources
+    # so the sprite is not a second lossy generation of the clips
+    sprite = create_audio_sprite_manifest([(entry['key'], entry) for entry in entries])
+    members = [entry for entry in entries if entry['key'] in sprite['spritemap']]
+
+    log = [f"Sprite: {category} ({len(members)} clips)"]
+    if not members:
+        log.append(f"  [SKIP] No clips with a known duration")
+        return log, None
+
+    clips = []
+    for entry in members:
+        trim = (entry['trim']['start'], entry['trim']['end']) if entry.get('trim') else None
+        clips.append((entry['source'], encode_filters(profile, entry.get('levels'), trim)))
+
+    result = build_trace.run(build_sprite_command(clips, str(output_path), profile),
+                             file=str(output_path), capture_output=True, text=True)
+    if result.returncode != 0:
+        log.append(f"  [FAIL] Failed to build sprite")
+        return log, None
+
+    size_kb = os.path.getsize(output_path) / 1024
+    clips_kb = sum(entry['size_after'] for entry in members)
+    log.append(f"  [OK] {clips_kb:.1f} KB in {len(members)} files -> {size_kb:.1f} KB in 1 file")
+
+    return log, {
+        'path': str(output_path.relative_to(audio_dir)),
+        'size_kb': size_kb,
+        'spritemap': sprite['spritemap']
+    }
+
+
+def sprite_cache_key(category: str, entries: List[Dict], sources: Dict) -> str:
+    """Key a sprite on its profile and the encode keys of its clips, in order"""
+    members = [(entry['original'], sources[entry['source']]['encode_key']) for entry in entries]
+    payload = json.dumps([OPTIMIZATION_PROFILES[category], SPRITE_PADDING, members], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def process_audio_file(filepath: str, info: Dict, output_dir: Path,
+                       trim: Optional[Tuple[float, float]] = None,
+                       search: Optional[Dict] = None,
+                       opus: bool = False) -> Tuple[List[str], Optional[Dict]]:
+    """Optimize one analyzed file, returning its log lines and manifest entry"""
+    category, name = canonical_name(info['file'])
+    profile = OPTIMIZATION_PROFILES[category]
+    if search:
+        profile = dict(profile, quality=search['quality'])
+
+    # Generate output filename
+    output_path = output_dir / category / f'{name}.ogg'
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    log = [
+        f"Processing: {info['file']}",
+        f"  Category: {category}",
+        f"  Profile: {profile['bitrate']} {profile['channels']}ch {profile['sample_rate']}Hz q{profile['quality']}",
+    ]
+
+    if trim:
+        onset_ms = trim[0] * 1000
+        tail_ms = (info['duration'] - trim[1]) * 1000
+        log.append(f"  Trim: {onset_ms:.1f} ms onset latency removed, {tail_ms:.1f} ms tail "
+                   f"(threshold {profile['silence_threshold_db']:.0f} dBFS)")
+    if info.get('loop'):
+        loop = info['loop']
+        log.append(f"  Loop: {loop['start']:.3f}s -> {loop['end']:.3f}s "
+                   f"(discontinuity {loop['discontinuity']:.4f})")
+
+    with build_trace.span('encode', 'encode', file=str(filepath), bytes=int(info['size_kb'] * 1024)) as span:
+        if not optimize_audio_file(str(filepath), str(output_path), profile, info.get('levels'), trim):
+            log.append(f"  [FAIL] Failed to optimize")
+            return log, None
+        span.set(output_bytes=os.path.getsize(output_path))
+
+    optimized_size = os.path.getsize(output_path) / 1024
+    # The encoded header reflects trimming, resampling and downmixing
+    encoded = read_audio_header(str(output_path)) or {
+        'duration': info['duration'], 'channels': profile['channels']}
+    compression_ratio = (1 - optimized_size / info['size_kb']) * 100
+    log.append(f"  [OK] {info['size_kb']:.1f} KB -> {optimized_size:.1f} KB "
+               f"({compression_ratio:+.1f}%)")
+
+    audio_root = Path('public/assets/audio')
+    formats = {'ogg': {'path': str(output_path.relative_to(audio_root)), 'size_kb': optimized_size}}
+    if opus:
+        opus_path = output_path.with_suffix('.webm')
+        with build_trace.span('encode_opus', 'encode', file=str(filepath)):
+            opus_ok = optimize_audio_file(str(filepath), str(opus_path), profile, info.get('levels'), trim)
+        if opus_ok:
+            opus_size = os.path.getsize(opus_path) / 1024
+            formats['webm'] = {'path': str(opus_path.relative_to(audio_root)), 'size_kb': opus_size}
+            log.append(f"  [OK] Opus {profile['opus_bitrate']}: {opus_size:.1f} KB "
+                       f"({(1 - opus_size / optimized_size) * 100:+.1f}% vs Vorbis)")
+        else:
+            # The Vorbis file still ships; the runtime falls back to it
+            log.append(f"  [FAIL] Failed to encode Opus")
+
+    return log, {
+        'key': name,
+        'original': info['file'],
+        'optimized': str(output_path.relative_to(Path('public/assets/audio'))),
+        'formats': formats,
+        'category': category,
+        'size_before': info['size_kb'],
+        'size_after': optimized_size,
+        'duration': round(encoded['duration'], 3),
+        'channels': encoded['channels'],
+        'decoded_kb': round(decoded_size_kb(encoded['duration'], encoded['channels']), 1),
+        'levels': info.get('levels'),
+        'trim': {
+            'start': trim[0],
+            'end': trim[1],
+            'onset_ms': round(trim[0] * 1000, 1)
+        } if trim else None,
+        'loop': info.get('loop'),
+        'quality': profile['quality'],
+        'quality_score': search['score'] if search else None
+    }
+
+
+def read_output_entry(filepath: str, info: Dict, output_dir: Path) -> Tuple[List[str], Optional[Dict]]:
+    """Manifest entry for a sound from its optimized file(s) already on disk, without encoding"""
+    category, name = canonical_name(info['file'])
+    output_path = output_dir / category / f'{name}.ogg'
+    log = [f"Reading: {output_path}"]
+    encoded = read_audio_header(str(output_path))
+    if not encoded:
+        log.append(f"  [SKIP] No readable optimized file for {info['file']}")
+        return log, None
+
+    audio_root = Path('public/assets/audio')
+    optimized_size = os.path.getsize(output_path) / 1024
+    formats = {'ogg': {'path': str(output_path.relative_to(audio_root)), 'size_kb': optimized_size}}
+    opus_path = output_path.with_suffix('.webm')
+    if opus_path.exists():
+        formats['webm'] = {'path': str(opus_path.relative_to(audio_root)),
+                           'size_kb': os.path.getsize(opus_path) / 1024}
+    log.append(f"  [OK] {encoded['channels']}ch {encoded['sample_rate']}Hz {encoded['duration']:.3f}s "
+               f"{optimized_size:.1f} KB")
+
+    return log, {
+        'key': name,
+        'original': info['file'],
+        'optimized': str(output_path.relative_to(audio_root)),
+        'formats': formats,
+        'category': category,
+        'size_before': info['size_kb'],
+        'size_after': optimized_size,
+        'duration': round(encoded['duration'], 3),
+        'channels': encoded['channels'],
+        'decoded_kb': round(decoded_size_kb(encoded['duration'], encoded['channels']), 1),
+        'levels': info.get('levels'),
+        'trim': None,
+        'loop': info.get('loop'),
+        'quality': None,
+        'quality_score': None
+    }
+
+
+def decoded_size_kb(duration: float, channels: int) -> float:
+    """Memory an AudioBuffer of this sound occupies once decoded"""
+    return duration * DECODED_SAMPLE_RATE * channels * DECODED_BYTES_PER_SAMPLE / 1024
+
+
+def assign_preload_tier(entry: Dict, rules: List[Dict] = PRELOAD_TIER_RULES) -> str:
+    """Tier of the first rule whose conditions all hold for the entry"""
+    for rule in rules:
+        if 'categories' in rule and entry['category'] not in rule['categories']:
+            continue
+        if 'keys' in rule and entry['key'] not in rule['keys']:
+            continue
+        if 'min_duration' in rule and entry['duration'] < rule['min_duration']:
+            continue
+        return rule['tier']
+    return 'lazy'
+
+
+def search_qualities(results: List[Tuple[str, Dict]], new_cache: Dict, cache: Dict,
+                     trims: Dict, min_score: float, pool: ThreadPoolExecutor) -> Dict[str, Dict]:
+    """Run (or reuse cached) per-file quality searches, returning the chosen candidate per source"""
+    print(f"\nSearching Vorbis quality per file (min score {min_score})...")
+    print("-"*80)
+
+    # Every reference render and candidate encode of every file goes to the
+    # pool at once; nothing waits inside a worker, so the pool cannot stall
+    pending = []
+    searches = {}
+    for filepath, info in results:
+        key = Path(filepath).as_posix()
+        record = new_cache[key]
+        profile = OPTIMIZATION_PROFILES[canonical_name(info['file'])[0]]
+        levels = info.get('levels')
+        trim = trims.get(filepath)
+        search_key = quality_search_key(
+            encode_cache_key(record['hash'], profile, info['file'], levels, trim), min_score)
+
+        cached = (cache.get(key) or {}).get('quality_search')
+        if cached and cached['key'] == search_key:
+            record['quality_search'] = cached
+            searches[filepath] = cached['chosen']
+            continue
+
+        reference = pool.submit(band_spectrogram, filepath, profile, encode_filters(profile, levels, trim))
+        candidates = [(quality, pool.submit(encode_quality_candidate, filepath, profile, quality, levels, trim))
+                      for quality in QUALITY_SEARCH_LEVELS if quality <= profile['quality']]
+        pending.append((filepath, info, profile, search_key, reference, candidates))
+
+    for filepath, info, profile, search_key, reference, candidates in pending:
+        reference = reference.result()
+        scored = []
+        for quality, future in candidates:
+            result = future.result()
+            if reference is not None and result:
+                size_kb, spectrogram = result
+                scored.append({'quality': quality, 'size_kb': round(size_kb, 2),
+                               'score': spectral_score(reference, spectrogram)})
+        if not scored:
+            print(f"  [FAIL] {info['file']}: no candidate could be scored, keeping profile quality")
+            continue
+
+        chosen = choose_quality(profile, scored, min_score)
+        new_cache[Path(filepath).as_posix()]['quality_search'] = {
+            'key': search_key, 'chosen': chosen, 'candidates': scored}
+        searches[filepath] = chosen
+
+    saved_kb = 0.0
+    for filepath, info in results:
+        record = new_cache[Path(filepath).as_posix()].get('quality_search')
+        if not record:
+            continue
+        profile = OPTIMIZATION_PROFILES[canonical_name(info['file'])[0]]
+        chosen = record['chosen']
+        ceiling = [c for c in record['candidates'] if c['quality'] == profile['quality']]
+        if ceiling and chosen.get('size_kb') is not None:
+            saved_kb += ceiling[0]['size_kb'] - chosen['size_kb']
+        score = f"{chosen['score']:.3f}" if chosen['score'] is not None else '-'
+        print(f"{info['file']:50s} | q{profile['quality']} -> q{chosen['quality']} | score {score}")
+
+    print("-"*80)
+    print(f"Quality search: {len(searches)} file(s), {saved_kb:.1f} KB saved vs profile quality")
+    return searches
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Optimize game audio for web deployment')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='Number of concurrent ffprobe/ffmpeg processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Ignore {CACHE_PATH} and re-probe/re-encode every file')
+    parser.add_argument('--keep-stale', action='store_true',
+                        help='Keep optimized files that no longer map to a source sound')
+    parser.add_argument('--no-sprites', action='store_true',
+                        help='Skip building per-category sprite files')
+    parser.add_argument('--trim-silence', action='store_true',
+                        help='Trim leading/trailing silence from non-ambient sounds')
+    parser.add_argument('--opus', action='store_true',
+                        help='Also encode a WebM/Opus file per sound at the profile opus_bitrate')
+    parser.add_argument('--quality-search', action='store_true',
+                        help='Pick the smallest Vorbis quality per file that meets --min-score')
+    parser.add_argument('--min-score', type=float, default=QUALITY_SEARCH_MIN_SCORE,
+                        help=f'Spectral similarity required by --quality-search (default: {QUALITY_SEARCH_MIN_SCORE})')
+    parser.add_argument('--critical-budget-kb', type=float, default=CRITICAL_BUDGET_KB,
+                        help=f'Fail when critical-tier sounds decode to more than this (default: {CRITICAL_BUDGET_KB})')
+    parser.add_argument('--manifest-only', action='store_true',
+                        help='Rebuild the manifest and AudioMap.ts from the optimized files on disk '
+                             'without encoding (non-WAV sources are not level-analyzed)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and rebuild whenever a source sound changes')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='Write a Chrome trace (and PATH.summary.json) of every stage and subprocess')
+    parser.add_argument('--verify-headers', action='store_true',
+                        help='Check the in-process WAV/Ogg reader against ffprobe and exit')
+    args = parser.parse_args()
+    args.jobs = max(1, args.jobs)
+    return args
+
+
 def main():
+    args = parse_args()
+    if args.trace:
+        build_trace.enable(args.trace)
+
+    if args.verify_headers:
+        audio_dir = Path('public/assets/audio')
+        filepaths = sorted(str(p) for p in audio_dir.rglob('*') if p.suffix in ('.wav', '.ogg', '.opus'))
+        print(f"Verifying header reader against ffprobe on {len(filepaths)} files...")
+        mismatches = verify_audio_headers(filepaths)
+        print(f"[{'FAIL' if mismatches else 'OK'}] {mismatches} mismatch(es)")
+        raise SystemExit(1 if mismatches else 0)
+
+    if not args.watch:
+        build(args)
+        return
+
+    # Every rebuild is a normal cached build: unchanged sources are cache hits,
+    # so a batch re-encodes only the edited sounds and their category sprites
+    build(args)
+    audio_dir = Path('public/assets/audio')
+    print(f"\nWatching {audio_dir} for .wav/.ogg changes (Ctrl+C to stop)...")
+    try:
+        for changed in asset_watch.watch([str(audio_dir)], ('.wav', '.ogg')):
+            print(f"\nChanged: {', '.join(os.path.basename(path) for path in changed)}")
+            try:
+                build(args)
+            except SystemExit:
+                print("[FAIL] Build failed; waiting for the next change")
+            except Exception as e:
+                print(f"[FAIL] Build failed: {e}; waiting for the next change")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write content unless the file already holds it, so dev-server watchers only see real edits"""
+    try:
+        if path.read_text(encoding='utf-8') == content:
+            return False
+    except OSError:
+        pass
+    path.write_text(content, encoding='utf-8')
+    return True
+
+
+def build(args):
+    """One full (cached) processing run: analyze, dedup, encode, sprites, manifest, AudioMap.ts"""
     print("="*80)
     print("AUDIO PROCESSOR - The Nightman Cometh")
     print("="*80)
@@ -231,67 +1407,267 @@ def main():
     output_dir = Path('public/assets/audio/optimized')
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # ffprobe/ffmpeg do the heavy lifting in child processes, so threads are
+    # enough to keep every core busy without pickling work to a process pool
+    pool = ThreadPoolExecutor(max_workers=args.jobs)
+
     # Analyze all existing audio files
-    print("\nAnalyzing existing audio files...")
+    build_trace.stage('analyze')
+    print(f"\nAnalyzing existing audio files ({args.jobs} jobs)...")
     print("-"*80)
 
-    audio_files = list(audio_dir.glob('*.wav')) + list(audio_dir.glob('*.ogg'))
+    audio_files = sorted(list(audio_dir.glob('*.wav')) + list(audio_dir.glob('*.ogg')))
     analysis_results = []
     total_size_before = 0
 
-    for filepath in sorted(audio_files):
-        info = analyze_audio_file(str(filepath))
+    build_cache = {'sources': {}, 'sprites': {}} if args.no_cache else load_build_cache(CACHE_PATH)
+    cache = build_cache['sources']
+    cache_keys = [filepath.as_posix() for filepath in audio_files]
+    fingerprints = list(pool.map(lambda key: fingerprint_source(key, cache.get(key)), cache_keys))
+
+    if np is None:
+        print("[WARN] NumPy not installed: skipping level analysis, loudnorm will run dynamically")
+
+    # Only probe sources whose content or analysis settings changed since the cached analysis
+    probes = {}
+    for key, fingerprint in zip(cache_keys, fingerprints):
+        category, name = canonical_name(os.path.basename(key))
+        silence_db = OPTIMIZATION_PROFILES[category]['silence_threshold_db']
+        loop = name in LOOP_SOUNDS
+        cached = cache.get(key)
+        analysis = cached.get('analysis') if cached and cached['hash'] == fingerprint['hash'] else None
+        levels = analysis.get('levels') if analysis else None
+        if levels and (levels.get('silence_threshold_db') != silence_db or (loop and 'loop' not in analysis)):
+            analysis = None
+        if not analysis:
+            # --manifest-only runs without ffmpeg, which non-WAV sources need to be decoded
+            decode = not args.manifest_only or key.endswith('.wav')
+            probes[key] = pool.submit(analyze_audio_file, key, decode, silence_db, loop and decode)
+
+    new_cache = {}
+    for filepath, key, fingerprint in zip(audio_files, cache_keys, fingerprints):
+        info = probes[key].result() if key in probes else cache[key]['analysis']
         if info:
             analysis_results.append((str(filepath), info))
             total_size_before += info['size_kb']
+            new_cache[key] = dict(fingerprint, analysis=info)
 
             category = categorize_file(info['file'])
+            levels = info.get('levels') or {}
+            loudness = f"{levels['lufs']:6.1f} LUFS" if levels.get('lufs') is not None else "     - LUFS"
+            peak = f"{levels['true_peak_dbtp']:5.1f} dBTP" if levels.get('true_peak_dbtp') is not None else "    - dBTP"
             print(f"{info['file']:50s} | {info['size_kb']:8.1f} KB | "
                   f"{info['codec']:8s} | {info['sample_rate']}Hz | "
-                  f"{info['channels']}ch | [{category}]")
+                  f"{info['channels']}ch | {loudness} | {peak} | [{category}]")
 
     print("-"*80)
     print(f"Total files: {len(analysis_results)}")
     print(f"Total size: {total_size_before:.1f} KB ({total_size_before/1024:.2f} MB)")
 
+    # Fold byte- or PCM-identical sources into one sound; later copies
+    # become aliases of the first instead of shipping a second file
+    build_trace.stage('dedup')
+    print("\nDeduplicating sources...")
+    print("-"*80)
+
+    aliases = {}
+    sound_by_hash = {}
+    unique_results = []
+    duplicates = []
+    for filepath, info in analysis_results:
+        record = new_cache[Path(filepath).as_posix()]
+        dedup_hash = record['pcm_hash'] or record['hash']
+        name = canonical_name(info['file'])[1]
+        if dedup_hash in sound_by_hash:
+            aliases[name] = sound_by_hash[dedup_hash]
+            duplicates.append(aliases[name])
+            print(f"Duplicate: {info['file']} is identical to '{aliases[name]}'")
+        else:
+            sound_by_hash[dedup_hash] = name
+            unique_results.append((filepath, info))
+
+    # Raw-filename keys from older builds stay resolvable
+    for filepath, info in analysis_results:
+        name = canonical_name(info['file'])[1]
+        legacy = audio_key(info['file'])
+        if legacy != name:
+            aliases[legacy] = aliases.get(name, name)
+
+    print(f"{len(unique_results)} unique sound(s), {len(duplicates)} duplicate(s), {len(aliases)} alias(es)")
+
     # Optimize files
+    build_trace.stage('encode')
     print("\nOptimizing audio files...")
     print("-"*80)
 
     total_size_after = 0
     optimized_files = []
+    cache_hits = 0
 
-    for filepath, info in analysis_results:
-        category = categorize_file(info['file'])
+    trims = {}
+    searches = {}
+    for filepath, info in unique_results:
+        category = canonical_name(info['file'])[0]
+        # Ambient beds and footsteps keep their natural tails and loop seams
+        if args.trim_silence and category != 'ambient' and not args.manifest_only:
+            trims[filepath] = silence_trim(info, OPTIMIZATION_PROFILES[category])
+
+    if args.quality_search and args.manifest_only:
+        print("[WARN] --manifest-only: skipping quality search")
+    elif args.quality_search and np is None:
+        print("[WARN] NumPy not installed: skipping quality search")
+    elif args.quality_search:
+        build_trace.stage('quality_search')
+        searches = search_qualities(unique_results, new_cache, cache, trims, args.min_score, pool)
+        build_trace.stage('encode')
+
+    jobs = []
+    for filepath, info in unique_results:
+        key = Path(filepath).as_posix()
+        record = new_cache[key]
+        category, name = canonical_name(info['file'])
         profile = OPTIMIZATION_PROFILES[category]
+        trim = trims.get(filepath)
+        search = searches.get(filepath)
+        if search:
+            profile = dict(profile, quality=search['quality'])
+        record['encode_key'] = encode_cache_key(record['hash'], profile, name, info.get('levels'), trim,
+                                                args.opus)
 
-        # Generate output filename
-        input_path = Path(filepath)
-        output_filename = input_path.stem + '.ogg'
-        output_path = output_dir / category / output_filename
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        print(f"Processing: {info['file']}")
-        print(f"  Category: {category}")
-        print(f"  Profile: {profile['bitrate']} {profile['channels']}ch {profile['sample_rate']}Hz")
-
-        if optimize_audio_file(str(filepath), str(output_path), profile):
-            optimized_size = os.path.getsize(output_path) / 1024
-            total_size_after += optimized_size
-            compression_ratio = (1 - optimized_size / info['size_kb']) * 100
-
-            print(f"  [OK] {info['size_kb']:.1f} KB -> {optimized_size:.1f} KB "
-                  f"({compression_ratio:+.1f}%)")
-
-            optimized_files.append({
-                'original': info['file'],
-                'optimized': str(output_path.relative_to(Path('public/assets/audio'))),
-                'category': category,
-                'size_before': info['size_kb'],
-                'size_after': optimized_size
-            })
+        cached = cache.get(key)
+        if (cached and cached.get('encode_key') == record['encode_key'] and cached.get('entry')
+                and all((audio_dir / output['path']).exists()
+                        for output in cached['entry'].get('formats', {}).values())
+                and (audio_dir / cached['entry']['optimized']).exists()):
+            jobs.append((key, None, cached['entry']))
+        elif args.manifest_only:
+            jobs.append((key, pool.submit(read_output_entry, filepath, info, output_dir), None))
         else:
-            print(f"  [FAIL] Failed to optimize")
+            jobs.append((key, pool.submit(process_audio_file, filepath, info, output_dir, trim, search,
+                                          args.opus), None))
+
+    # Each job buffers its own log, so output stays grouped per file
+    for key, future, entry in jobs:
+        if future:
+            log, entry = future.result()
+            for line in log:
+                print(line)
+        else:
+            cache_hits += 1
+            print(f"Cached: {entry['original']} -> {entry['optimized']}")
+        if entry:
+            entry['source'] = key
+            total_size_after += entry['size_after']
+            optimized_files.append(entry)
+            new_cache[key]['entry'] = entry
+        else:
+            # Failed encodes stay out of the cache so they are retried next run
+            del new_cache[key]
+
+    for entry in optimized_files:
+        entry['aliases'] = sorted(alias for alias, target in aliases.items() if target == entry['key'])
+
+    # Remove optimized files that no current sound maps to (old raw-named
+    # outputs, renamed sounds). Outputs of failed encodes are kept.
+    size_by_key = {entry['key']: entry['size_after'] for entry in optimized_files}
+    duplicate_kb = sum(size_by_key.get(key, 0) for key in duplicates)
+    pruned_kb = 0
+    pruned = 0
+    if not args.keep_stale and not args.manifest_only:
+        expected = set()
+        for filepath, info in unique_results:
+            category, name = canonical_name(info['file'])
+            expected.add(output_dir / category / f'{name}.ogg')
+            if args.opus:
+                expected.add(output_dir / category / f'{name}.webm')
+        for category in OPTIMIZATION_PROFILES:
+            outputs = list((output_dir / category).glob('*.ogg')) + list((output_dir / category).glob('*.webm'))
+            for stale_path in sorted(outputs):
+                if stale_path not in expected:
+                    pruned += 1
+                    pruned_kb += os.path.getsize(stale_path) / 1024
+                    stale_path.unlink()
+                    print(f"Pruned stale output: {stale_path.relative_to(audio_dir)}")
+
+    trimmed = [entry for entry in optimized_files if entry.get('trim')]
+    if trimmed:
+        onset_ms = sum(entry['trim']['onset_ms'] for entry in trimmed)
+        print(f"\nSilence trim: {len(trimmed)} file(s), {onset_ms:.0f} ms onset latency removed "
+              f"(avg {onset_ms / len(trimmed):.1f} ms)")
+
+    print(f"\nDeduplication saved {duplicate_kb + pruned_kb:.1f} KB: "
+          f"{len(duplicates)} duplicate source(s) ({duplicate_kb:.1f} KB), "
+          f"{pruned} stale file(s) pruned ({pruned_kb:.1f} KB)")
+
+    if args.opus:
+        print("\nOpus vs Vorbis by category:")
+        print("-"*80)
+        opus_total = vorbis_total = 0.0
+        for category in sorted(OPTIMIZATION_PROFILES):
+            pairs = [entry['formats'] for entry in optimized_files
+                     if entry['category'] == category and 'webm' in entry.get('formats', {})]
+            if not pairs:
+                continue
+            vorbis_kb = sum(formats['ogg']['size_kb'] for formats in pairs)
+            opus_kb = sum(formats['webm']['size_kb'] for formats in pairs)
+            vorbis_total += vorbis_kb
+            opus_total += opus_kb
+            print(f"{category:15s} | {len(pairs):3d} file(s) | Vorbis {vorbis_kb:8.1f} KB | "
+                  f"Opus {opus_kb:8.1f} KB | saved {vorbis_kb - opus_kb:7.1f} KB "
+                  f"({(1 - opus_kb / vorbis_kb) * 100 if vorbis_kb else 0:+.1f}%)")
+        print("-"*80)
+        print(f"{'total':15s} | Vorbis {vorbis_total:.1f} KB | Opus {opus_total:.1f} KB | "
+              f"saved {vorbis_total - opus_total:.1f} KB")
+
+    # Build one sprite per SFX category from the optimized clips
+    sprites = {}
+    new_sprite_cache = {}
+    if not args.no_sprites:
+        build_trace.stage('sprites')
+        print("\nBuilding audio sprites...")
+        print("-"*80)
+
+        sprite_jobs = []
+        for category in SPRITE_CATEGORIES:
+            entries = [entry for entry in optimized_files if entry['category'] == category]
+            if not entries:
+                continue
+            sprite_key = sprite_cache_key(category, entries, new_cache)
+            cached = build_cache['sprites'].get(category)
+            if (cached and cached['key'] == sprite_key
+                    and (audio_dir / cached['sprite']['path']).exists()):
+                sprite_jobs.append((category, sprite_key, None, cached['sprite']))
+            elif args.manifest_only:
+                print(f"Sprite: {category}\n  [SKIP] --manifest-only does not encode sprites")
+            else:
+                future = pool.submit(build_audio_sprite, category, entries, audio_dir, output_dir)
+                sprite_jobs.append((category, sprite_key, future, None))
+
+        for category, sprite_key, future, sprite in sprite_jobs:
+            if future:
+                log, sprite = future.result()
+                for line in log:
+                    print(line)
+            else:
+                print(f"Cached sprite: {category} -> {sprite['path']}")
+            if sprite:
+                sprites[category] = sprite
+                new_sprite_cache[category] = {'key': sprite_key, 'sprite': sprite}
+
+        sprite_kb = sum(sprite['size_kb'] for sprite in sprites.values())
+        print("-"*80)
+        print(f"Sprites: {len(sprites)} file(s), {sprite_kb:.1f} KB "
+              f"(replaces {sum(len(s['spritemap']) for s in sprites.values())} requests)")
+
+    pool.shutdown()
+
+    evicted = len(set(cache) - set(cache_keys))
+    # Entries read back from disk carry no encode settings, so they must not become cache hits
+    if not args.manifest_only:
+        save_build_cache(CACHE_PATH, {'sources': new_cache, 'sprites': new_sprite_cache})
+    print(f"\nBuild cache: {cache_hits} hit(s), {len(jobs) - cache_hits} "
+          f"{'read from disk' if args.manifest_only else 'encoded'}, "
+          f"{len(probes)} probed, {evicted} stale entr{'y' if evicted == 1 else 'ies'} evicted")
 
     print("-"*80)
     print(f"\nOptimization Results:")
@@ -300,34 +1676,69 @@ def main():
     print(f"  Space saved:       {total_size_before - total_size_after:.1f} KB "
           f"({(1 - total_size_after/total_size_before)*100:.1f}%)")
 
+    # Decoded footprint per preload tier; the critical tier is held at boot
+    build_trace.stage('tiers')
+    print("\nPreload tiers (decoded memory at "
+          f"{DECODED_SAMPLE_RATE // 1000} kHz float32):")
+    print("-"*80)
+    tiers = {}
+    for entry in optimized_files:
+        entry['tier'] = assign_preload_tier(entry)
+        tiers.setdefault(entry['tier'], []).append(entry)
+    for tier in ('critical', 'lazy', 'stream'):
+        entries = tiers.get(tier, [])
+        decoded_kb = sum(entry['decoded_kb'] for entry in entries)
+        print(f"{tier:10s} | {len(entries):3d} file(s) | {decoded_kb:9.1f} KB decoded | "
+              f"{sum(entry['size_after'] for entry in entries):8.1f} KB download")
+    for entry in sorted(tiers.get('critical', []), key=lambda e: -e['decoded_kb']):
+        print(f"  critical: {entry['key']:30s} {entry['duration']:6.2f}s {entry['channels']}ch "
+              f"{entry['decoded_kb']:8.1f} KB")
+
+    critical_kb = sum(entry['decoded_kb'] for entry in tiers.get('critical', []))
+    if critical_kb > args.critical_budget_kb:
+        print(f"\n[FAIL] Critical tier decodes to {critical_kb:.1f} KB, "
+              f"over the {args.critical_budget_kb:.0f} KB budget")
+        build_trace.write()
+        raise SystemExit(1)
+    print(f"[OK] Critical tier {critical_kb:.1f} KB within {args.critical_budget_kb:.0f} KB budget")
+
     # Generate manifest
+    build_trace.stage('manifest')
     print("\nGenerating audio manifest...")
     manifest = {
         'version': '1.0',
         'files': optimized_files,
         'categories': AUDIO_CATEGORIES,
+        'aliases': aliases,
+        'formats': AUDIO_FORMATS,
+        'sprites': sprites,
         'total_files': len(optimized_files),
-        'total_size_kb': total_size_after
+        'total_size_kb': total_size_after,
+        'decoded_kb_by_tier': {tier: round(sum(entry['decoded_kb'] for entry in entries), 1)
+                               for tier, entries in sorted(tiers.items())}
     }
 
     manifest_path = output_dir / 'audio_manifest.json'
-    with open(manifest_path, 'w') as f:
-        json.dump(manifest, f, indent=2)
-
-    print(f"[OK] Manifest saved to: {manifest_path}")
+    if write_if_changed(manifest_path, json.dumps(manifest, indent=2)):
+        print(f"[OK] Manifest saved to: {manifest_path}")
+    else:
+        print(f"[OK] Manifest unchanged: {manifest_path}")
 
     # Generate TypeScript mapping
+    build_trace.stage('typescript')
     print("\nGenerating TypeScript audio map...")
-    ts_content = generate_typescript_map(optimized_files)
+    ts_content = generate_typescript_map(optimized_files, sprites, aliases)
     ts_path = Path('src/audio/AudioMap.ts')
-    with open(ts_path, 'w') as f:
-        f.write(ts_content)
-    print(f"[OK] TypeScript map saved to: {ts_path}")
+    if write_if_changed(ts_path, ts_content):
+        print(f"[OK] TypeScript map saved to: {ts_path}")
+    else:
+        print(f"[OK] TypeScript map unchanged: {ts_path}")
 
+    build_trace.write()
     print("\n[OK] Audio processing complete!")
 
 
-def generate_typescript_map(files: List[Dict]) -> str:
+def generate_typescript_map(files: List[Dict], sprites: Dict, aliases: Dict) -> str:
     """Generate TypeScript file with audio mappings"""
 
     # Group by category
@@ -340,17 +1751,48 @@ def generate_typescript_map(files: List[Dict]) -> str:
 
     ts = """/**
  * Audio Map - Generated by audio_processor.py
- * Maps audio file identifiers to optimized file paths
+ * Maps audio identifiers to optimized file paths
  */
 
+import { assetPath } from '../utils/assetPath';
+import { AudioSource, pickAudioSource } from '../utils/loaders';
+
 export type AudioCategory = 'combat' | 'nightman' | 'transformation' |
                             'environment' | 'items' | 'player' | 'ambient';
 
+export type AudioFormat = 'webm' | 'ogg';
+
+// Most preferred first: Opus where the browser decodes it, Vorbis otherwise
+export const AUDIO_FORMAT_PREFERENCE: { format: AudioFormat; mimeType: string }[] = [
+  { format: 'webm', mimeType: 'audio/webm; codecs="opus"' },
+  { format: 'ogg', mimeType: 'audio/ogg; codecs="vorbis"' }
+];
+
+export interface AudioSpriteRegion {
+  start: number;  // Seconds into the category sprite
+  end: number;
+}
+
+export interface AudioLoopPoints {
+  start: number;  // Seconds, zero-crossing aligned
+  end: number;
+}
+
+// critical: decoded at boot, lazy: decoded on first play, stream: media element, never decoded whole
+export type AudioPreloadTier = 'critical' | 'lazy' | 'stream';
+
 export interface AudioFile {
   path: string;
   category: AudioCategory;
-  originalSize: number;
-  optimizedSize: number;
+  formats?: Partial<Record<AudioFormat, string>>;  // Alternate encodings of path
+  tier?: AudioPreloadTier;
+  duration?: number;     // Seconds
+  channels?: number;
+  decodedSize?: number;  // KB as a decoded AudioBuffer
+  originalSize?: number;
+  optimizedSize?: number;
+  sprite?: AudioSpriteRegion;
+  loop?: AudioLoopPoints;
 }
 
 export const AUDIO_MAP: Record<string, AudioFile> = {
@@ -358,34 +1800,95 @@ export const AUDIO_MAP: Record<string, AudioFile> = {
 
     for category, category_files in sorted(by_category.items()):
         ts += f"\n  // {category.upper()}\n"
-        for file in category_files:
-            # Create a clean key from the filename
-            key = file['original'].replace('.wav', '').replace('.ogg', '')
-            # Clean up the generated filenames
-            key = key.replace('#1-', '').replace('#2-', '').replace('#3-', '').replace('#4-', '')
-            key = key.replace('_#', '')
+        for file in sorted(category_files, key=lambda f: f['key']):
+            key = file['key']
+            region = sprites.get(category, {}).get('spritemap', {}).get(key)
 
             ts += f"  '{key}': {{\n"
-            ts += f"    path: '/assets/audio/{file['optimized']}',\n"
+            ts += f"    path: '/assets/audio/{Path(file['optimized']).as_posix()}',\n"
             ts += f"    category: '{category}',\n"
+            formats = file.get('formats', {})
+            if len(formats) > 1:
+                paths = ', '.join(f"{fmt}: '/assets/audio/{Path(formats[fmt]['path']).as_posix()}'"
+                                  for fmt in AUDIO_FORMATS if fmt in formats)
+                ts += f"    formats: {{ {paths} }},\n"
+            ts += f"    tier: '{file['tier']}',\n"
+            ts += f"    duration: {file['duration']},\n"
+            ts += f"    channels: {file['channels']},\n"
+            ts += f"    decodedSize: {file['decoded_kb']:.1f},\n"
             ts += f"    originalSize: {file['size_before']:.1f},\n"
-            ts += f"    optimizedSize: {file['size_after']:.1f}\n"
-            ts += f"  }},\n"
+            ts += f"    optimizedSize: {file['size_after']:.1f}"
+            if region:
+                ts += f",\n    sprite: {{ start: {region['start']}, end: {region['end']} }}"
+            if file.get('loop'):
+                ts += f",\n    loop: {{ start: {file['loop']['start']}, end: {file['loop']['end']} }}"
+            ts += f"\n  }},\n"
 
     ts += """};
 
-export function getAudioPath(key: string): string {
-  const audio = AUDIO_MAP[key];
+// Alternate names (duplicates and raw source filenames) -> AUDIO_MAP key
+export const AUDIO_ALIASES: Record<string, string> = {
+"""
+    for alias, target in sorted(aliases.items()):
+        ts += f"  '{alias}': '{target}',\n"
+
+    ts += """};
+
+// One file per category holding every clip with a sprite region. Empty when
+// the build made no sprites (--no-sprites, --manifest-only): sounds load per file.
+export const AUDIO_SPRITES: Partial<Record<AudioCategory, string>> = {
+"""
+    for category, sprite in sorted(sprites.items()):
+        ts += f"  {category}: '/assets/audio/{Path(sprite['path']).as_posix()}',\n"
+
+    ts += """};
+
+export function resolveAudioKey(key: string): string {
+  return AUDIO_MAP[key] ? key : (AUDIO_ALIASES[key] ?? key);
+}
+
+function toAssetPath(path: string): string {
+  // Remove leading slash and use assetPath for proper base URL handling
+  return assetPath(path.startsWith('/') ? path.slice(1) : path);
+}
+
+/**
+ * Every encoding of a sound in AUDIO_FORMAT_PREFERENCE order, for loadAudio
+ */
+export function getAudioSources(key: string): AudioSource[] {
+  const audio = AUDIO_MAP[resolveAudioKey(key)];
   if (!audio) {
+    return [];
+  }
+  const sources = AUDIO_FORMAT_PREFERENCE
+    .filter(({ format }) => audio.formats?.[format])
+    .map(({ format, mimeType }) => ({ path: toAssetPath(audio.formats![format]!), mimeType }));
+  return sources.length ? sources : [{ path: toAssetPath(audio.path), mimeType: 'audio/ogg' }];
+}
+
+export function getAudioPath(key: string): string {
+  if (!AUDIO_MAP[resolveAudioKey(key)]) {
     console.warn(`Audio file not found: ${key}`);
     return '';
   }
-  return audio.path;
+  return pickAudioSource(getAudioSources(key));
 }
 
 export function getAudiosByCategory(category: AudioCategory): AudioFile[] {
   return Object.values(AUDIO_MAP).filter(a => a.category === category);
 }
+
+export function getAudioKeysByTier(tier: AudioPreloadTier): string[] {
+  return Object.keys(AUDIO_MAP).filter(key => (AUDIO_MAP[key].tier ?? 'lazy') === tier);
+}
+
+export function getAudioSpritePath(category: AudioCategory): string {
+  const path = AUDIO_SPRITES[category];
+  if (!path) {
+    return '';
+  }
+  return toAssetPath(path);
+}
 """
 
     return ts
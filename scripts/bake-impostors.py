@@ -0,0 +1,330 @@
+"""
+Blender Python Script: Bake Octahedral Impostors for Trees and Bushes
+
+For each tree (convert-trees.py import path) and bush (convert-bushes.py import
+path) this renders the variant from a hemisphere of view directions laid out on
+a hemi-octahedral grid, and writes:
+- <name>_impostor.png          albedo + alpha atlas (grid x grid cells)
+- <name>_impostor_normal.png   world-space normals, optional (--normals)
+- <name>_impostor.json         descriptor for the runtime (grid, cell size, bounds)
+
+Rendering uses Cycles on the CPU, so it runs on build machines without a GPU.
+Albedo is Cycles' diffuse colour pass, so the atlas carries no baked lighting.
+
+Usage:
+    blender --background --python scripts/bake-impostors.py
+    blender --background --python scripts/bake-impostors.py -- --kind trees --grid 8 --cell 64 --normals
+    blender --background --python scripts/bake-impostors.py -- --kind bushes --items 2,4,7,8
+
+Descriptor conventions (glTF/three.js space, Y up): cell (i, j) of the atlas,
+counted from the top-left, looks at the variant from direction
+    u = (i + 0.5) / grid * 2 - 1,  v = (j + 0.5) / grid * 2 - 1
+    p = ((u + v) / 2, (u - v) / 2),  dir = normalize(p.x, 1 - |p.x| - |p.y|, -p.y)
+(view direction from the centre towards the camera).
+"""
+
+import bpy
+import os
+import sys
+import glob
+import json
+import shutil
+import tempfile
+import importlib.util
+import numpy as np  # Bundled with Blender
+from mathutils import Vector
+
+# Blender does not put the script directory on sys.path
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import build_trace
+from blender_scene import clear_scene
+
+# Configuration
+IMPOSTOR_GRID = 8  # Cells per side; grid x grid view directions
+IMPOSTOR_CELL = 64  # Pixels per cell (PSX resolution)
+IMPOSTOR_SAMPLES = 8  # Cycles samples per cell; albedo/normal passes converge quickly
+DEFAULT_TREE_INPUT = "tree/Trees/Trees.fbx"
+DEFAULT_PACK_INPUT = "tree_pack_1.1 (1)/tree_pack_1.1"
+DEFAULT_BUSH_ITEMS = [2, 4, 7, 8]  # The bushes shipped in public/assets/models/bushes
+DEFAULT_OUTPUTS = {
+    'trees': "public/assets/models/trees/impostors",
+    'bushes': "public/assets/models/bushes/impostors"
+}
+
+def load_script(name, filename):
+    """Import one of the hyphen-named converter scripts as a module"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+convert_trees = load_script('convert_trees', 'convert-trees.py')
+convert_bushes = load_script('convert_bushes', 'convert-bushes.py')
+
+def parse_args():
+    """Parse command line arguments after --"""
+    args = {
+        'kind': 'all',
+        'tree_input': DEFAULT_TREE_INPUT,
+        'pack_input': DEFAULT_PACK_INPUT,
+        'items': DEFAULT_BUSH_ITEMS,
+        'grid': IMPOSTOR_GRID,
+        'cell': IMPOSTOR_CELL,
+        'samples': IMPOSTOR_SAMPLES,
+        'normals': False,
+        'output': None,
+        'trace': None
+    }
+
+    # Get args after -- separator
+    try:
+        separator_idx = sys.argv.index('--')
+        script_args = sys.argv[separator_idx + 1:]
+
+        # Flags without a value come out first so the rest pair up
+        if '--normals' in script_args:
+            args['normals'] = True
+        script_args = [arg for arg in script_args if arg != '--normals']
+
+        for i in range(0, len(script_args), 2):
+            if i + 1 < len(script_args):
+                key = script_args[i].lstrip('-').replace('-', '_')
+                value = script_args[i + 1]
+
+                if key in ['tree_input', 'pack_input', 'output', 'trace']:
+                    args[key] = value
+                elif key == 'kind' and value in ('trees', 'bushes', 'all'):
+                    args['kind'] = value
+                elif key in ['grid', 'cell', 'samples']:
+                    args[key] = int(value)
+                elif key == 'items':
+                    args['items'] = [int(item) for item in value.split(',') if item]
+    except ValueError:
+        pass
+
+    return args
+
+def octahedral_direction(u, v):
+    """Hemi-octahedral grid coordinate (u, v in -1..1) to a unit view direction, Blender Z up"""
+    px, py = (u + v) / 2, (u - v) / 2
+    return Vector((px, py, 1.0 - abs(px) - abs(py))).normalized()
+
+def bounding_sphere(obj):
+    """World-space centre (bounding box centre) and radius enclosing every vertex"""
+    co = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get('co', co)
+    co = co.reshape(-1, 3)
+    matrix = np.array(obj.matrix_world, dtype=np.float32)
+    world = co @ matrix[:3, :3].T + matrix[:3, 3]
+    center = (world.min(axis=0) + world.max(axis=0)) / 2
+    radius = float(np.linalg.norm(world - center, axis=1).max()) if len(world) else 1.0
+    return Vector(center.tolist()), max(radius, 1e-3)
+
+def setup_render(scene, cell, samples, work_dir, normals):
+    """Cycles-on-CPU render settings and a compositor writing the albedo/alpha/normal passes"""
+    scene.render.engine = 'CYCLES'
+    scene.cycles.device = 'CPU'
+    scene.cycles.samples = samples
+    scene.cycles.use_denoising = False
+    scene.cycles.pixel_filter_type = 'BOX'  # Crisp PSX edges
+    scene.render.film_transparent = True
+    scene.render.resolution_x = cell
+    scene.render.resolution_y = cell
+    scene.render.resolution_percentage = 100
+    scene.render.use_compositing = True
+
+    view_layer = scene.view_layers[0]
+    view_layer.use_pass_diffuse_color = True
+    view_layer.use_pass_normal = normals
+
+    # Render Layers -> File Output (float EXR, so colour management never touches the data)
+    scene.use_nodes = True
+    tree = scene.node_tree
+    tree.nodes.clear()
+    layers = tree.nodes.new('CompositorNodeRLayers')
+    output = tree.nodes.new('CompositorNodeOutputFile')
+    output.base_path = work_dir
+    output.format.file_format = 'OPEN_EXR'
+    output.format.color_depth = '16'
+    output.file_slots.clear()
+    passes = [('albedo', 'DiffCol'), ('alpha', 'Alpha')] + ([('normal', 'Normal')] if normals else [])
+    for slot, socket in passes:
+        output.file_slots.new(f"{slot}_")
+        tree.links.new(layers.outputs[socket], output.inputs[f"{slot}_"])
+
+def render_cell(scene, work_dir, slots):
+    """Render the current view; returns {slot: (cell, cell, 4) float pixels, top row first}"""
+    for path in glob.glob(os.path.join(work_dir, '*.exr')):
+        os.remove(path)
+    bpy.ops.render.render(write_still=False)
+
+    passes = {}
+    for slot in slots:
+        path = glob.glob(os.path.join(work_dir, f"{slot}_*.exr"))[0]
+        img = bpy.data.images.load(path)
+        width, height = img.size
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        img.pixels.foreach_get(pixels)
+        passes[slot] = pixels.reshape(height, width, 4)[::-1]
+        bpy.data.images.remove(img)
+    return passes
+
+def linear_to_srgb(rgb):
+    rgb = np.clip(rgb, 0.0, 1.0)
+    return np.where(rgb <= 0.0031308, rgb * 12.92, 1.055 * np.power(rgb, 1 / 2.4) - 0.055)
+
+def save_png(pixels, path):
+    """Save (h, w, 4) float pixels in 0..1, top row first, as an RGBA PNG"""
+    height, width = pixels.shape[:2]
+    img = bpy.data.images.new(os.path.basename(path), width, height, alpha=True)
+    img.pixels.foreach_set(pixels[::-1].astype(np.float32).ravel())
+    img.filepath_raw = path
+    img.file_format = 'PNG'
+    img.save()
+    bpy.data.images.remove(img)
+
+def bake_impostor(obj, name, output_dir, args, work_dir, slots):
+    """Render obj from grid x grid hemisphere directions into atlases plus a descriptor"""
+    scene = bpy.context.scene
+    grid, cell = args['grid'], args['cell']
+    center, radius = bounding_sphere(obj)
+
+    # Only this object renders
+    for other in scene.objects:
+        other.hide_render = other is not obj and other.type == 'MESH'
+
+    camera_data = bpy.data.cameras.new(f"{name}_impostor")
+    camera_data.type = 'ORTHO'
+    camera_data.ortho_scale = radius * 2
+    camera_data.clip_start = radius * 0.01
+    camera_data.clip_end = radius * 6
+    camera = bpy.data.objects.new(f"{name}_impostor", camera_data)
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+
+    albedo = np.zeros((grid * cell, grid * cell, 4), dtype=np.float32)
+    normal = np.zeros_like(albedo) if 'normal' in slots else None
+    for j in range(grid):
+        for i in range(grid):
+            u = (i + 0.5) / grid * 2 - 1
+            v = (j + 0.5) / grid * 2 - 1
+            direction = octahedral_direction(u, v)
+            camera.location = center + direction * radius * 3
+            camera.rotation_euler = (-direction).to_track_quat('-Z', 'Y').to_euler()
+
+            passes = render_cell(scene, work_dir, slots)
+            block = albedo[j * cell:(j + 1) * cell, i * cell:(i + 1) * cell]
+            block[:, :, :3] = linear_to_srgb(passes['albedo'][:, :, :3])
+            block[:, :, 3] = passes['alpha'][:, :, 0]
+            if normal is not None:
+                # World normals, Blender Z up -> glTF Y up, encoded to 0..1
+                n = passes['normal'][:, :, :3]
+                gltf = np.stack([n[:, :, 0], n[:, :, 2], -n[:, :, 1]], axis=2)
+                normal[j * cell:(j + 1) * cell, i * cell:(i + 1) * cell, :3] = gltf * 0.5 + 0.5
+                normal[j * cell:(j + 1) * cell, i * cell:(i + 1) * cell, 3] = passes['alpha'][:, :, 0]
+
+    bpy.data.objects.remove(camera, do_unlink=True)
+    bpy.data.cameras.remove(camera_data)
+
+    os.makedirs(output_dir, exist_ok=True)
+    atlas_file = f"{name}_impostor.png"
+    save_png(albedo, os.path.join(output_dir, atlas_file))
+    descriptor = {
+        'name': name,
+        'mapping': 'hemi-octahedral',
+        'grid': grid,
+        'cell_size': cell,
+        'atlas': atlas_file,
+        'normal_atlas': None,
+        # glTF space (Y up): Blender (x, y, z) -> (x, z, -y)
+        'center': [round(center.x, 4), round(center.z, 4), round(-center.y, 4)],
+        'radius': round(radius, 4),
+        'quad_size': round(radius * 2, 4)
+    }
+    if normal is not None:
+        descriptor['normal_atlas'] = f"{name}_impostor_normal.png"
+        save_png(normal, os.path.join(output_dir, descriptor['normal_atlas']))
+
+    with open(os.path.join(output_dir, f"{name}_impostor.json"), 'w') as f:
+        json.dump(descriptor, f, indent=2)
+        f.write('\n')
+    print(f"  ✓ Baked impostor: {atlas_file} ({grid * cell}x{grid * cell}, {grid * grid} views)")
+    return descriptor
+
+def bake_trees(args, work_dir, slots):
+    """Bake every tree in the tree FBX"""
+    output_dir = args['output'] or DEFAULT_OUTPUTS['trees']
+    trees = convert_trees.import_trees(args['tree_input'])
+    setup_render(bpy.context.scene, args['cell'], args['samples'], work_dir, args['normals'])
+    baked = 0
+    for tree in trees:
+        name = convert_trees.tree_filename(tree)[:-len('.glb')]
+        print(f"\nBaking: {name}")
+        with build_trace.span('bake_impostor', 'impostor', file=name):
+            bake_impostor(tree, name, output_dir, args, work_dir, slots)
+        baked += 1
+    return baked
+
+def bake_bushes(args, work_dir, slots):
+    """Bake each pack bush, one import at a time"""
+    output_dir = args['output'] or DEFAULT_OUTPUTS['bushes']
+    models_dir = os.path.join(args['pack_input'], 'models')
+    textures_dir = os.path.join(args['pack_input'], 'textures')
+    baked = 0
+    for index in args['items']:
+        name = f"bush{index:02d}"
+        bush = convert_bushes.import_bush_fbx(os.path.join(models_dir, f"{name}.fbx"),
+                                              os.path.join(textures_dir, f"{name}.png"))
+        if not bush:
+            print(f"  ✗ Failed to import {name}")
+            continue
+        convert_bushes.optimize_textures_for_psx()
+        setup_render(bpy.context.scene, args['cell'], args['samples'], work_dir, args['normals'])
+        print(f"\nBaking: {name}")
+        with build_trace.span('bake_impostor', 'impostor', file=name):
+            bake_impostor(bush, name, output_dir, args, work_dir, slots)
+        baked += 1
+    return baked
+
+def main():
+    """Bake impostors for the selected asset kinds"""
+    print("\n" + "="*60)
+    print("IMPOSTOR BAKER (PSX Horror Edition)")
+    print("="*60 + "\n")
+
+    args = parse_args()
+    if args['trace']:
+        build_trace.enable(args['trace'])
+
+    print(f"Configuration:")
+    print(f"  Kind: {args['kind']}")
+    print(f"  Grid: {args['grid']}x{args['grid']} views, {args['cell']}px cells "
+          f"({args['grid'] * args['cell']}px atlas)")
+    print(f"  Normals: {'yes' if args['normals'] else 'no'}")
+    print(f"  Renderer: Cycles (CPU), {args['samples']} samples\n")
+
+    slots = ['albedo', 'alpha'] + (['normal'] if args['normals'] else [])
+    work_dir = tempfile.mkdtemp(prefix='impostor-')
+    baked = 0
+    try:
+        if args['kind'] in ('trees', 'all'):
+            build_trace.stage('trees')
+            baked += bake_trees(args, work_dir, slots)
+        if args['kind'] in ('bushes', 'all'):
+            build_trace.stage('bushes')
+            baked += bake_bushes(args, work_dir, slots)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        clear_scene()
+
+    build_trace.write()
+
+    # Summary
+    print("\n" + "="*60)
+    print(f"BAKE COMPLETE!")
+    print(f"  Baked: {baked} impostor(s)")
+    print("="*60 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Asset Pipeline Benchmark for The Nightman Cometh
+Times audio_processor.py and the Blender tree export stages on deterministic
+synthetic corpora, writes a JSON baseline and flags regressions against it.
+
+Usage:
+    python scripts/benchmark-pipelines.py                   # run and print timings
+    python scripts/benchmark-pipelines.py --save-baseline   # run and store the baseline
+    python scripts/benchmark-pipelines.py --compare         # run and compare with the baseline
+
+Runs offline. Encode/build stages need ffmpeg; model stages run only when
+Blender is found (--blender or PATH) and are executed by this same file inside
+`blender --background`.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import random
+import hashlib
+import platform
+import argparse
+import statistics
+import subprocess
+import tempfile
+import wave
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = Path('.cache/benchmark_baseline.json')
+BASELINE_VERSION = 1
+
+# Corpus defaults; changing them invalidates comparisons with older baselines
+DEFAULT_SEED = 1337
+DEFAULT_WAVS = 24
+DEFAULT_MESHES = 6
+DEFAULT_REPEAT = 3
+WAV_DURATIONS = [0.2, 0.5, 1.0, 1.0, 2.0, 3.0, 5.0, 12.0, 30.0]  # Seconds, mostly short SFX
+WAV_SAMPLE_RATES = [22050, 44100, 48000]
+
+# Regressions smaller than this are treated as timer noise
+REGRESSION_THRESHOLD = 0.10  # Fractional slowdown of the median
+NOISE_FLOOR_SECONDS = 0.005
+
+RESULT_MARKER = 'BENCHMARK_RESULT '
+
+
+def time_stage(fn: Callable[[], Optional[int]], repeat: int,
+               setup: Optional[Callable[[], None]] = None) -> Dict:
+    """Run fn `repeat` times (after an untimed setup each time) and summarize wall time"""
+    runs = []
+    items = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        items = fn()
+        runs.append(time.perf_counter() - start)
+    return {
+        'runs': [round(run, 6) for run in runs],
+        'min': round(min(runs), 6),
+        'median': round(statistics.median(runs), 6),
+        'mean': round(statistics.mean(runs), 6),
+        'items': items
+    }
+
+
+# ---------------------------------------------------------------------------
+# Audio corpus and stages (host Python)
+# ---------------------------------------------------------------------------
+
+def synth_samples(rng: random.Random, frames: int, channels: int, sample_rate: int) -> bytes:
+    """Deterministic 16-bit PCM: silent lead-in, decaying tone sweep plus noise"""
+    lead = int(rng.uniform(0.0, 0.15) * sample_rate)
+    f0 = rng.uniform(80.0, 400.0)
+    f1 = rng.uniform(400.0, 4000.0)
+    noise = rng.uniform(0.0, 0.3)
+    decay = rng.uniform(0.5, 4.0)
+    noise_rng = random.Random(rng.random())
+
+    out = bytearray()
+    phase = 0.0
+    for i in range(frames):
+        if i < lead:
+            out += b'\x00\x00' * channels
+            continue
+        t = (i - lead) / sample_rate
+        phase += 2 * math.pi * (f0 + (f1 - f0) * (i / frames)) / sample_rate
+        envelope = math.exp(-decay * t / max(frames / sample_rate, 0.1))
+        for c in range(channels):
+            value = envelope * (0.6 * math.sin(phase + c * 0.5) + noise * (noise_rng.random() * 2 - 1))
+            out += int(max(-1.0, min(1.0, value)) * 32000).to_bytes(2, 'little', signed=True)
+    return bytes(out)
+
+
+def generate_audio_corpus(root: Path, count: int, seed: int, name_map: Dict) -> List[Path]:
+    """Write `count` WAVs under root/public/assets/audio, reusing real source names where possible"""
+    audio_dir = root / 'public' / 'assets' / 'audio'
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    (root / 'src' / 'audio').mkdir(parents=True, exist_ok=True)
+
+    # Real names route files through every category profile, in the
+    # in-process stages and in the full audio_processor.py build alike
+    names = sorted(name for name in name_map if name.endswith('.wav'))
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        name = names[i] if i < len(names) else f'bench_{i:03d}.wav'
+        sample_rate = rng.choice(WAV_SAMPLE_RATES)
+        channels = rng.choice([1, 2])
+        frames = int(rng.choice(WAV_DURATIONS) * sample_rate)
+        path = audio_dir / name
+        with wave.open(str(path), 'wb') as f:
+            f.setnchannels(channels)
+            f.setsampwidth(2)
+            f.setframerate(sample_rate)
+            f.writeframes(synth_samples(rng, frames, channels, sample_rate))
+        paths.append(path)
+    return paths
+
+
+def corpus_hash(paths: List[Path]) -> str:
+    """Content hash of a corpus, so baselines are only compared on identical inputs"""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(path.name.encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def run_audio_stages(ap, root: Path, paths: List[Path], repeat: int) -> Dict[str, Dict]:
+    """Time the audio_processor.py stages (ap: the imported module) against the corpus in root"""
+    stages = {}
+    cwd = os.getcwd()
+    os.chdir(root)  # audio_processor.py resolves its paths from the project root
+    try:
+        files = [str(path.relative_to(root)) for path in paths]
+        output_dir = Path('public/assets/audio/optimized')
+
+        print(f"  audio.probe ({len(files)} files)...")
+        stages['audio.probe'] = time_stage(
+            lambda: sum(1 for f in files if ap.analyze_audio_file(f)), repeat)
+        infos = [(f, ap.analyze_audio_file(f)) for f in files]
+
+        if ap.np is not None:
+            print("  audio.levels...")
+            stages['audio.levels'] = time_stage(
+                lambda: sum(1 for f, info in infos if ap.measure_levels(f, info['channels'])), repeat)
+        else:
+            print("  [SKIP] audio.levels: NumPy not installed")
+
+        if not shutil.which('ffmpeg'):
+            print("  [SKIP] audio.encode/manifest/typescript/build: ffmpeg not found")
+            return stages
+
+        entries = []
+
+        def encode():
+            entries.clear()
+            for f, info in infos:
+                _, entry = ap.process_audio_file(f, info, output_dir)
+                if entry:
+                    entry['tier'] = ap.assign_preload_tier(entry)
+                    entries.append(entry)
+            return len(entries)
+
+        print("  audio.encode...")
+        stages['audio.encode'] = time_stage(encode, repeat)
+
+        manifest_path = output_dir / 'audio_manifest.json'
+
+        def write_manifest():
+            with open(manifest_path, 'w') as f:
+                json.dump({'version': '1.0', 'files': entries, 'categories': ap.AUDIO_CATEGORIES}, f, indent=2)
+            return len(entries)
+
+        print("  audio.manifest...")
+        stages['audio.manifest'] = time_stage(write_manifest, repeat)
+        print("  audio.typescript...")
+        stages['audio.typescript'] = time_stage(
+            lambda: len(ap.generate_typescript_map(entries, {}, {})), repeat)
+
+        # Whole-script builds: cold measures everything, warm measures the cache
+        build = [sys.executable, str(SCRIPTS_DIR / 'audio_processor.py'), '--jobs', '1']
+
+        def run_build():
+            subprocess.run(build, check=True, stdout=subprocess.DEVNULL)
+
+        def clear_build():
+            shutil.rmtree(ap.CACHE_PATH.parent, ignore_errors=True)
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+        print("  audio.build_cold...")
+        stages['audio.build_cold'] = time_stage(run_build, repeat, setup=clear_build)
+        print("  audio.build_warm...")
+        stages['audio.build_warm'] = time_stage(run_build, repeat)
+    finally:
+        os.chdir(cwd)
+    return stages
+
+
+def find_blender(explicit: Optional[str]) -> Optional[str]:
+    """Blender executable from --blender, $BLENDER or PATH"""
+    candidate = explicit or os.environ.get('BLENDER') or 'blender'
+    return shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+
+
+def run_blender_stages(blender: str, root: Path, meshes: int, seed: int, repeat: int) -> Dict[str, Dict]:
+    """Run this file inside headless Blender and collect the model stage timings it prints"""
+    cmd = [blender, '--background', '--factory-startup', '--python', str(Path(__file__).resolve()),
+           '--', '--blender-stage', '--corpus', str(root / 'models'),
+           '--meshes', str(meshes), '--seed', str(seed), '--repeat', str(repeat)]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    for line in result.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    print(f"  [FAIL] Blender stages failed (exit {result.returncode})")
+    print(result.stdout[-2000:])
+    print(result.stderr[-2000:])
+    return {}
+
+
+# ---------------------------------------------------------------------------
+# Model corpus and stages (inside Blender)
+# ---------------------------------------------------------------------------
+
+def blender_stage_main(args) -> None:
+    """Generate a procedural tree FBX, then time convert-trees.py's import and export"""
+    import bpy
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location('convert_trees', SCRIPTS_DIR / 'convert-trees.py')
+    convert_trees = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(convert_trees)
+
+    corpus = Path(args.corpus)
+    corpus.mkdir(parents=True, exist_ok=True)
+    fbx_path = corpus / 'bench_trees.fbx'
+    export_dir = corpus / 'glb'
+
+    # Trunk + canopy per tree, with seeded segment counts so triangle
+    # totals are stable across runs
+    rng = random.Random(args.seed)
+    convert_trees.clear_scene()
+    for i in range(args.meshes):
+        x = i * 4.0
+        height = rng.uniform(3.0, 8.0)
+        bpy.ops.mesh.primitive_cylinder_add(vertices=rng.choice([8, 12, 16]), radius=rng.uniform(0.2, 0.5),
+                                            depth=height, location=(x, 0, height / 2))
+        trunk = bpy.context.active_object
+        bpy.ops.mesh.primitive_ico_sphere_add(subdivisions=rng.choice([2, 3, 4]), radius=rng.uniform(1.5, 3.0),
+                                              location=(x, 0, height))
+        canopy = bpy.context.active_object
+        bpy.ops.object.select_all(action='DESELECT')
+        trunk.select_set(True)
+        canopy.select_set(True)
+        bpy.context.view_layer.objects.active = trunk
+        bpy.ops.object.join()
+        trunk.name = f'BenchTree_{i:02d}'
+    bpy.ops.export_scene.fbx(filepath=str(fbx_path))
+
+    triangles = 0
+
+    def import_stage():
+        convert_trees.clear_scene()
+        convert_trees.import_fbx(str(fbx_path))
+        return len(convert_trees.get_tree_objects())
+
+    def export_stage():
+        exported = 0
+        for obj in convert_trees.get_tree_objects():
+            if convert_trees.export_glb(obj, str(export_dir), f'{obj.name.lower()}.glb'):
+                exported += 1
+        return exported
+
+    stages = {'blender.import': time_stage(import_stage, args.repeat)}
+    for obj in convert_trees.get_tree_objects():
+        obj.data.calc_loop_triangles()
+        triangles += len(obj.data.loop_triangles)
+    stages['blender.export'] = time_stage(export_stage, args.repeat)
+    stages['blender.import']['triangles'] = triangles
+
+    print(RESULT_MARKER + json.dumps(stages))
+
+
+# ---------------------------------------------------------------------------
+# Baselines
+# ---------------------------------------------------------------------------
+
+def compare_results(baseline: Dict, current: Dict, threshold: float) -> int:
+    """Print a stage-by-stage comparison of medians, returning the number of regressions"""
+    if baseline.get('corpus') != current['corpus']:
+        print("[WARN] Corpus differs from the baseline; timings are not directly comparable")
+        print(f"  baseline: {baseline.get('corpus')}")
+        print(f"  current:  {current['corpus']}")
+
+    regressions = 0
+    print(f"\n{'stage':20s} | {'baseline':>10s} | {'current':>10s} | {'change':>8s}")
+    print("-"*60)
+    for name, stage in current['stages'].items():
+        base = baseline.get('stages', {}).get(name)
+        if not base:
+            print(f"{name:20s} | {'-':>10s} | {stage['median']:9.3f}s | {'new':>8s}")
+            continue
+        change = (stage['median'] - base['median']) / base['median'] if base['median'] else 0.0
+        regressed = change > threshold and stage['median'] - base['median'] > NOISE_FLOOR_SECONDS
+        regressions += regressed
+        print(f"{name:20s} | {base['median']:9.3f}s | {stage['median']:9.3f}s | {change*100:+7.1f}% "
+              f"{'[FAIL]' if regressed else '[OK]'}")
+    for name in sorted(set(baseline.get('stages', {})) - set(current['stages'])):
+        print(f"{name:20s} | {baseline['stages'][name]['median']:9.3f}s | {'-':>10s} | {'skipped':>8s}")
+    return regressions
+
+
+def parse_args():
+    """Parse command line arguments (after -- when running inside Blender)"""
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description='Benchmark the asset pipelines on synthetic corpora')
+    parser.add_argument('--wavs', type=int, default=DEFAULT_WAVS, help='Synthetic WAV count')
+    parser.add_argument('--meshes', type=int, default=DEFAULT_MESHES, help='Synthetic tree mesh count')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Corpus random seed')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed runs per stage')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='Baseline JSON path')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline')
+    parser.add_argument('--compare', action='store_true', help='Compare against the baseline, exit 1 on regression')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help=f'Allowed median slowdown before failing (default: {REGRESSION_THRESHOLD})')
+    parser.add_argument('--blender', help='Blender executable (default: $BLENDER or blender on PATH)')
+    parser.add_argument('--no-blender', action='store_true', help='Skip the model stages')
+    parser.add_argument('--output', type=Path, help='Also write this run\'s results to a JSON file')
+    # Internal: set when this file is re-run inside Blender
+    parser.add_argument('--blender-stage', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--corpus', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    args.repeat = max(1, args.repeat)
+    return args
+
+
+def main():
+    args = parse_args()
+    if args.blender_stage:
+        blender_stage_main(args)
+        return
+
+    print("="*80)
+    print("ASSET PIPELINE BENCHMARK - The Nightman Cometh")
+    print("="*80)
+
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    import audio_processor as ap
+
+    with tempfile.TemporaryDirectory(prefix='nightman-bench-') as tmp:
+        root = Path(tmp)
+        print(f"\nGenerating corpus (seed {args.seed}, {args.wavs} WAVs, {args.meshes} meshes)...")
+        paths = generate_audio_corpus(root, args.wavs, args.seed, ap.AUDIO_NAME_MAP)
+        corpus = {'seed': args.seed, 'wavs': args.wavs, 'meshes': args.meshes,
+                  'audio_hash': corpus_hash(paths),
+                  'audio_kb': round(sum(path.stat().st_size for path in paths) / 1024, 1)}
+
+        print(f"\nTiming audio stages ({args.repeat} run(s) each)...")
+        stages = run_audio_stages(ap, root, paths, args.repeat)
+
+        blender = None if args.no_blender else find_blender(args.blender)
+        if blender:
+            print(f"\nTiming Blender stages with {blender}...")
+            stages.update(run_blender_stages(blender, root, args.meshes, args.seed, args.repeat))
+        elif not args.no_blender:
+            print("\n[SKIP] Blender stages: Blender not found (use --blender or $BLENDER)")
+
+    results = {
+        'version': BASELINE_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                    'cpus': os.cpu_count()},
+        'corpus': corpus,
+        'stages': stages
+    }
+
+    print("\n" + "-"*80)
+    for name, stage in stages.items():
+        print(f"{name:20s} | median {stage['median']:8.3f}s | min {stage['min']:8.3f}s | items {stage['items']}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\n[OK] Results saved to: {args.output}")
+
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"\n[FAIL] No baseline at {args.baseline}; run with --save-baseline first")
+            raise SystemExit(1)
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_results(baseline, results, args.threshold)
+        print(f"\n[{'FAIL' if regressions else 'OK'}] {regressions} regression(s) "
+              f"above {args.threshold*100:.0f}%")
+        if regressions:
+            raise SystemExit(1)
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"\n[OK] Baseline saved to: {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
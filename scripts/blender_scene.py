@@ -0,0 +1,78 @@
+"""
+Scene reset and memory accounting shared by the Blender conversion scripts
+(convert-trees.py, convert-bushes.py, convert-batch.py)
+
+clear_scene() removes every object and then purges orphaned data recursively:
+node groups, actions, armatures, collections and data that only loses its last
+user once something else is removed. Long batches in one Blender session keep
+a flat datablock count and memory footprint instead of growing per job.
+"""
+
+import os
+import bpy
+
+try:
+    import psutil  # Optional: accurate RSS on every platform
+except ImportError:
+    psutil = None
+
+# bpy.data collections that imports can fill; counted by datablock_counts()
+DATA_COLLECTIONS = ('objects', 'meshes', 'materials', 'textures', 'images', 'node_groups', 'actions',
+                    'armatures', 'collections', 'cameras', 'lights', 'curves')
+
+
+def purge_orphans():
+    """Remove datablocks with no users, repeating until nothing more becomes orphaned.
+
+    Returns the number of datablocks removed.
+    """
+    removed = 0
+    if hasattr(bpy.data, 'orphans_purge'):
+        # Blender 3.2+: one recursive call covers every datablock type
+        while True:
+            count = bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+            if not count:
+                return removed
+            removed += count
+
+    # Older Blender: sweep each collection until a pass removes nothing
+    while True:
+        swept = 0
+        for attr in DATA_COLLECTIONS:
+            collection = getattr(bpy.data, attr, None)
+            if collection is None:
+                continue
+            for block in [block for block in collection if block.users == 0]:
+                collection.remove(block)
+                swept += 1
+        if not swept:
+            return removed
+        removed += swept
+
+
+def clear_scene():
+    """Remove all objects and child collections, then purge the orphaned data"""
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    # Imported FBX/glTF hierarchies leave collections behind in the scene
+    for scene in bpy.data.scenes:
+        for child in list(scene.collection.children):
+            scene.collection.children.unlink(child)
+    return purge_orphans()
+
+
+def datablock_counts():
+    """Number of datablocks per bpy.data collection (leak check between jobs)"""
+    return {attr: len(getattr(bpy.data, attr)) for attr in DATA_COLLECTIONS if hasattr(bpy.data, attr)}
+
+
+def memory_mb():
+    """Resident set size of this Blender process in MB, or None if it can't be read"""
+    if psutil is not None:
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError, AttributeError):
+        return None
@@ -0,0 +1,197 @@
+"""
+Build tracing shared by the asset scripts (audio_processor.py, convert-trees.py,
+convert-bushes.py)
+
+Spans are recorded as Chrome trace events, loadable in chrome://tracing or
+https://ui.perfetto.dev, and summarized per stage with the slowest files.
+Tracing is off until enable() is called; until then span() hands back one
+shared no-op object and nothing is recorded.
+
+    import build_trace
+    build_trace.enable('trace.json')
+    build_trace.stage('encode')              # sequential top-level stages
+    with build_trace.span('encode_file', file=path) as s:
+        result = build_trace.run(cmd)        # subprocess.run with a span
+        s.set(bytes=os.path.getsize(output))
+    build_trace.write()                      # trace.json + trace.summary.json
+"""
+
+import os
+import json
+import time
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SLOWEST_FILES = 10
+
+_events: Optional[List[Dict]] = None  # Trace events while enabled
+_trace_path: Optional[Path] = None
+_origin = 0.0
+_thread_ids: Dict[int, int] = {}
+_stage = None
+
+
+class _Span:
+    """A timed region; its complete ('X') event is recorded on exit"""
+    __slots__ = ('name', 'cat', 'args', 'start')
+
+    def __init__(self, name: str, cat: str, args: Dict):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0.0
+
+    def set(self, **args):
+        """Attach more arguments (byte counts, results) before the span closes"""
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        _record(self, time.perf_counter())
+        return False
+
+
+class _NullSpan:
+    """Stand-in returned while tracing is off"""
+    __slots__ = ()
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _thread_id() -> int:
+    """Small stable id per thread, with a name event the first time it is seen"""
+    ident = threading.get_ident()
+    tid = _thread_ids.get(ident)
+    if tid is None:
+        tid = _thread_ids.setdefault(ident, len(_thread_ids) + 1)
+        _events.append({'ph': 'M', 'name': 'thread_name', 'pid': os.getpid(), 'tid': tid,
+                        'args': {'name': threading.current_thread().name}})
+    return tid
+
+
+def _record(span: _Span, end: float):
+    events = _events
+    if events is None:
+        return
+    events.append({
+        'ph': 'X',
+        'name': span.name,
+        'cat': span.cat,
+        'ts': round((span.start - _origin) * 1e6, 1),
+        'dur': round((end - span.start) * 1e6, 1),
+        'pid': os.getpid(),
+        'tid': _thread_id(),
+        'args': span.args
+    })
+
+
+def enabled() -> bool:
+    return _events is not None
+
+
+def enable(trace_path: str):
+    """Start recording; write() saves to trace_path and a .summary.json next to it"""
+    global _events, _trace_path, _origin
+    _events = []
+    _trace_path = Path(trace_path)
+    _origin = time.perf_counter()
+
+
+def span(name: str, cat: str = 'stage', **args):
+    """Context manager timing a region; args (file=, bytes=, ...) land in the trace"""
+    if _events is None:
+        return _NULL_SPAN
+    return _Span(name, cat, args)
+
+
+def stage(name: Optional[str]):
+    """Close the current top-level stage and open the next (None just closes it)"""
+    global _stage
+    if _events is None:
+        return
+    if _stage is not None:
+        _stage.__exit__(None, None, None)
+    _stage = _Span(name, 'pipeline', {}).__enter__() if name else None
+
+
+def run(cmd: List[str], file: Optional[str] = None, **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run, traced as a 'subprocess' span named after the executable"""
+    if _events is None:
+        return subprocess.run(cmd, **kwargs)
+    with span(os.path.basename(cmd[0]), 'subprocess', file=file, cmd=' '.join(map(str, cmd))) as s:
+        result = subprocess.run(cmd, **kwargs)
+        s.set(returncode=result.returncode)
+    return result
+
+
+def summarize(events: List[Dict]) -> Dict:
+    """Per-name totals for each category plus the slowest spans that name a file"""
+    totals: Dict[str, Dict[str, Dict]] = {}
+    for event in events:
+        if event['ph'] != 'X':
+            continue
+        entry = totals.setdefault(event['cat'], {}).setdefault(
+            event['name'], {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        ms = event['dur'] / 1000
+        entry['count'] += 1
+        entry['total_ms'] += ms
+        entry['max_ms'] = max(entry['max_ms'], ms)
+    for by_name in totals.values():
+        for entry in by_name.values():
+            entry['total_ms'] = round(entry['total_ms'], 3)
+            entry['max_ms'] = round(entry['max_ms'], 3)
+
+    with_files = [event for event in events
+                  if event['ph'] == 'X' and event['cat'] != 'subprocess' and event['args'].get('file')]
+    slowest = sorted(with_files, key=lambda event: -event['dur'])[:SLOWEST_FILES]
+    return {
+        'wall_ms': round(max((e['ts'] + e['dur'] for e in events if e['ph'] == 'X'), default=0) / 1000, 3),
+        'totals': totals,
+        'slowest_files': [{
+            'name': event['name'],
+            'file': event['args']['file'],
+            'ms': round(event['dur'] / 1000, 3),
+            'bytes': event['args'].get('bytes')
+        } for event in slowest]
+    }
+
+
+def write() -> Optional[Tuple[Path, Path]]:
+    """Close any open stage and write the trace and summary files"""
+    if _events is None:
+        return None
+    stage(None)
+    events = list(_events)
+
+    _trace_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(_trace_path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    summary = summarize(events)
+    summary_path = _trace_path.with_suffix('.summary.json')
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"\nTrace: {_trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+    for name, entry in sorted(summary['totals'].get('pipeline', {}).items(),
+                              key=lambda item: -item[1]['total_ms']):
+        print(f"  {name:20s} {entry['total_ms']:10.1f} ms")
+    print(f"Trace summary: {summary_path}")
+    return _trace_path, summary_path
@@ -0,0 +1,298 @@
+"""
+Collider fitting for the Blender conversion scripts (convert-trees.py, convert-batch.py)
+
+Fits simple physics shapes to the exported meshes instead of hand-typing them:
+- trees: an upright cylinder (or capsule) around the lower trunk. It is fitted
+  to the bark vertices in the bottom TRUNK_SAMPLE_RATIO of the bark height;
+  foliage cards are never part of a collider;
+- rocks and other props: a convex hull of at most HULL_VERTEX_BUDGET
+  vertices, with the XZ outline of the hull as its footprint;
+- foliage (bushes): no collider.
+
+Vertex data is read with foreach_get, and each fit is a few NumPy reductions.
+Shapes are in the mesh node's glTF frame (Y up, metres), the same frame the
+runtime loaders bake into the geometry.
+
+Fitted shapes are written to colliders.bin next to the GLBs. Every block in
+the file is 4-byte aligned and little-endian, so the loader (src/world/ColliderPack.ts)
+can view it as typed arrays without parsing geometry:
+
+    header  'CLDR', u32 version, u32 count
+    entry   u32 name bytes, name (UTF-8, zero padded to 4), u32 type (SHAPE_TYPES),
+            f32 center[3], f32 radius, f32 height
+    hull    u32 vertex count, u32 triangle count, u32 footprint count,
+            f32 vertices[3 * n], u32 indices[3 * m], f32 footprint[2 * k] (x, z)
+
+radius/height bound every shape (for hulls: the XZ radius around the center
+and the Y extent). The hull arrays can be passed directly to Rapier's
+ColliderDesc.convexMesh(). Importing this module does not require Blender.
+"""
+
+import os
+import re
+import time
+import struct
+from typing import Dict, Optional
+
+import numpy as np  # Bundled with Blender
+
+TRUNK_SAMPLE_RATIO = 0.15  # Bottom fraction of the bark height used to fit the trunk
+TRUNK_RADIUS_PERCENTILE = 90  # Radial percentile of trunk vertices taken as the radius (ignores root flares)
+HULL_VERTEX_BUDGET = 32  # Most vertices in a rock's convex hull
+HULL_EPSILON = 1e-6  # Relative distance under which a point counts as on a hull face
+
+PACK_FILE = "colliders.bin"
+PACK_MAGIC = b'CLDR'
+PACK_VERSION = 1
+SHAPE_TYPES = ('none', 'cylinder', 'capsule', 'hull')
+
+# Blender Z-up -> glTF Y-up, as the glTF exporter converts it
+TO_GLTF = np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0], [0.0, -1.0, 0.0]])
+
+
+def node_name(name: str) -> str:
+    """Object name as three.js GLTFLoader names the node (PropertyBinding.sanitizeNodeName)"""
+    return re.sub(r'[\[\].:/]', '', re.sub(r'\s', '_', name))
+
+
+def gltf_points(obj) -> np.ndarray:
+    """(N, 3) vertex positions with the object's local transform applied, in glTF axes"""
+    mesh = obj.data
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+    mesh.vertices.foreach_get('co', co)
+    matrix = np.array(obj.matrix_local, dtype=np.float64)
+    points = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    return points @ TO_GLTF.T
+
+
+def solid_vertices(obj, foliage) -> np.ndarray:
+    """Boolean mask of vertices used by at least one non-foliage polygon"""
+    mesh = obj.data
+    loop_vertex = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', loop_vertex)
+    loop_total = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', loop_total)
+    material_index = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('material_index', material_index)
+
+    loop_material = np.repeat(material_index, loop_total)
+    solid = np.zeros(len(mesh.vertices), dtype=bool)
+    solid[loop_vertex[~np.isin(loop_material, list(foliage))]] = True
+    return solid
+
+
+def fit_trunk(points: np.ndarray, shape: str = 'cylinder') -> Optional[Dict]:
+    """Upright cylinder/capsule around the lower trunk of bark-only points (None when empty)"""
+    if len(points) == 0:
+        return None
+    y = points[:, 1]
+    base, top = float(y.min()), float(y.max())
+    sample = points[y <= base + (top - base) * TRUNK_SAMPLE_RATIO]
+    if len(sample) < 3:
+        sample = points
+
+    # Median is robust against a few branch stubs low on the trunk
+    center = np.median(sample[:, [0, 2]], axis=0)
+    distances = np.hypot(sample[:, 0] - center[0], sample[:, 2] - center[1])
+    radius = max(float(np.percentile(distances, TRUNK_RADIUS_PERCENTILE)), 1e-3)
+    height = top - base
+    return {'type': shape, 'center': [float(center[0]), base + height / 2, float(center[1])],
+            'radius': radius, 'height': height}
+
+
+def fibonacci_directions(count: int) -> np.ndarray:
+    """`count` unit vectors spread evenly over the sphere"""
+    i = np.arange(count) + 0.5
+    polar = np.arccos(1 - 2 * i / count)
+    azimuth = np.pi * (1 + 5 ** 0.5) * i
+    return np.stack([np.cos(azimuth) * np.sin(polar), np.cos(polar), np.sin(azimuth) * np.sin(polar)], axis=1)
+
+
+def hull_candidates(points: np.ndarray, budget: int) -> np.ndarray:
+    """At most `budget` extreme points (support points in evenly spread directions).
+
+    Every candidate lies on the true hull, so the reduced hull stays inside the mesh.
+    """
+    for count in range(2 * budget, 3, -1):
+        extremes = np.unique(np.argmax(points @ fibonacci_directions(count).T, axis=0))
+        if len(extremes) <= budget:
+            return points[extremes]
+    return points[np.unique(np.argmax(points @ fibonacci_directions(4).T, axis=0))]
+
+
+def convex_hull(points: np.ndarray):
+    """Incremental 3D convex hull of a small point set.
+
+    Returns (vertices (n, 3), triangles (m, 3)) with outward, counter-clockwise
+    triangles, or None when the points are flat.
+    """
+    scale = float(np.ptp(points, axis=0).max()) or 1.0
+    eps = HULL_EPSILON * scale
+
+    # Initial tetrahedron from far-apart points
+    a = int(np.argmin(points[:, 0]))
+    b = int(np.argmax(np.linalg.norm(points - points[a], axis=1)))
+    line = points[b] - points[a]
+    c = int(np.argmax(np.linalg.norm(np.cross(points - points[a], line), axis=1)))
+    normal = np.cross(line, points[c] - points[a])
+    if np.linalg.norm(normal) <= eps * scale:
+        return None
+    offsets = (points - points[a]) @ normal
+    d = int(np.argmax(np.abs(offsets)))
+    if abs(offsets[d]) <= eps * np.linalg.norm(normal):
+        return None
+
+    faces = [(a, b, c), (a, c, d), (a, d, b), (b, d, c)] if offsets[d] < 0 else \
+            [(a, c, b), (a, d, c), (a, b, d), (b, c, d)]
+
+    def outside(face, p):
+        u, v, w = points[list(face)]
+        n = np.cross(v - u, w - u)
+        return (p - u) @ n > eps * np.linalg.norm(n)
+
+    for index in range(len(points)):
+        if index in (a, b, c, d):
+            continue
+        visible = [face for face in faces if outside(face, points[index])]
+        if not visible:
+            continue
+        edges = {(face[i], face[(i + 1) % 3]) for face in visible for i in range(3)}
+        horizon = [(u, v) for u, v in edges if (v, u) not in edges]
+        faces = [face for face in faces if face not in visible] + [(u, v, index) for u, v in horizon]
+
+    used = sorted({i for face in faces for i in face})
+    remap = {old: new for new, old in enumerate(used)}
+    return points[used], np.array([[remap[i] for i in face] for face in faces], dtype=np.uint32)
+
+
+def footprint(points: np.ndarray) -> np.ndarray:
+    """Counter-clockwise 2D convex hull of the points' XZ coordinates (monotone chain)"""
+    xz = sorted(set(map(tuple, np.round(points[:, [0, 2]], 6))))
+    if len(xz) < 3:
+        return np.array(xz, dtype=np.float64)
+
+    def cross(o, p, q):
+        return (p[0] - o[0]) * (q[1] - o[1]) - (p[1] - o[1]) * (q[0] - o[0])
+
+    lower, upper = [], []
+    for p in xz:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(xz):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return np.array(lower[:-1] + upper[:-1], dtype=np.float64)
+
+
+def fit_hull(points: np.ndarray, budget: int = HULL_VERTEX_BUDGET) -> Optional[Dict]:
+    """Convex hull collider with at most `budget` vertices (None when the points are flat)"""
+    if len(points) < 4:
+        return None
+    hull = convex_hull(hull_candidates(points, budget))
+    if hull is None:
+        return None
+    vertices, triangles = hull
+    low, high = vertices.min(axis=0), vertices.max(axis=0)
+    center = (low + high) / 2
+    outline = footprint(vertices)
+    radius = float(np.hypot(outline[:, 0] - center[0], outline[:, 1] - center[2]).max())
+    return {'type': 'hull', 'center': [float(value) for value in center], 'radius': radius,
+            'height': float(high[1] - low[1]), 'vertices': vertices, 'indices': triangles, 'footprint': outline}
+
+
+def fit_object(obj, kind: str, foliage=()) -> Dict:
+    """Fit a collider to a mesh object; kind is 'cylinder'/'capsule' (trunk), 'hull' or 'none'"""
+    start = time.perf_counter()
+    collider = None
+    if kind in ('cylinder', 'capsule'):
+        points = gltf_points(obj)
+        collider = fit_trunk(points[solid_vertices(obj, foliage)] if foliage else points, kind)
+    elif kind == 'hull':
+        collider = fit_hull(gltf_points(obj))
+        if collider is None:
+            collider = fit_trunk(gltf_points(obj))
+    collider = collider or {'type': 'none', 'center': [0.0, 0.0, 0.0], 'radius': 0.0, 'height': 0.0}
+
+    elapsed = (time.perf_counter() - start) * 1000
+    detail = f"r={collider['radius']:.2f} h={collider['height']:.2f}"
+    if collider['type'] == 'hull':
+        detail += f", {len(collider['vertices'])} vertices, {len(collider['indices'])} triangles"
+    print(f"  ✓ Collider: {obj.name} {collider['type']} ({detail}, {elapsed:.1f} ms)")
+    return collider
+
+
+def json_collider(collider: Dict) -> Dict:
+    """trees.json physics_collider entry for a fitted trunk"""
+    return {'type': collider['type'], 'radius': round(collider['radius'], 4), 'height': round(collider['height'], 4),
+            'center': [round(value, 4) for value in collider['center']], 'fitted': True}
+
+
+def _padded(data: bytes) -> bytes:
+    return data + b'\0' * (-len(data) % 4)
+
+
+def write_pack(path: str, colliders: Dict[str, Dict]):
+    """Write colliders.bin (see the module docstring for the layout), sorted by name"""
+    chunks = [PACK_MAGIC, struct.pack('<II', PACK_VERSION, len(colliders))]
+    for name in sorted(colliders):
+        collider = colliders[name]
+        encoded = name.encode('utf-8')
+        chunks.append(struct.pack('<I', len(encoded)) + _padded(encoded))
+        chunks.append(struct.pack('<I5f', SHAPE_TYPES.index(collider['type']), *collider['center'],
+                                  collider['radius'], collider['height']))
+        if collider['type'] == 'hull':
+            vertices = np.asarray(collider['vertices'], dtype='<f4')
+            indices = np.asarray(collider['indices'], dtype='<u4')
+            outline = np.asarray(collider['footprint'], dtype='<f4')
+            chunks.append(struct.pack('<III', len(vertices), len(indices), len(outline)))
+            chunks.extend((vertices.tobytes(), indices.tobytes(), outline.tobytes()))
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(b''.join(chunks))
+    os.replace(tmp_path, path)
+
+
+def read_pack(path: str) -> Dict[str, Dict]:
+    """Colliders from a colliders.bin written by write_pack()"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != PACK_MAGIC:
+        raise ValueError(f"{path} is not a collider pack")
+    version, count = struct.unpack_from('<II', data, 4)
+    if version != PACK_VERSION:
+        raise ValueError(f"{path}: unsupported collider pack version {version}")
+
+    colliders, offset = {}, 12
+    for _ in range(count):
+        (length,) = struct.unpack_from('<I', data, offset)
+        name = data[offset + 4:offset + 4 + length].decode('utf-8')
+        offset += 4 + length + (-length % 4)
+        shape, *values = struct.unpack_from('<I5f', data, offset)
+        offset += 24
+        collider = {'type': SHAPE_TYPES[shape], 'center': values[:3], 'radius': values[3], 'height': values[4]}
+        if collider['type'] == 'hull':
+            vertex_count, triangle_count, outline_count = struct.unpack_from('<III', data, offset)
+            offset += 12
+            for key, dtype, items, width in (('vertices', '<f4', vertex_count, 3), ('indices', '<u4', triangle_count, 3),
+                                             ('footprint', '<f4', outline_count, 2)):
+                collider[key] = np.frombuffer(data, dtype=dtype, count=items * width, offset=offset).reshape(-1, width)
+                offset += items * width * 4
+        colliders[name] = collider
+    return colliders
+
+
+def update_pack(path: str, colliders: Dict[str, Dict]):
+    """Merge colliders into an existing pack (replacing same-named entries) and write it"""
+    merged = {}
+    if os.path.exists(path):
+        try:
+            merged = read_pack(path)
+        except (ValueError, struct.error) as e:
+            print(f"  ⚠ Replacing unreadable {path}: {e}")
+    merged.update(colliders)
+    write_pack(path, merged)
+    print(f"  ✓ {len(colliders)} collider(s) written to {path} ({os.path.getsize(path)} bytes, {len(merged)} total)")
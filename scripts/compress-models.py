@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+GLB Geometry Compression for The Nightman Cometh
+Compresses already exported GLBs (trees, bushes, props/rocks.glb, creatures)
+with meshopt + quantization via gltfpack, using the per-asset-class bits in
+glb_compression.QUANTIZATION_PROFILES, then decodes the original and the
+compressed file with glb-bounds.mjs (three's MeshoptDecoder under Node,
+skinned meshes placed by their joints), compares the vertex bounds and
+reports the size delta per GLB. With --ktx2 the
+embedded textures are also transcoded to KTX2 (ktx2_textures.py, needs toktx).
+
+Usage:
+    python scripts/compress-models.py                         # every asset class, in place
+    python scripts/compress-models.py --classes props,creatures
+    python scripts/compress-models.py --out-dir .cache/compressed --dry-run
+    python scripts/compress-models.py --geometry none --ktx2  # textures only
+
+Geometry compression is skipped for files that already use
+EXT_meshopt_compression or KHR_draco_mesh_compression, and KTX2 transcoding
+for files that already use KHR_texture_basisu. Exits 1 if any file fails to
+compress or verify; the original is then left untouched. For Draco, use the
+Blender converters' --compress draco.
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import glb_compression
+import ktx2_textures
+
+MODELS_DIR = Path('public/assets/models')
+ASSET_CLASSES = {
+    'trees': ['trees/*.glb'],
+    'bushes': ['bushes/*.glb'],
+    'props': ['props/*.glb'],
+    'creatures': ['creatures/*.glb']
+}
+COMPRESSED_EXTENSIONS = ('EXT_meshopt_compression', 'KHR_draco_mesh_compression')
+
+
+def find_models(models_dir: Path, classes: List[str]) -> List[Dict]:
+    """GLBs per asset class ({'class', 'path'})"""
+    models = []
+    for asset_class in classes:
+        for pattern in ASSET_CLASSES[asset_class]:
+            models.extend({'class': asset_class, 'path': path} for path in sorted(models_dir.glob(pattern)))
+    return models
+
+
+def compress_model(path: Path, asset_class: str, output: Path, dry_run: bool,
+                   geometry: bool = True, ktx2: bool = False) -> Dict:
+    """Compress one GLB and verify its decoded bounds; returns a result row for the report"""
+    result = {'file': str(path), 'class': asset_class, 'before': path.stat().st_size, 'after': None,
+              'error': None, 'allowed': None, 'status': 'FAIL', 'textures': []}
+    gltf = glb_compression.read_glb_json(str(path))
+    extensions = set(gltf.get('extensionsUsed', []))
+    geometry = geometry and not extensions & set(COMPRESSED_EXTENSIONS)
+    ktx2 = ktx2 and ktx2_textures.EXTENSION not in extensions
+    if not geometry and not ktx2:
+        result['status'] = 'SKIP'
+        return result
+
+    fd, tmp_path = tempfile.mkstemp(suffix='.glb')
+    os.close(fd)
+    try:
+        if geometry:
+            glb_compression.run_gltfpack(str(path), tmp_path, asset_class)
+        else:
+            shutil.copyfile(path, tmp_path)
+        if ktx2:
+            result['textures'] = ktx2_textures.transcode_glb(tmp_path)
+            for entry in result['textures']:
+                entry['glb'] = path.name
+        result['after'] = os.path.getsize(tmp_path)
+
+        # Decoded positions must still land inside the original bounds (within one quantization step)
+        if geometry:
+            source, packed = glb_compression.decoded_bounds([str(path), tmp_path])
+            if not source or not packed:
+                raise RuntimeError('no mesh vertices decoded')
+            result['error'] = glb_compression.bounds_error(source, packed)
+            result['allowed'] = glb_compression.allowed_error(source, asset_class)
+            if result['error'] > result['allowed']:
+                return result
+        else:
+            result['message'] = 'geometry unchanged'
+        result['status'] = 'OK'
+
+        if not dry_run:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(tmp_path, output)
+    except (RuntimeError, ValueError) as e:
+        result['message'] = str(e)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return result
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Compress exported GLBs with meshopt and quantization')
+    parser.add_argument('--models', type=Path, default=MODELS_DIR, help='Models directory')
+    parser.add_argument('--classes', default=','.join(ASSET_CLASSES),
+                        help=f"Comma-separated asset classes ({', '.join(ASSET_CLASSES)})")
+    parser.add_argument('--geometry', choices=['meshopt', 'none'], default='meshopt',
+                        help='Geometry compression (default: meshopt)')
+    parser.add_argument('--ktx2', action='store_true', help='Also transcode embedded textures to KTX2 (needs toktx)')
+    parser.add_argument('--out-dir', type=Path, help='Write compressed files here instead of in place')
+    parser.add_argument('--dry-run', action='store_true', help='Only report sizes, keep the originals')
+    parser.add_argument('--report', type=Path, help='Also write the results as JSON')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("="*80)
+    print("GLB GEOMETRY COMPRESSION - The Nightman Cometh")
+    print("="*80)
+
+    classes = [name for name in args.classes.split(',') if name]
+    unknown = [name for name in classes if name not in ASSET_CLASSES]
+    if unknown:
+        print(f"[FAIL] Unknown asset class(es): {', '.join(unknown)}")
+        raise SystemExit(1)
+    if args.geometry == 'meshopt' and not shutil.which(glb_compression.GLTFPACK):
+        print("[FAIL] gltfpack not found (install meshoptimizer's gltfpack or set $GLTFPACK)")
+        raise SystemExit(1)
+    if args.geometry == 'meshopt' and not shutil.which(glb_compression.NODE):
+        print("[FAIL] node not found; it decodes the compressed files for verification (or set $NODE)")
+        raise SystemExit(1)
+    if args.ktx2 and not shutil.which(ktx2_textures.TOKTX):
+        print("[FAIL] toktx not found (install KTX-Software or set $TOKTX)")
+        raise SystemExit(1)
+
+    models = find_models(args.models, classes)
+    if not models:
+        print(f"[FAIL] No GLB files for {', '.join(classes)} in {args.models}")
+        raise SystemExit(1)
+
+    tools = [glb_compression.GLTFPACK] if args.geometry == 'meshopt' else []
+    tools += [ktx2_textures.TOKTX] if args.ktx2 else []
+    print(f"\nCompressing {len(models)} GLB(s) with {' + '.join(tools) or 'nothing'}...\n")
+    print(f"{'':6s} {'file':40s} {'class':9s} {'before':>10s} {'after':>10s} {'saved':>6s}  bounds")
+    print("-"*80)
+    results = []
+    for model in models:
+        path = model['path']
+        output = args.out_dir / path.relative_to(args.models) if args.out_dir else path
+        result = compress_model(path, model['class'], output, args.dry_run,
+                                args.geometry == 'meshopt', args.ktx2)
+        results.append(result)
+
+        after = f"{result['after'] / 1024:.1f} KB" if result['after'] else '-'
+        saved = f"{(1 - result['after'] / result['before']) * 100:.0f}%" if result['after'] else '-'
+        if result['status'] == 'SKIP':
+            bounds = 'already compressed'
+        elif result['error'] is not None:
+            bounds = f"err {result['error']:.5f} (max {result['allowed']:.5f})"
+        else:
+            bounds = result.get('message', '-')
+        print(f"[{result['status']}]".ljust(6) + f" {str(path.relative_to(args.models)):40s} {model['class']:9s} "
+              f"{result['before'] / 1024:7.1f} KB {after:>10s} {saved:>6s}  {bounds}")
+
+    compressed = [result for result in results if result['after'] and result['status'] != 'FAIL']
+    failed = [result for result in results if result['status'] == 'FAIL']
+    before = sum(result['before'] for result in compressed)
+    after = sum(result['after'] for result in compressed)
+    print("-"*80)
+    if compressed:
+        print(f"Compressed {len(compressed)} GLB(s): {before / 1024:.1f} KB -> {after / 1024:.1f} KB "
+              f"({(1 - after / before) * 100:.0f}% smaller){' (dry run)' if args.dry_run else ''}")
+
+    ktx2_textures.print_report([entry for result in results for entry in result['textures']])
+
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(results, indent=2, default=str))
+
+    if failed:
+        print(f"[FAIL] {len(failed)} GLB(s) failed to compress or verify")
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+"""
+Blender Python Script: Run Many Conversions in One Blender Session
+
+Reads a JSON job list and converts trees (convert-trees.py), tree pack
+bushes/trees (convert-bushes.py) and GLB props such as rocks.glb one after
+another, paying Blender's startup once. Between jobs the scene is cleared and
+orphaned data is purged recursively, and each job's time, memory and leftover
+datablocks are reported so growth across a long batch is visible.
+
+Usage:
+    blender --background --python scripts/convert-batch.py
+    blender --background --python scripts/convert-batch.py -- --jobs scripts/convert-jobs.json --report .cache/convert-batch.json
+
+Job list (see scripts/convert-jobs.json):
+    {"type": "trees", "input": "tree/Trees/Trees.fbx", "output": "public/assets/models/trees", "create_stumps": [0.5, 0.08]}
+    {"type": "pack", "kind": "bush", "input": "tree_pack_1.1 (1)/tree_pack_1.1", "items": [2, 4], "output": "..."}
+    {"type": "glb", "input": "rocks/rocks_-_psx_low_poly.glb", "output": "public/assets/models/props/rocks.glb"}
+
+Any job may set "texture_size" (power of two) and "palette" (16 or 256) for the
+PSX texture reduction; a "trees" job may set "atlas": true
+(convert-trees.py --atlas), "lods": true or a list of ratios (--lods) and
+"create_stumps": true or a list of cut height ratios (--stump-heights).
+Any job may also set "compress" ("draco" or "meshopt") and "profile", the
+asset class whose quantization bits to use (glb_compression.QUANTIZATION_PROFILES;
+defaults to trees/bushes by job, props for "glb" jobs), and "ktx2": true to
+transcode embedded textures to KTX2 (ktx2_textures.py). "shared_textures": true
+(or a directory) writes images to the shared texture library (texture_library.py).
+"colliders" sets the fitted collider shape (collider_fit.py): trees get trunk
+cylinders and "glb" jobs convex hulls per mesh unless it names another shape
+("capsule", "cylinder", "hull") or is false. Pack jobs (bushes) get none.
+
+A "pack" job without "items" converts every <kind>NN.fbx it finds; each model
+is reported as its own job.
+"""
+
+import bpy
+import os
+import sys
+import json
+import time
+import importlib.util
+
+# Blender does not put the script directory on sys.path
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import build_trace
+import blender_scene
+import psx_textures
+import glb_compression
+import ktx2_textures
+import texture_library
+import collider_fit
+
+# Configuration
+DEFAULT_JOBS = os.path.join(SCRIPTS_DIR, "convert-jobs.json")
+DEFAULT_REPORT = ".cache/convert-batch.json"
+JOB_TYPES = ('trees', 'pack', 'glb')
+DEFAULT_PROFILES = {'trees': 'trees', 'bush': 'bushes', 'tree': 'trees', 'glb': 'props'}
+
+def load_script(name, filename):
+    """Import one of the hyphen-named converter scripts as a module"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+convert_trees = load_script('convert_trees', 'convert-trees.py')
+convert_bushes = load_script('convert_bushes', 'convert-bushes.py')
+
+def parse_args():
+    """Parse command line arguments after --"""
+    args = {
+        'jobs': DEFAULT_JOBS,
+        'report': DEFAULT_REPORT,
+        'trace': None
+    }
+
+    # Get args after -- separator
+    try:
+        separator_idx = sys.argv.index('--')
+        script_args = sys.argv[separator_idx + 1:]
+
+        for i in range(0, len(script_args), 2):
+            if i + 1 < len(script_args):
+                key = script_args[i].lstrip('-')
+                value = script_args[i + 1]
+
+                if key in ['jobs', 'report', 'trace']:
+                    args[key] = value
+    except ValueError:
+        pass
+
+    return args
+
+def load_jobs(path):
+    """Read the job list and expand pack jobs into one job per model"""
+    with open(path) as f:
+        data = json.load(f)
+    jobs = data['jobs'] if isinstance(data, dict) else data
+
+    expanded = []
+    for job in jobs:
+        if job.get('type') not in JOB_TYPES:
+            raise ValueError(f"Unknown job type {job.get('type')!r} (expected one of {', '.join(JOB_TYPES)})")
+        if job['type'] != 'pack':
+            expanded.append(dict(job, name=job.get('name', os.path.basename(job['input']))))
+            continue
+
+        kind = job.get('kind', 'bush')
+        models_dir = os.path.join(job['input'], 'models')
+        items = job.get('items')
+        if items is None:
+            items = convert_bushes.find_models(models_dir, kind) if os.path.isdir(models_dir) else []
+        for index in items:
+            expanded.append(dict(job, kind=kind, index=index, name=f"{kind}{index:02d}"))
+    return expanded
+
+def texture_settings(job):
+    """(texture_size, palette_colors) for a job, defaulting to convert-trees.py's settings"""
+    return (psx_textures.floor_power_of_two(job.get('texture_size', convert_trees.PSX_TEXTURE_SIZE)),
+            job.get('palette', convert_trees.PSX_PALETTE_COLORS))
+
+def compression_settings(job):
+    """(mode, asset class) for a job's geometry compression"""
+    profile = DEFAULT_PROFILES[job['kind'] if job['type'] == 'pack' else job['type']]
+    return job.get('compress', 'none'), job.get('profile', profile)
+
+def library_setting(job):
+    """Shared texture library directory for a job, or None to embed textures"""
+    shared = job.get('shared_textures')
+    if isinstance(shared, str):
+        return shared
+    return texture_library.DEFAULT_LIBRARY if shared else None
+
+def collider_setting(job, default):
+    """Collider shape for a job ("colliders": a shape name, true for `default`, false for none)"""
+    shape = job.get('colliders', True)
+    if isinstance(shape, str):
+        return shape
+    return default if shape else None
+
+def run_trees_job(job):
+    """Import a multi-tree FBX and export every tree; returns the files written"""
+    trees = convert_trees.import_trees(job['input'], *texture_settings(job))
+    if not trees:
+        raise RuntimeError(f"no tree meshes imported from {job['input']}")
+    if job.get('atlas'):
+        convert_trees.atlas_trees(trees, job['output'])
+    build_trace.stage('export')
+    stumps = job.get('create_stumps', False)
+    stump_heights = stumps if isinstance(stumps, list) else convert_trees.STUMP_HEIGHT_RATIOS if stumps else ()
+    files = []
+    for tree in trees:
+        if convert_trees.export_tree(tree, job['output'], stump_heights):
+            files.append(os.path.join(job['output'], convert_trees.tree_filename(tree)))
+    shape = collider_setting(job, convert_trees.TRUNK_COLLIDER)
+    if shape:
+        convert_trees.write_colliders(trees, job['output'], shape)
+    if job.get('lods'):
+        ratios = job['lods'] if isinstance(job['lods'], list) else convert_trees.LOD_RATIOS
+        convert_trees.export_all_lods(trees, job['output'], ratios)
+    return files
+
+def run_pack_job(job):
+    """Convert one tree pack model (bushNN/treeNN); returns the files written"""
+    result = convert_bushes.convert_model(job['kind'], job['index'],
+                                          os.path.join(job['input'], 'models'),
+                                          os.path.join(job['input'], 'textures'), job['output'],
+                                          *texture_settings(job))
+    if not result['ok']:
+        raise RuntimeError(result['error'])
+    return [result['file']]
+
+def run_glb_job(job):
+    """Re-export a GLB source (e.g. the rocks pack) with PSX texture settings as one GLB"""
+    if not os.path.exists(job['input']):
+        raise FileNotFoundError(job['input'])
+
+    build_trace.stage('import_glb')
+    with build_trace.span('import_glb', 'import', file=job['input']):
+        bpy.ops.import_scene.gltf(filepath=job['input'])
+    build_trace.stage('psx_textures')
+    convert_trees.optimize_textures_for_psx(*texture_settings(job))
+
+    build_trace.stage('export')
+    os.makedirs(os.path.dirname(job['output']) or '.', exist_ok=True)
+    bpy.ops.object.select_all(action='DESELECT')
+    images = {}
+    for obj in bpy.data.objects:
+        if obj.type in ('MESH', 'EMPTY'):
+            obj.select_set(True)
+        if obj.type == 'MESH':
+            images.update((img.name, img) for img in psx_textures.object_images(obj))
+    texture_bytes = sum(psx_textures.source_bytes(img) for img in images.values())
+    with build_trace.span('export_glb', 'export', file=os.path.basename(job['output'])) as span:
+        bpy.ops.export_scene.gltf(
+            filepath=job['output'],
+            use_selection=True,
+            export_format='GLB',
+            export_materials='EXPORT',
+            export_image_format='AUTO'
+        )
+        span.set(bytes=os.path.getsize(job['output']))
+    print(f"  ✓ Exported: {os.path.basename(job['output'])}")
+    psx_textures.record_export(job['output'], texture_bytes)
+    if glb_compression.enabled():
+        meshes = [obj for obj in bpy.data.objects if obj.type == 'MESH']
+        with build_trace.span('compress_glb', 'export', file=os.path.basename(job['output'])):
+            glb_compression.compress_export(job['output'], meshes)
+    if ktx2_textures.enabled():
+        with build_trace.span('ktx2_textures', 'export', file=os.path.basename(job['output'])):
+            ktx2_textures.transcode_export(job['output'])
+    if texture_library.enabled():
+        texture_library.externalize_export(job['output'])
+
+    shape = collider_setting(job, 'hull')
+    if shape:
+        build_trace.stage('colliders')
+        colliders = {collider_fit.node_name(obj.name): collider_fit.fit_object(obj, shape)
+                     for obj in bpy.data.objects if obj.type == 'MESH'}
+        collider_fit.update_pack(os.path.join(os.path.dirname(job['output']), collider_fit.PACK_FILE), colliders)
+    return [job['output']]
+
+JOB_RUNNERS = {
+    'trees': run_trees_job,
+    'pack': run_pack_job,
+    'glb': run_glb_job
+}
+
+def run_job(job):
+    """Run one job, reset the scene and measure what it left behind"""
+    record = {'job': job['name'], 'type': job['type'], 'ok': False, 'files': [], 'error': None}
+    memory_before = blender_scene.memory_mb()
+    start = time.perf_counter()
+
+    try:
+        glb_compression.configure(*compression_settings(job))
+        ktx2_textures.configure(bool(job.get('ktx2')))
+        texture_library.configure(library_setting(job))
+        with build_trace.span(job['name'], 'job', file=job['input']):
+            record['files'] = JOB_RUNNERS[job['type']](job)
+        record['ok'] = True
+    except Exception as e:
+        print(f"  ✗ Job failed: {e}")
+        record['error'] = str(e)
+
+    build_trace.stage('reset')
+    record['purged'] = blender_scene.clear_scene()
+    record['seconds'] = round(time.perf_counter() - start, 3)
+    record['memory_mb'] = blender_scene.memory_mb()
+    if memory_before is not None and record['memory_mb'] is not None:
+        record['memory_delta_mb'] = round(record['memory_mb'] - memory_before, 1)
+    record['datablocks'] = sum(blender_scene.datablock_counts().values())
+    record['bytes'] = sum(os.path.getsize(path) for path in record['files'] if os.path.exists(path))
+    return record
+
+def main():
+    """Run every job in the list in this Blender session"""
+    print("\n" + "="*60)
+    print("BATCH FBX/GLB → GLB CONVERTER (PSX Horror Edition)")
+    print("="*60 + "\n")
+
+    args = parse_args()
+    if args['trace']:
+        build_trace.enable(args['trace'])
+
+    try:
+        jobs = load_jobs(args['jobs'])
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Could not read job list {args['jobs']}: {e}")
+        sys.exit(1)
+
+    print(f"Configuration:")
+    print(f"  Job list: {args['jobs']} ({len(jobs)} job(s))")
+    print(f"  Report: {args['report']}\n")
+
+    # Start from an empty scene so the first job is measured like the rest
+    blender_scene.clear_scene()
+    baseline_blocks = sum(blender_scene.datablock_counts().values())
+
+    records = []
+    for i, job in enumerate(jobs):
+        print(f"\n[{i+1}/{len(jobs)}] {job['type']}: {job['name']}")
+        record = run_job(job)
+        records.append(record)
+        memory = f"{record['memory_mb']:.0f} MB" if record['memory_mb'] is not None else "n/a"
+        print(f"  {'✓' if record['ok'] else '✗'} {record['seconds']:.2f}s, memory {memory}, "
+              f"purged {record['purged']}, datablocks {record['datablocks']}")
+        if record['datablocks'] > baseline_blocks:
+            print(f"  ⚠ {record['datablocks'] - baseline_blocks} datablock(s) survived the reset")
+
+    build_trace.write()
+    psx_textures.print_report()
+    glb_compression.print_report()
+    ktx2_textures.print_report()
+    texture_library.print_report()
+
+    failed = [record for record in records if not record['ok']]
+    memory_values = [record['memory_mb'] for record in records if record['memory_mb'] is not None]
+    report = {
+        'jobs': records,
+        'total_seconds': round(sum(record['seconds'] for record in records), 3),
+        'failed': len(failed),
+        'memory_mb': {'first': memory_values[0], 'last': memory_values[-1], 'peak': max(memory_values)}
+                     if memory_values else None,
+        'leaked_datablocks': max((record['datablocks'] for record in records), default=0) - baseline_blocks
+    }
+    os.makedirs(os.path.dirname(args['report']) or '.', exist_ok=True)
+    with open(args['report'], 'w') as f:
+        json.dump(report, f, indent=2)
+
+    # Summary
+    print("\n" + "="*60)
+    print(f"BATCH COMPLETE!")
+    print(f"  Jobs: {len(records) - len(failed)}/{len(records)} succeeded in {report['total_seconds']:.1f}s")
+    if report['memory_mb']:
+        print(f"  Memory: {report['memory_mb']['first']:.0f} MB after first job, "
+              f"{report['memory_mb']['last']:.0f} MB after last (peak {report['memory_mb']['peak']:.0f} MB)")
+    print(f"  Report: {os.path.abspath(args['report'])}")
+    for record in failed:
+        print(f"  ✗ {record['job']}: {record['error']}")
+    print("="*60 + "\n")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -12,23 +12,79 @@ Usage:
 
     Or with custom paths:
     blender --background --python scripts/convert-bushes.py -- --input "tree_pack_1.1 (1)/tree_pack_1.1" --output public/assets/models/bushes
+
+    Keep Blender open and re-export only the bushes whose FBX/PNG changes:
+    blender --background --python scripts/convert-bushes.py -- --watch
+
+    Convert the pack's trees (treeNN.fbx + treeNN.png) instead, or only some items:
+    blender --background --python scripts/convert-bushes.py -- --kind tree --output public/assets/models/trees/pack
+    blender --background --python scripts/convert-bushes.py -- --items 1,3,5 --results shard.json
+
+    Shrink the embedded textures further (alpha is kept for the MASK cut-outs):
+    blender --background --python scripts/convert-bushes.py -- --texture-size 128 --palette 16
+
+    Put every bush on one shared atlas material (layout goes to atlas.json):
+    blender --background --python scripts/convert-bushes.py -- --atlas
+
+    scripts/convert-parallel.py runs many of these as parallel shards.
+
+    Compress geometry with quantization (Draco, or meshopt via gltfpack):
+    blender --background --python scripts/convert-bushes.py -- --compress meshopt
+
+    Transcode embedded textures to KTX2 (ETC1S albedo, UASTC foliage) with a local toktx:
+    blender --background --python scripts/convert-bushes.py -- --ktx2
+
+    Write each unique image once to models/textures/ and reference it by URI (see texture_library.py):
+    blender --background --python scripts/convert-bushes.py -- --shared-textures
+
+    Record a Chrome trace of import/texture/export timings:
+    blender --background --python scripts/convert-bushes.py -- --trace .cache/bushes-trace.json
 """
 
 import bpy
 import os
+import re
 import sys
+import json
+import time
 from pathlib import Path
 
+# Blender does not put the script directory on sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import asset_watch
+import build_trace
+import psx_textures
+import glb_compression
+import ktx2_textures
+import texture_library
+import texture_atlas
+from blender_scene import clear_scene
+
 # Configuration
 DEFAULT_INPUT = r"C:\Users\Mattm\X\the-nightman-cometh\tree_pack_1.1 (1)\tree_pack_1.1"
 DEFAULT_OUTPUT = r"C:\Users\Mattm\X\the-nightman-cometh\public\assets\models\bushes"
 BUSH_COUNT = 8  # bush01 through bush08
+MODEL_KINDS = ('bush', 'tree')  # File prefixes in the pack: bushNN.fbx, treeNN.fbx
+ATLAS_JSON = "atlas.json"  # Atlas layout next to the exported GLBs
+PSX_TEXTURE_SIZE = 256  # Largest texture side after resampling (power of two)
+PSX_PALETTE_COLORS = None  # 16 or 256 for indexed-colour PSX palettes, None keeps full colour
 
 def parse_args():
     """Parse command line arguments after --"""
     args = {
         'input': DEFAULT_INPUT,
-        'output': DEFAULT_OUTPUT
+        'output': DEFAULT_OUTPUT,
+        'trace': None,
+        'watch': False,
+        'atlas': False,
+        'kind': 'bush',
+        'items': None,
+        'results': None,
+        'texture_size': PSX_TEXTURE_SIZE,
+        'palette': PSX_PALETTE_COLORS,
+        'compress': 'none',
+        'ktx2': False,
+        'texture_library': None
     }
 
     # Get args after -- separator
@@ -36,43 +92,48 @@ def parse_args():
         separator_idx = sys.argv.index('--')
         script_args = sys.argv[separator_idx + 1:]
 
+        # Flags without a value come out first so the rest pair up
+        if '--watch' in script_args:
+            args['watch'] = True
+        if '--atlas' in script_args:
+            args['atlas'] = True
+        if '--ktx2' in script_args:
+            args['ktx2'] = True
+        if '--shared-textures' in script_args:
+            args['texture_library'] = texture_library.DEFAULT_LIBRARY
+        script_args = [arg for arg in script_args if arg not in ('--watch', '--atlas', '--ktx2', '--shared-textures')]
+
         for i in range(0, len(script_args), 2):
             if i + 1 < len(script_args):
                 key = script_args[i].lstrip('-')
                 value = script_args[i + 1]
 
-                if key in ['input', 'output']:
+                if key in ['input', 'output', 'trace', 'results']:
                     args[key] = value
+                elif key == 'kind' and value in MODEL_KINDS:
+                    args['kind'] = value
+                elif key == 'items':
+                    args['items'] = [int(item) for item in value.split(',') if item]
+                elif key == 'texture-size':
+                    args['texture_size'] = psx_textures.floor_power_of_two(int(value))
+                elif key == 'palette' and int(value) in psx_textures.PALETTE_SIZES:
+                    args['palette'] = int(value)
+                elif key == 'compress' and value in glb_compression.COMPRESSION_MODES:
+                    args['compress'] = value
+                elif key == 'texture-library':
+                    args['texture_library'] = value
     except ValueError:
         pass
 
     return args
 
-def clear_scene():
-    """Clear default Blender scene"""
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-
-    # Clear orphaned data
-    for block in bpy.data.meshes:
-        if block.users == 0:
-            bpy.data.meshes.remove(block)
-    for block in bpy.data.materials:
-        if block.users == 0:
-            bpy.data.materials.remove(block)
-    for block in bpy.data.textures:
-        if block.users == 0:
-            bpy.data.textures.remove(block)
-    for block in bpy.data.images:
-        if block.users == 0:
-            bpy.data.images.remove(block)
-
-def optimize_textures_for_psx():
-    """Apply PSX-style texture settings (nearest filtering, no mipmaps)"""
+def optimize_textures_for_psx(texture_size=PSX_TEXTURE_SIZE, palette_colors=PSX_PALETTE_COLORS):
+    """Apply PSX-style texture settings (power-of-two size, optional palette, nearest filtering)"""
     print(f"Optimizing textures for PSX aesthetic...")
 
     for img in bpy.data.images:
         print(f"  - Found texture: {img.name} ({img.size[0]}x{img.size[1]})")
+        psx_textures.reduce_image(img, texture_size, palette_colors)
 
     # Set materials to use nearest filtering (PSX aesthetic)
     for mat in bpy.data.materials:
@@ -86,7 +147,8 @@ def load_texture(texture_path):
     """Load texture image if it exists"""
     if os.path.exists(texture_path):
         try:
-            img = bpy.data.images.load(texture_path)
+            with build_trace.span('load_texture', 'import', file=texture_path):
+                img = bpy.data.images.load(texture_path)
             print(f"  ✓ Loaded texture: {os.path.basename(texture_path)}")
             return img
         except Exception as e:
@@ -96,8 +158,8 @@ def load_texture(texture_path):
         print(f"  ⚠ Texture not found: {texture_path}")
         return None
 
-def import_bush_fbx(fbx_path, texture_path):
-    """Import bush FBX and link texture"""
+def import_bush_fbx(fbx_path, texture_path, clear=True):
+    """Import bush FBX and link texture (clear=False adds it to the current scene)"""
     print(f"Importing: {os.path.basename(fbx_path)}")
 
     if not os.path.exists(fbx_path):
@@ -106,9 +168,11 @@ def import_bush_fbx(fbx_path, texture_path):
 
     try:
         # Clear scene before importing
-        clear_scene()
+        if clear:
+            clear_scene()
 
         # Import FBX
+        existing = set(bpy.data.objects)
         bpy.ops.import_scene.fbx(filepath=fbx_path)
 
         # Load and link texture
@@ -117,7 +181,7 @@ def import_bush_fbx(fbx_path, texture_path):
         # Find the imported mesh
         mesh_obj = None
         for obj in bpy.data.objects:
-            if obj.type == 'MESH':
+            if obj.type == 'MESH' and obj not in existing:
                 mesh_obj = obj
                 break
 
@@ -183,22 +247,154 @@ def export_glb(obj, output_path, filename):
 
     # Export path
     filepath = os.path.join(output_path, filename)
+    texture_bytes = sum(psx_textures.source_bytes(img) for img in psx_textures.object_images(obj))
 
     try:
-        # Blender 4.4+ glTF export parameters
-        bpy.ops.export_scene.gltf(
-            filepath=filepath,
-            use_selection=True,
-            export_format='GLB',
-            export_materials='EXPORT',
-            export_image_format='AUTO'
-        )
+        with build_trace.span('export_glb', 'export', file=filename) as span:
+            # Blender 4.4+ glTF export parameters
+            bpy.ops.export_scene.gltf(
+                filepath=filepath,
+                use_selection=True,
+                export_format='GLB',
+                export_materials='EXPORT',
+                export_image_format='AUTO'
+            )
+            span.set(bytes=os.path.getsize(filepath))
         print(f"  ✓ Exported: {filename}")
+        psx_textures.record_export(filepath, texture_bytes)
+        if glb_compression.enabled():
+            with build_trace.span('compress_glb', 'export', file=filename):
+                glb_compression.compress_export(filepath, [obj])
+        if ktx2_textures.enabled():
+            with build_trace.span('ktx2_textures', 'export', file=filename):
+                ktx2_textures.transcode_export(filepath)
+        if texture_library.enabled():
+            texture_library.externalize_export(filepath)
         return True
     except Exception as e:
         print(f"  ✗ Failed to export {filename}: {e}")
         return False
 
+def find_models(models_dir, kind):
+    """Item numbers of every <kind>NN.fbx in the models directory"""
+    pattern = re.compile(rf'{kind}(\d+)\.fbx$', re.IGNORECASE)
+    matches = (pattern.match(name) for name in os.listdir(models_dir))
+    return sorted(int(m.group(1)) for m in matches if m)
+
+def convert_model(kind, index, models_dir, textures_dir, output_path,
+                  texture_size=PSX_TEXTURE_SIZE, palette_colors=PSX_PALETTE_COLORS):
+    """Import, texture and export one model (bushNN.fbx + bushNN.png -> bushNN.glb).
+
+    Returns a result dict (item, file, size_kb, ok, error, seconds) for shard summaries.
+    """
+    name = f"{kind}{index:02d}"  # Format as bush01, bush02, etc.
+    fbx_path = os.path.normpath(os.path.join(models_dir, f"{name}.fbx"))
+    texture_path = os.path.normpath(os.path.join(textures_dir, f"{name}.png"))
+    result = {'item': name, 'file': None, 'size_kb': None, 'ok': False, 'error': None}
+    start = time.perf_counter()
+
+    # Import model with texture
+    build_trace.stage('import_fbx')
+    with build_trace.span('import_bush_fbx', 'import', file=fbx_path):
+        model_obj = import_bush_fbx(fbx_path, texture_path)
+
+    if not model_obj:
+        print(f"  ✗ Failed to import {name}")
+        result['error'] = f"import failed: {fbx_path}"
+    else:
+        # Apply PSX texture optimization
+        build_trace.stage('psx_textures')
+        optimize_textures_for_psx(texture_size, palette_colors)
+
+        # Export as GLB
+        build_trace.stage('export')
+        filepath = os.path.join(output_path, f"{name}.glb")
+        if export_glb(model_obj, output_path, f"{name}.glb"):
+            _, texture_before, texture_after = psx_textures.REPORT[-1]
+            result.update(ok=True, file=filepath, size_kb=round(os.path.getsize(filepath) / 1024, 1),
+                          texture_kb_before=round(texture_before / 1024, 1),
+                          texture_kb_after=round(texture_after / 1024, 1))
+        else:
+            result['error'] = f"export failed: {filepath}"
+
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+def convert_models_atlas(kind, items, models_dir, textures_dir, output_path,
+                         texture_size=PSX_TEXTURE_SIZE, palette_colors=PSX_PALETTE_COLORS):
+    """Import all models into one scene, atlas their textures onto a shared material, export each.
+
+    Returns one result dict per item, like convert_model().
+    """
+    clear_scene()
+    results, models = [], {}
+    build_trace.stage('import_fbx')
+    for index in items:
+        name = f"{kind}{index:02d}"
+        fbx_path = os.path.normpath(os.path.join(models_dir, f"{name}.fbx"))
+        texture_path = os.path.normpath(os.path.join(textures_dir, f"{name}.png"))
+        with build_trace.span('import_bush_fbx', 'import', file=fbx_path):
+            model_obj = import_bush_fbx(fbx_path, texture_path, clear=False)
+        if model_obj:
+            models[name] = model_obj
+        else:
+            results.append({'item': name, 'file': None, 'size_kb': None, 'ok': False,
+                            'error': f"import failed: {fbx_path}", 'seconds': None})
+
+    build_trace.stage('psx_textures')
+    optimize_textures_for_psx(texture_size, palette_colors)
+
+    build_trace.stage('atlas')
+    print(f"\nBuilding texture atlases...")
+    layout = texture_atlas.atlas_objects(list(models.values()), prefix=f"{kind.capitalize()}Atlas")
+
+    build_trace.stage('export')
+    entries = {}
+    for name, model_obj in models.items():
+        start = time.perf_counter()
+        filepath = os.path.join(output_path, f"{name}.glb")
+        result = {'item': name, 'file': None, 'size_kb': None, 'ok': False, 'error': None}
+        if export_glb(model_obj, output_path, f"{name}.glb"):
+            result.update(ok=True, file=filepath, size_kb=round(os.path.getsize(filepath) / 1024, 1))
+            entries[name] = {'file': f"{name}.glb", 'atlas_materials': layout['objects'].get(model_obj.name, [])}
+        else:
+            result['error'] = f"export failed: {filepath}"
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        results.append(result)
+
+    config_path = os.path.join(output_path, ATLAS_JSON)
+    with open(config_path, 'w') as f:
+        json.dump({'atlas': {key: value for key, value in layout.items() if key != 'objects'},
+                   'models': entries}, f, indent=2)
+        f.write('\n')
+    print(f"  ✓ Atlas layout written to {config_path}")
+    return results
+
+def watch_models(kind, models_dir, textures_dir, output_path, texture_size, palette_colors,
+                 atlas=False, items=()):
+    """Re-convert only the models whose FBX or texture changed, until interrupted.
+
+    With atlases every change rebuilds all of items, since they share the atlas.
+    """
+    print(f"\nWatching {models_dir} and {textures_dir} (Ctrl+C to stop)...")
+    pattern = re.compile(rf'{kind}(\d+)\.(fbx|png)$', re.IGNORECASE)
+    try:
+        for changed in asset_watch.watch([models_dir, textures_dir], ('.fbx', '.png')):
+            indices = sorted({int(m.group(1)) for m in (pattern.search(os.path.basename(p)) for p in changed) if m})
+            if atlas and indices:
+                print(f"\nChanged: {', '.join(f'{kind}{index:02d}' for index in indices)} -> all {kind} models")
+                convert_models_atlas(kind, items, models_dir, textures_dir, output_path,
+                                     texture_size, palette_colors)
+                build_trace.write()
+                continue
+            for index in indices:
+                if os.path.exists(os.path.join(models_dir, f"{kind}{index:02d}.fbx")):
+                    print(f"\nChanged: {kind}{index:02d} -> {kind}{index:02d}.glb")
+                    convert_model(kind, index, models_dir, textures_dir, output_path, texture_size, palette_colors)
+            build_trace.write()
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
 def main():
     """Main conversion process"""
     print("\n" + "="*60)
@@ -207,8 +403,14 @@ def main():
 
     # Parse arguments
     args = parse_args()
+    if args['trace']:
+        build_trace.enable(args['trace'])
     input_base = args['input']
     output_path = args['output']
+    kind = args['kind']
+    glb_compression.configure(args['compress'], 'bushes' if kind == 'bush' else 'trees')
+    ktx2_textures.configure(args['ktx2'])
+    texture_library.configure(args['texture_library'])
 
     models_dir = os.path.normpath(os.path.join(input_base, "models"))
     textures_dir = os.path.normpath(os.path.join(input_base, "textures"))
@@ -218,7 +420,9 @@ def main():
     print(f"  Models Directory: {models_dir}")
     print(f"  Textures Directory: {textures_dir}")
     print(f"  Output Directory: {output_path}")
-    print(f"  Processing {BUSH_COUNT} bushes\n")
+    print(f"  PSX Texture Size: {args['texture_size']}x{args['texture_size']} (max), palette: {args['palette'] or 'full colour'}")
+    print(f"  Geometry Compression: {args['compress']}, KTX2 textures: {'yes' if args['ktx2'] else 'no'}")
+    print(f"  Shared Texture Library: {args['texture_library'] or 'no (embedded)'}")
 
     if not os.path.exists(models_dir):
         print(f"ERROR: Models directory not found: {models_dir}")
@@ -228,35 +432,45 @@ def main():
         print(f"ERROR: Textures directory not found: {textures_dir}")
         return
 
-    # Process each bush
-    exported_count = 0
-
-    for i in range(1, BUSH_COUNT + 1):
-        bush_num = f"{i:02d}"  # Format as 01, 02, etc.
-        fbx_path = os.path.normpath(os.path.join(models_dir, f"bush{bush_num}.fbx"))
-        texture_path = os.path.normpath(os.path.join(textures_dir, f"bush{bush_num}.png"))
+    items = args['items']
+    if items is None:
+        items = list(range(1, BUSH_COUNT + 1)) if kind == 'bush' else find_models(models_dir, kind)
+    print(f"  Processing {len(items)} {kind} model(s)\n")
 
-        print(f"\n[{i}/{BUSH_COUNT}] Processing bush{bush_num}...")
+    # Process each model
+    results = []
 
-        # Import bush with texture
-        bush_obj = import_bush_fbx(fbx_path, texture_path)
-
-        if not bush_obj:
-            print(f"  ✗ Failed to import bush{bush_num}")
-            continue
-
-        # Apply PSX texture optimization
-        optimize_textures_for_psx()
+    if args['atlas']:
+        results = convert_models_atlas(kind, items, models_dir, textures_dir, output_path,
+                                       args['texture_size'], args['palette'])
+    else:
+        for n, index in enumerate(items):
+            print(f"\n[{n+1}/{len(items)}] Processing {kind}{index:02d}...")
+            results.append(convert_model(kind, index, models_dir, textures_dir, output_path,
+                                         args['texture_size'], args['palette']))
+    exported_count = sum(1 for result in results if result['ok'])
+
+    build_trace.write()
+
+    # Per-item results for convert-parallel.py
+    if args['results']:
+        with open(args['results'], 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args['watch']:
+        watch_models(kind, models_dir, textures_dir, output_path, args['texture_size'], args['palette'],
+                     args['atlas'], items)
+        return
 
-        # Export as GLB
-        filename = f"bush{bush_num}.glb"
-        if export_glb(bush_obj, output_path, filename):
-            exported_count += 1
+    psx_textures.print_report()
+    glb_compression.print_report()
+    ktx2_textures.print_report()
+    texture_library.print_report()
 
     # Summary
     print("\n" + "="*60)
     print(f"CONVERSION COMPLETE!")
-    print(f"  Exported: {exported_count}/{BUSH_COUNT} bushes")
+    print(f"  Exported: {exported_count}/{len(items)} {kind} model(s)")
     print(f"  Location: {os.path.abspath(output_path)}")
     print("="*60 + "\n")
 
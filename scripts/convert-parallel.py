@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Sharded Blender Conversion for The Nightman Cometh
+Splits the tree pack's bush/tree models into shards and converts them with N
+headless Blender workers in parallel (scripts/convert-bushes.py per shard),
+then merges the per-item results into one summary and exit code.
+
+Usage:
+    python scripts/convert-parallel.py                    # bushes and trees, one worker per CPU
+    python scripts/convert-parallel.py --kind bush --jobs 4
+    python scripts/convert-parallel.py --blender "C:/Program Files/Blender Foundation/Blender 4.2/blender.exe"
+
+Worker logs and results are kept under .cache/convert-parallel/.
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+WORKER_SCRIPT = SCRIPTS_DIR / 'convert-bushes.py'
+WORK_DIR = Path('.cache/convert-parallel')
+POLL_INTERVAL = 0.2  # Seconds between worker status checks
+
+DEFAULT_INPUT = 'tree_pack_1.1 (1)/tree_pack_1.1'
+DEFAULT_OUTPUTS = {
+    'bush': 'public/assets/models/bushes',
+    'tree': 'public/assets/models/trees/pack'
+}
+
+
+def find_blender(explicit: str = None) -> str:
+    """Blender executable from --blender, $BLENDER or PATH"""
+    candidate = explicit or os.environ.get('BLENDER') or 'blender'
+    return shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+
+
+def discover_items(models_dir: Path, kind: str) -> List[Dict]:
+    """Every <kind>NN.fbx in the models directory, with its size for shard balancing"""
+    pattern = re.compile(rf'{kind}(\d+)\.fbx$', re.IGNORECASE)
+    items = []
+    for path in sorted(models_dir.iterdir()):
+        match = pattern.match(path.name)
+        if match:
+            items.append({'kind': kind, 'index': int(match.group(1)),
+                          'item': f'{kind}{int(match.group(1)):02d}', 'bytes': path.stat().st_size})
+    return items
+
+
+def make_shards(items: List[Dict], jobs: int) -> List[List[Dict]]:
+    """Split items into shards of a single kind, balanced by FBX size.
+
+    Each kind gets a share of the workers proportional to its FBX bytes (at
+    least one), then items go largest-first into the lightest shard; import and
+    export time tracks file size closely enough to keep workers finishing together.
+    """
+    by_kind: Dict[str, List[Dict]] = {}
+    for item in items:
+        by_kind.setdefault(item['kind'], []).append(item)
+    total_bytes = sum(item['bytes'] for item in items) or 1
+
+    shards = []
+    for kind, kind_items in by_kind.items():
+        kind_bytes = sum(item['bytes'] for item in kind_items)
+        count = max(1, min(len(kind_items), round(jobs * kind_bytes / total_bytes)))
+        bins = [[0, []] for _ in range(count)]
+        for item in sorted(kind_items, key=lambda item: -item['bytes']):
+            lightest = min(bins, key=lambda b: b[0])
+            lightest[0] += item['bytes']
+            lightest[1].append(item)
+        shards.extend(sorted(b[1], key=lambda item: item['index']) for b in bins)
+    return shards
+
+
+def launch_worker(blender: str, shard_id: int, shard: List[Dict], input_dir: str,
+                  outputs: Dict[str, str], worker_args: List[str]) -> Dict:
+    """Start one headless Blender on a shard; stdout/stderr go to its log file"""
+    kind = shard[0]['kind']
+    results_path = WORK_DIR / f'shard-{shard_id}.json'
+    log_path = WORK_DIR / f'shard-{shard_id}.log'
+    results_path.unlink(missing_ok=True)
+
+    cmd = [blender, '--background', '--factory-startup', '--python', str(WORKER_SCRIPT), '--',
+           '--kind', kind,
+           '--items', ','.join(str(item['index']) for item in shard),
+           '--input', input_dir,
+           '--output', outputs[kind],
+           '--results', str(results_path)] + worker_args
+    log = open(log_path, 'w')
+    process = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)
+    return {'id': shard_id, 'items': shard, 'process': process, 'log': log, 'log_path': log_path,
+            'results_path': results_path, 'start': time.perf_counter()}
+
+
+def collect_worker(worker: Dict) -> List[Dict]:
+    """Return one result per shard item of a finished worker, marking any it never reported"""
+    returncode = worker['process'].wait()
+    worker['log'].close()
+
+    reported = {}
+    if worker['results_path'].exists():
+        try:
+            reported = {result['item']: result for result in json.loads(worker['results_path'].read_text())}
+        except (json.JSONDecodeError, KeyError) as e:
+            print(f"  [WARN] Shard {worker['id']}: unreadable results ({e})")
+
+    results = []
+    for item in worker['items']:
+        result = reported.get(item['item'])
+        if result is None:
+            result = {'item': item['item'], 'file': None, 'size_kb': None, 'ok': False, 'seconds': None,
+                      'error': f"worker exited {returncode} before reporting (see {worker['log_path']})"}
+        result['shard'] = worker['id']
+        results.append(result)
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Convert tree pack models with parallel Blender workers')
+    parser.add_argument('--blender', help='Blender executable (default: $BLENDER or blender on PATH)')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='Parallel Blender workers (default: CPU count)')
+    parser.add_argument('--kind', choices=['bush', 'tree', 'all'], default='all', help='Models to convert')
+    parser.add_argument('--input', default=DEFAULT_INPUT, help='Tree pack directory (with models/ and textures/)')
+    parser.add_argument('--bush-output', default=DEFAULT_OUTPUTS['bush'], help='Bush GLB output directory')
+    parser.add_argument('--tree-output', default=DEFAULT_OUTPUTS['tree'], help='Tree GLB output directory')
+    parser.add_argument('--texture-size', type=int, help='Largest embedded texture side (power of two)')
+    parser.add_argument('--palette', type=int, choices=[16, 256], help='Reduce textures to an indexed palette')
+    parser.add_argument('--compress', choices=['draco', 'meshopt'], help='Compress geometry with quantization')
+    parser.add_argument('--ktx2', action='store_true', help='Transcode embedded textures to KTX2 (needs toktx)')
+    parser.add_argument('--shared-textures', action='store_true',
+                        help='Write images once to the shared texture library instead of embedding them')
+    parser.add_argument('--summary', type=Path, default=WORK_DIR / 'summary.json', help='Summary JSON path')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("="*80)
+    print("PARALLEL MODEL CONVERSION - The Nightman Cometh")
+    print("="*80)
+
+    blender = find_blender(args.blender)
+    if not blender:
+        print("[FAIL] Blender not found (use --blender or $BLENDER)")
+        raise SystemExit(1)
+
+    models_dir = Path(args.input) / 'models'
+    if not models_dir.is_dir():
+        print(f"[FAIL] Models directory not found: {models_dir}")
+        raise SystemExit(1)
+
+    kinds = ['bush', 'tree'] if args.kind == 'all' else [args.kind]
+    items = [item for kind in kinds for item in discover_items(models_dir, kind)]
+    if not items:
+        print(f"[FAIL] No {'/'.join(kinds)} FBX files in {models_dir}")
+        raise SystemExit(1)
+
+    outputs = {'bush': args.bush_output, 'tree': args.tree_output}
+    for kind in kinds:
+        os.makedirs(outputs[kind], exist_ok=True)
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
+
+    shards = make_shards(items, max(1, args.jobs))
+    print(f"\nBlender: {blender}")
+    print(f"Converting {len(items)} model(s) in {len(shards)} shard(s)...")
+    for shard_id, shard in enumerate(shards):
+        print(f"  shard {shard_id}: {', '.join(item['item'] for item in shard)} "
+              f"({sum(item['bytes'] for item in shard) / 1024:.0f} KB FBX)")
+
+    start = time.perf_counter()
+    worker_args = []
+    if args.texture_size:
+        worker_args += ['--texture-size', str(args.texture_size)]
+    if args.palette:
+        worker_args += ['--palette', str(args.palette)]
+    if args.compress:
+        worker_args += ['--compress', args.compress]
+    if args.ktx2:
+        worker_args.append('--ktx2')
+    if args.shared_textures:
+        worker_args.append('--shared-textures')
+    workers = [launch_worker(blender, shard_id, shard, args.input, outputs, worker_args)
+               for shard_id, shard in enumerate(shards)]
+    results = []
+    pending = list(workers)
+    while pending:
+        time.sleep(POLL_INTERVAL)
+        for worker in [worker for worker in pending if worker['process'].poll() is not None]:
+            pending.remove(worker)
+            worker['seconds'] = time.perf_counter() - worker['start']
+            shard_results = collect_worker(worker)
+            failed = sum(1 for result in shard_results if not result['ok'])
+            status = '[FAIL]' if failed else '[OK]'
+            print(f"{status} shard {worker['id']}: {len(shard_results) - failed}/{len(shard_results)} "
+                  f"in {worker['seconds']:.1f}s")
+            results.extend(shard_results)
+    wall = time.perf_counter() - start
+
+    # Summary
+    results.sort(key=lambda result: result['item'])
+    print("\n" + "-"*80)
+    print(f"{'item':10s} | {'shard':>5s} | {'size':>10s} | {'time':>7s} | result")
+    print("-"*80)
+    for result in results:
+        size = f"{result['size_kb']:.1f} KB" if result['size_kb'] is not None else '-'
+        seconds = f"{result['seconds']:.1f}s" if result['seconds'] is not None else '-'
+        outcome = result['file'] if result['ok'] else f"ERROR: {result['error']}"
+        print(f"{result['item']:10s} | {result['shard']:5d} | {size:>10s} | {seconds:>7s} | {outcome}")
+
+    failed = [result for result in results if not result['ok']]
+    exported_kb = sum(result['size_kb'] or 0 for result in results)
+    texture_kb = (sum(result.get('texture_kb_before') or 0 for result in results),
+                  sum(result.get('texture_kb_after') or 0 for result in results))
+    summary = {
+        'blender': blender,
+        'jobs': len(shards),
+        'wall_seconds': round(wall, 3),
+        'worker_seconds': round(sum(worker['seconds'] for worker in workers), 3),
+        'exported': len(results) - len(failed),
+        'failed': len(failed),
+        'exported_kb': round(exported_kb, 1),
+        'texture_kb': {'source': round(texture_kb[0], 1), 'embedded': round(texture_kb[1], 1)},
+        'items': results
+    }
+    args.summary.parent.mkdir(parents=True, exist_ok=True)
+    args.summary.write_text(json.dumps(summary, indent=2))
+
+    print("-"*80)
+    print(f"Exported {summary['exported']}/{len(results)} model(s), {exported_kb:.1f} KB, "
+          f"{wall:.1f}s wall ({summary['worker_seconds']:.1f}s across workers)")
+    print(f"Textures: {texture_kb[0]:.1f} KB source -> {texture_kb[1]:.1f} KB embedded")
+    print(f"Summary: {args.summary}")
+
+    if failed:
+        print(f"\n[FAIL] {len(failed)} model(s) failed")
+        raise SystemExit(1)
+    print("\n[OK] All models converted")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,34 +7,100 @@ This script:
 3. Separates individual tree meshes
 4. Exports each tree as a separate GLB file
 5. Optionally creates stump variants by removing upper geometry
+6. Fits trunk colliders to each tree (trees.json physics_collider and colliders.bin)
 
 Usage:
     blender --background --python scripts/convert-trees.py
 
     Or with custom paths:
     blender --background --python scripts/convert-trees.py -- --input tree/Trees/Trees.fbx --output public/assets/models/trees
+
+    Cut stump variants (tree-x-stump.glb), or several chopping stages (tree-x-stump1.glb, ...):
+    blender --background --python scripts/convert-trees.py -- --stumps
+    blender --background --python scripts/convert-trees.py -- --stump-heights 0.6,0.3,0.08
+
+    Keep Blender open and re-export only the trees affected by FBX/texture edits:
+    blender --background --python scripts/convert-trees.py -- --watch
+
+    Shrink embedded textures further (power-of-two size, 16/256-colour palette):
+    blender --background --python scripts/convert-trees.py -- --texture-size 128 --palette 16
+
+    Pack all bark/foliage textures into shared atlases (layout goes to trees.json):
+    blender --background --python scripts/convert-trees.py -- --atlas
+
+    Also export LOD1/LOD2 meshes (tree-x-lod1.glb, ...) and record them in trees.json:
+    blender --background --python scripts/convert-trees.py -- --lods
+    blender --background --python scripts/convert-trees.py -- --lod-ratios 0.4,0.1
+
+    Compress geometry with quantization for the 'trees' asset class (Draco, or meshopt via gltfpack):
+    blender --background --python scripts/convert-trees.py -- --compress meshopt
+
+    Transcode embedded textures to KTX2 (ETC1S albedo, UASTC foliage) with a local toktx:
+    blender --background --python scripts/convert-trees.py -- --ktx2
+
+    Write each unique image once to models/textures/ and reference it by URI (see texture_library.py):
+    blender --background --python scripts/convert-trees.py -- --shared-textures
+
+    Fit trunk capsules instead of cylinders, or keep the hand-written colliders (see collider_fit.py):
+    blender --background --python scripts/convert-trees.py -- --collider capsule
+    blender --background --python scripts/convert-trees.py -- --no-colliders
+
+    Record a Chrome trace of import/texture/export timings:
+    blender --background --python scripts/convert-trees.py -- --trace .cache/trees-trace.json
 """
 
 import bpy
 import os
 import sys
+import re
+import json
 import math
 from pathlib import Path
-from mathutils import Vector
+
+# Blender does not put the script directory on sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import asset_watch
+import build_trace
+import psx_textures
+import glb_compression
+import ktx2_textures
+import texture_library
+import texture_atlas
+import mesh_lod
+import mesh_stump
+import collider_fit
+from blender_scene import clear_scene
 
 # Configuration
 DEFAULT_INPUT = "tree/Trees/Trees.fbx"
 DEFAULT_OUTPUT = "public/assets/models/trees"
 TEXTURE_SOURCE = "tree/Trees"
+TEXTURE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.tga', '.bmp')
 PSX_TEXTURE_SIZE = 256  # Reduce textures to 256x256 for PSX aesthetic
+PSX_PALETTE_COLORS = None  # 16 or 256 for indexed-colour PSX palettes, None keeps full colour
 CREATE_STUMPS = False  # User will add universal stump model later
+STUMP_HEIGHT_RATIOS = (0.3,)  # Cut height(s) as a fraction of tree height; several give chopping stages
+TREES_JSON = "trees.json"  # Tree metadata next to the exported GLBs
+INLINE_NUMBER_LIST = re.compile(r'\[\s*(-?[\d.eE+-]+(?:,\s*-?[\d.eE+-]+)*)\s*\]')  # e.g. lod_distances stay on one line
+LOD_RATIOS = (0.5, 0.2)  # Triangle ratio of LOD1, LOD2 (matches the three lod_distances)
+TRUNK_COLLIDER = 'cylinder'  # Fitted trunk shape: 'cylinder' or 'capsule'
 
 def parse_args():
     """Parse command line arguments after --"""
     args = {
         'input': DEFAULT_INPUT,
         'output': DEFAULT_OUTPUT,
-        'create_stumps': CREATE_STUMPS
+        'stumps': STUMP_HEIGHT_RATIOS if CREATE_STUMPS else (),
+        'trace': None,
+        'watch': False,
+        'atlas': False,
+        'lods': None,
+        'texture_size': PSX_TEXTURE_SIZE,
+        'palette': PSX_PALETTE_COLORS,
+        'compress': 'none',
+        'ktx2': False,
+        'texture_library': None,
+        'collider': TRUNK_COLLIDER
     }
 
     # Get args after -- separator
@@ -42,47 +108,62 @@ def parse_args():
         separator_idx = sys.argv.index('--')
         script_args = sys.argv[separator_idx + 1:]
 
+        # Flags without a value come out first so the rest pair up
+        if '--stumps' in script_args:
+            args['stumps'] = STUMP_HEIGHT_RATIOS
+        if '--no-stumps' in script_args:
+            args['stumps'] = ()
+        if '--watch' in script_args:
+            args['watch'] = True
+        if '--atlas' in script_args:
+            args['atlas'] = True
+        if '--lods' in script_args:
+            args['lods'] = LOD_RATIOS
+        if '--ktx2' in script_args:
+            args['ktx2'] = True
+        if '--shared-textures' in script_args:
+            args['texture_library'] = texture_library.DEFAULT_LIBRARY
+        if '--no-colliders' in script_args:
+            args['collider'] = None
+        script_args = [arg for arg in script_args
+                       if arg not in ('--stumps', '--no-stumps', '--watch', '--atlas', '--lods', '--ktx2',
+                                      '--shared-textures', '--no-colliders')]
+
         for i in range(0, len(script_args), 2):
             if i + 1 < len(script_args):
                 key = script_args[i].lstrip('-')
                 value = script_args[i + 1]
 
-                if key in ['input', 'output']:
+                if key in ['input', 'output', 'trace']:
                     args[key] = value
-                elif key == 'no-stumps':
-                    args['create_stumps'] = False
+                elif key == 'texture-size':
+                    args['texture_size'] = psx_textures.floor_power_of_two(int(value))
+                elif key == 'palette' and int(value) in psx_textures.PALETTE_SIZES:
+                    args['palette'] = int(value)
+                elif key == 'compress' and value in glb_compression.COMPRESSION_MODES:
+                    args['compress'] = value
+                elif key == 'collider' and value in ('cylinder', 'capsule'):
+                    args['collider'] = value
+                elif key == 'texture-library':
+                    args['texture_library'] = value
+                elif key == 'stump-heights':
+                    args['stumps'] = tuple(float(ratio) for ratio in value.split(',') if ratio)
+                elif key == 'lod-ratios':
+                    args['lods'] = tuple(float(ratio) for ratio in value.split(',') if ratio)
     except ValueError:
         pass
 
     return args
 
-def clear_scene():
-    """Clear default Blender scene"""
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-
-    # Clear orphaned data
-    for block in bpy.data.meshes:
-        if block.users == 0:
-            bpy.data.meshes.remove(block)
-    for block in bpy.data.materials:
-        if block.users == 0:
-            bpy.data.materials.remove(block)
-    for block in bpy.data.textures:
-        if block.users == 0:
-            bpy.data.textures.remove(block)
-    for block in bpy.data.images:
-        if block.users == 0:
-            bpy.data.images.remove(block)
-
-def optimize_textures_for_psx():
-    """Apply PSX-style texture settings (nearest filtering, no mipmaps)"""
+def optimize_textures_for_psx(texture_size=PSX_TEXTURE_SIZE, palette_colors=PSX_PALETTE_COLORS):
+    """Apply PSX-style texture settings (power-of-two size, optional palette, nearest filtering)"""
     print(f"Optimizing textures for PSX aesthetic...")
 
     for img in bpy.data.images:
         # Note: Texture interpolation is set per-material in Blender 4.x, not per-image
         # We'll handle this during material processing instead
         print(f"  - Found texture: {img.name} ({img.size[0]}x{img.size[1]})")
+        psx_textures.reduce_image(img, texture_size, palette_colors)
 
     # Set materials to use nearest filtering (PSX aesthetic)
     for mat in bpy.data.materials:
@@ -121,47 +202,6 @@ def get_tree_objects():
 
     return trees
 
-def create_stump_variant(tree_obj):
-    """Create a stump variant by removing geometry above certain height"""
-    # Duplicate the tree
-    bpy.ops.object.select_all(action='DESELECT')
-    tree_obj.select_set(True)
-    bpy.context.view_layer.objects.active = tree_obj
-    bpy.ops.object.duplicate()
-
-    stump = bpy.context.active_object
-    stump.name = f"{tree_obj.name}_stump"
-
-    # Get tree bounds
-    bbox = [tree_obj.matrix_world @ Vector(corner) for corner in tree_obj.bound_box]
-    z_values = [v.z for v in bbox]
-    min_z = min(z_values)
-    max_z = max(z_values)
-    height = max_z - min_z
-
-    # Calculate cut height
-    cut_height = min_z + (height * STUMP_HEIGHT_RATIO)
-
-    # Enter edit mode and delete vertices above cut height
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='DESELECT')
-    bpy.ops.object.mode_set(mode='OBJECT')
-
-    # Select vertices above cut height
-    for v in stump.data.vertices:
-        world_pos = stump.matrix_world @ v.co
-        if world_pos.z > cut_height:
-            v.select = True
-
-    # Delete selected vertices
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.delete(type='VERT')
-    bpy.ops.object.mode_set(mode='OBJECT')
-
-    print(f"  ✓ Created stump variant: {stump.name} (cut at {cut_height:.2f})")
-
-    return stump
-
 def export_glb(obj, output_path, filename):
     """Export single object as GLB"""
     # Ensure output directory exists
@@ -174,22 +214,265 @@ def export_glb(obj, output_path, filename):
 
     # Export path
     filepath = os.path.join(output_path, filename)
+    texture_bytes = sum(psx_textures.source_bytes(img) for img in psx_textures.object_images(obj))
 
     try:
-        # Blender 4.4+ glTF export parameters (minimal set for compatibility)
-        bpy.ops.export_scene.gltf(
-            filepath=filepath,
-            use_selection=True,
-            export_format='GLB',
-            export_materials='EXPORT',
-            export_image_format='AUTO'
-        )
+        with build_trace.span('export_glb', 'export', file=filename) as span:
+            # Blender 4.4+ glTF export parameters (minimal set for compatibility)
+            bpy.ops.export_scene.gltf(
+                filepath=filepath,
+                use_selection=True,
+                export_format='GLB',
+                export_materials='EXPORT',
+                export_image_format='AUTO'
+            )
+            span.set(bytes=os.path.getsize(filepath))
         print(f"  ✓ Exported: {filename}")
+        psx_textures.record_export(filepath, texture_bytes)
+        if glb_compression.enabled():
+            with build_trace.span('compress_glb', 'export', file=filename):
+                glb_compression.compress_export(filepath, [obj])
+        if ktx2_textures.enabled():
+            with build_trace.span('ktx2_textures', 'export', file=filename):
+                ktx2_textures.transcode_export(filepath)
+        if texture_library.enabled():
+            texture_library.externalize_export(filepath)
         return True
     except Exception as e:
         print(f"  ✗ Failed to export {filename}: {e}")
         return False
 
+def import_trees(input_path, texture_size=PSX_TEXTURE_SIZE, palette_colors=PSX_PALETTE_COLORS):
+    """Clear the scene, import the FBX and apply PSX texture settings; returns the tree meshes"""
+    # Clear scene
+    build_trace.stage('clear_scene')
+    clear_scene()
+
+    # Import FBX
+    build_trace.stage('import_fbx')
+    with build_trace.span('import_fbx', 'import', file=input_path):
+        imported = import_fbx(input_path)
+    if not imported:
+        return []
+
+    # Optimize textures
+    build_trace.stage('psx_textures')
+    optimize_textures_for_psx(texture_size, palette_colors)
+
+    # Get tree objects
+    trees = get_tree_objects()
+
+    if not trees:
+        print("ERROR: No tree meshes found in FBX!")
+    return trees
+
+def tree_filename(tree):
+    """GLB file name for a tree object"""
+    return f"{tree.name.lower().replace(' ', '-')}.glb"
+
+def update_trees_json(output_path, fields_by_file, top_level=None, what='metadata'):
+    """Merge per-tree fields (keyed by GLB file name) and top-level keys into trees.json"""
+    config_path = os.path.join(output_path, TREES_JSON)
+    if not os.path.exists(config_path):
+        print(f"  ⚠ {config_path} not found, {what} not recorded")
+        return
+
+    with open(config_path) as f:
+        config = json.load(f)
+    config.update(top_level or {})
+    for entry in config.get('trees', {}).values():
+        entry.update(fields_by_file.get(entry.get('file'), {}))
+
+    text = INLINE_NUMBER_LIST.sub(lambda m: '[' + ', '.join(re.split(r',\s*', m.group(1))) + ']',
+                                  json.dumps(config, indent=2))
+    with open(config_path, 'w') as f:
+        f.write(text + '\n')
+    print(f"  ✓ {what.capitalize()} written to {config_path}")
+
+def write_atlas_layout(output_path, layout):
+    """Record the atlas layout in trees.json and each tree's atlas materials under its entry"""
+    materials_by_file = {tree_filename(bpy.data.objects[name]): {'atlas_materials': materials}
+                         for name, materials in layout['objects'].items() if name in bpy.data.objects}
+    update_trees_json(output_path, materials_by_file,
+                      {'atlas': {key: value for key, value in layout.items() if key != 'objects'}},
+                      what='atlas layout')
+
+def export_lods(tree, output_path, lod_ratios):
+    """Generate and export LOD1.. for a tree; returns one {level, file, triangles, ratio} per level"""
+    levels = [{'level': 0, 'file': tree_filename(tree), 'triangles': mesh_lod.triangle_count(tree.data), 'ratio': 1.0}]
+    for level, ratio in enumerate(lod_ratios, start=1):
+        filename = tree_filename(tree).replace('.glb', f'-lod{level}.glb')
+        with build_trace.span('generate_lod', 'lod', file=filename):
+            lod = mesh_lod.generate_lod(tree, ratio, f"{tree.name}_LOD{level}")
+        triangles = mesh_lod.triangle_count(lod.data)
+        print(f"  ✓ LOD{level}: {triangles} triangles ({triangles / max(levels[0]['triangles'], 1):.0%})")
+        if export_glb(lod, output_path, filename):
+            levels.append({'level': level, 'file': filename, 'triangles': triangles, 'ratio': ratio})
+        mesh = lod.data
+        bpy.data.objects.remove(lod, do_unlink=True)
+        bpy.data.meshes.remove(mesh)
+    return levels
+
+def export_all_lods(trees, output_path, lod_ratios):
+    """Export LODs for every tree and record them in trees.json; returns the number of files written"""
+    build_trace.stage('lods')
+    print(f"\nGenerating LODs (ratios {', '.join(f'{ratio:g}' for ratio in lod_ratios)})...")
+    lods_by_file = {}
+    for tree in trees:
+        print(f"\n  {tree.name}")
+        lods_by_file[tree_filename(tree)] = export_lods(tree, output_path, lod_ratios)
+    write_lod_info(output_path, lods_by_file)
+    return sum(len(levels) - 1 for levels in lods_by_file.values())
+
+def write_lod_info(output_path, lods_by_file):
+    """Record each tree's LOD files and triangle counts in trees.json, using its lod_distances"""
+    config_path = os.path.join(output_path, TREES_JSON)
+    distances = {}
+    if os.path.exists(config_path):
+        with open(config_path) as f:
+            distances = {entry.get('file'): entry.get('lod_distances', [])
+                         for entry in json.load(f).get('trees', {}).values()}
+    fields = {}
+    for filename, levels in lods_by_file.items():
+        for level in levels:
+            tree_distances = distances.get(filename, [])
+            if level['level'] < len(tree_distances):
+                level['distance'] = tree_distances[level['level']]
+        fields[filename] = {'lods': levels}
+    update_trees_json(output_path, fields, what='LOD levels')
+
+def atlas_trees(trees, output_path):
+    """Move every tree onto the shared bark/foliage atlas materials and record the layout"""
+    build_trace.stage('atlas')
+    print(f"\nBuilding texture atlases...")
+    layout = texture_atlas.atlas_objects(trees, prefix='TreeAtlas')
+    write_atlas_layout(output_path, layout)
+
+def stump_filename(tree, stage, stages):
+    """tree-x-stump.glb for a single cut, tree-x-stump1.glb, -stump2.glb... for chopping stages"""
+    return tree_filename(tree).replace('.glb', f"-stump{stage if stages > 1 else ''}.glb")
+
+def export_stumps(tree, output_path, stump_heights):
+    """Cut and export one stump per height ratio; returns one {stage, file, height_ratio, cut_height} per file"""
+    stumps = []
+    heights = mesh_stump.cut_heights(tree, stump_heights)
+    for stage, (ratio, cut_height) in enumerate(zip(stump_heights, heights), start=1):
+        filename = stump_filename(tree, stage, len(stump_heights))
+        try:
+            with build_trace.span('create_stump', 'stump', file=filename):
+                stump = mesh_stump.create_stump(tree, cut_height, f"{tree.name}_stump{stage}")
+        except Exception as e:
+            print(f"  ✗ Failed to create stump: {e}")
+            continue
+        if export_glb(stump, output_path, filename):
+            stumps.append({'stage': stage, 'file': filename, 'height_ratio': ratio, 'cut_height': round(cut_height, 4)})
+        mesh = stump.data
+        bpy.data.objects.remove(stump, do_unlink=True)
+        bpy.data.meshes.remove(mesh)
+    return stumps
+
+def export_tree(tree, output_path, stump_heights=()):
+    """Export a tree (and its stump variants); returns the number of files written"""
+    exported = 0
+
+    # Export full tree
+    filename = tree_filename(tree)
+    if export_glb(tree, output_path, filename):
+        exported += 1
+
+    # Create and export stump variants, one per cut height
+    if stump_heights:
+        stumps = export_stumps(tree, output_path, stump_heights)
+        if stumps:
+            update_trees_json(output_path, {filename: {'stumps': stumps}}, what='stump variants')
+        exported += len(stumps)
+
+    return exported
+
+def write_colliders(trees, output_path, shape):
+    """Fit a trunk collider to every tree; record it in trees.json and the collider pack"""
+    build_trace.stage('colliders')
+    print(f"\nFitting {shape} colliders...")
+    colliders = {}
+    for tree in trees:
+        with build_trace.span('fit_collider', 'collider', file=tree_filename(tree)):
+            colliders[tree_filename(tree)] = collider_fit.fit_object(tree, shape, mesh_lod.foliage_slots(tree))
+    update_trees_json(output_path, {filename: {'physics_collider': collider_fit.json_collider(collider)}
+                                    for filename, collider in colliders.items() if collider['type'] != 'none'},
+                      what='fitted colliders')
+    collider_fit.update_pack(os.path.join(output_path, collider_fit.PACK_FILE), colliders)
+
+def image_key(path):
+    """Comparable absolute path for an image file"""
+    return os.path.normcase(os.path.abspath(bpy.path.abspath(path)))
+
+def texture_users(trees):
+    """Map each image file used by the trees' materials to the trees using it"""
+    users = {}
+    for tree in trees:
+        for mat in tree.data.materials:
+            if not (mat and mat.use_nodes):
+                continue
+            for node in mat.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image and node.image.filepath:
+                    users.setdefault(image_key(node.image.filepath), set()).add(tree)
+    return users
+
+def watch_trees(input_path, output_path, stump_heights, trees, texture_size, palette_colors, atlas, collider,
+                lod_ratios=None):
+    """Re-export only what a change affects, until interrupted.
+
+    An edited texture is reloaded in place and only the trees whose materials
+    use it are re-exported; an edited FBX is re-imported and exported in full.
+    With atlases every change rebuilds everything, since all trees share them.
+    LODs (and their trees.json triangle counts) follow the rebuilt trees.
+    """
+    fbx_key = os.path.normcase(os.path.abspath(input_path))
+    roots = sorted({os.path.dirname(os.path.abspath(input_path)), os.path.abspath(TEXTURE_SOURCE)})
+    print(f"\nWatching {', '.join(roots)} (Ctrl+C to stop)...")
+
+    try:
+        for changed in asset_watch.watch(roots, ('.fbx',) + TEXTURE_SUFFIXES):
+            changed_keys = {os.path.normcase(os.path.abspath(path)) for path in changed}
+
+            if fbx_key in changed_keys or atlas:
+                print(f"\nChanged: {', '.join(os.path.basename(path) for path in changed)} -> all trees")
+                trees = import_trees(input_path, texture_size, palette_colors)
+                if atlas and trees:
+                    atlas_trees(trees, output_path)
+                build_trace.stage('export')
+                for tree in trees:
+                    export_tree(tree, output_path, stump_heights)
+                if collider and trees:
+                    write_colliders(trees, output_path, collider)
+                if lod_ratios and trees:
+                    export_all_lods(trees, output_path, lod_ratios)
+                build_trace.write()
+                continue
+
+            users = texture_users(trees)
+            affected = set()
+            for key in changed_keys:
+                if key not in users:
+                    print(f"\nChanged: {os.path.basename(key)} (not used by any tree, skipped)")
+                    continue
+                for img in bpy.data.images:
+                    if img.filepath and image_key(img.filepath) == key:
+                        img.reload()
+                        psx_textures.reduce_image(img, texture_size, palette_colors)
+                affected |= users[key]
+                print(f"\nChanged: {os.path.basename(key)} -> "
+                      f"{', '.join(sorted(tree.name for tree in users[key]))}")
+
+            build_trace.stage('export')
+            for tree in sorted(affected, key=lambda obj: obj.name):
+                export_tree(tree, output_path, stump_heights)
+            if lod_ratios and affected:
+                export_all_lods(sorted(affected, key=lambda obj: obj.name), output_path, lod_ratios)
+            build_trace.write()
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
 def main():
     """Main conversion process"""
     print("\n" + "="*60)
@@ -198,56 +481,59 @@ def main():
 
     # Parse arguments
     args = parse_args()
+    if args['trace']:
+        build_trace.enable(args['trace'])
+    glb_compression.configure(args['compress'], 'trees')
+    ktx2_textures.configure(args['ktx2'])
+    texture_library.configure(args['texture_library'])
     input_path = args['input']
     output_path = args['output']
-    create_stumps = args['create_stumps']
+    stump_heights = args['stumps']
 
     print(f"Configuration:")
     print(f"  Input FBX: {input_path}")
     print(f"  Output Directory: {output_path}")
-    print(f"  PSX Texture Size: {PSX_TEXTURE_SIZE}x{PSX_TEXTURE_SIZE}\n")
-
-    # Clear scene
-    clear_scene()
-
-    # Import FBX
-    if not import_fbx(input_path):
-        return
-
-    # Optimize textures
-    optimize_textures_for_psx()
-
-    # Get tree objects
-    trees = get_tree_objects()
-
+    print(f"  PSX Texture Size: {args['texture_size']}x{args['texture_size']} (max, power of two)")
+    print(f"  PSX Palette: {args['palette'] or 'full colour'}")
+    print(f"  Geometry Compression: {args['compress']}")
+    print(f"  KTX2 Textures: {'yes' if args['ktx2'] else 'no'}")
+    print(f"  Shared Texture Library: {args['texture_library'] or 'no (embedded)'}")
+    print(f"  Trunk Colliders: {args['collider'] or 'no (keep trees.json)'}\n")
+
+    trees = import_trees(input_path, args['texture_size'], args['palette'])
     if not trees:
-        print("ERROR: No tree meshes found in FBX!")
+        build_trace.write()
         return
 
+    if args['atlas']:
+        atlas_trees(trees, output_path)
+
     # Process each tree
+    build_trace.stage('export')
     print(f"\nProcessing {len(trees)} tree(s)...")
     exported_count = 0
 
     for i, tree in enumerate(trees):
         print(f"\n[{i+1}/{len(trees)}] Processing: {tree.name}")
+        exported_count += export_tree(tree, output_path, stump_heights)
 
-        # Export full tree
-        filename = f"{tree.name.lower().replace(' ', '-')}.glb"
-        if export_glb(tree, output_path, filename):
-            exported_count += 1
+    if args['collider']:
+        write_colliders(trees, output_path, args['collider'])
 
-        # Create and export stump variant
-        if create_stumps:
-            try:
-                stump = create_stump_variant(tree)
-                stump_filename = f"{tree.name.lower().replace(' ', '-')}-stump.glb"
-                if export_glb(stump, output_path, stump_filename):
-                    exported_count += 1
+    if args['lods']:
+        exported_count += export_all_lods(trees, output_path, args['lods'])
+
+    build_trace.write()
+
+    if args['watch']:
+        watch_trees(input_path, output_path, stump_heights, trees, args['texture_size'], args['palette'],
+                    args['atlas'], args['collider'], args['lods'])
+        return
 
-                # Clean up stump object
-                bpy.data.objects.remove(stump, do_unlink=True)
-            except Exception as e:
-                print(f"  ✗ Failed to create stump: {e}")
+    psx_textures.print_report()
+    glb_compression.print_report()
+    ktx2_textures.print_report()
+    texture_library.print_report()
 
     # Summary
     print("\n" + "="*60)
@@ -259,8 +545,7 @@ def main():
     print("Next steps:")
     print("  1. Check the exported GLB files in:", output_path)
     print("  2. Test load them in your game")
-    print("  3. Add physics colliders in SceneManager.ts")
-    print("  4. Create TreePlacementSystem for procedural placement\n")
+    print("  3. Create TreePlacementSystem for procedural placement\n")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,222 @@
+/**
+ * Decoded vertex bounds of GLB files, for scripts/glb_compression.py and
+ * scripts/compress-models.py.
+ *
+ * Meshopt buffer views are decoded with three's bundled MeshoptDecoder (the
+ * one the game loads them with), quantized/normalized positions are read back
+ * as floats, and every mesh is placed by its node-to-scene matrix, or for
+ * skinned meshes by its joints in their rest pose.
+ *
+ * Usage: node scripts/glb-bounds.mjs a.glb [b.glb ...]
+ * Prints one JSON array with [[minX, minY, minZ], [maxX, maxY, maxZ]] (or null) per file.
+ * Exits 1 if any file cannot be decoded.
+ */
+
+import { readFileSync } from 'node:fs';
+
+const GLB_MAGIC = 0x46546c67; // 'glTF'
+const CHUNK_JSON = 0x4e4f534a;
+const CHUNK_BIN = 0x004e4942;
+const MESHOPT = 'EXT_meshopt_compression';
+const SUPPORTED = new Set([MESHOPT, 'KHR_mesh_quantization']);
+
+const COMPONENTS = { SCALAR: 1, VEC2: 2, VEC3: 3, VEC4: 4, MAT4: 16 };
+const TYPED_ARRAYS = {
+  5120: Int8Array, 5121: Uint8Array, 5122: Int16Array, 5123: Uint16Array, 5125: Uint32Array, 5126: Float32Array
+};
+const NORMALIZED_MAX = { 5120: 127, 5121: 255, 5122: 32767, 5123: 65535 };
+
+let meshoptDecoder = null;
+
+function readGlb(path) {
+  const file = readFileSync(path);
+  const view = new DataView(file.buffer, file.byteOffset, file.byteLength);
+  if (view.getUint32(0, true) !== GLB_MAGIC) throw new Error(`${path} is not a GLB file`);
+
+  let json = null;
+  let bin = null;
+  for (let offset = 12; offset < view.byteLength;) {
+    const length = view.getUint32(offset, true);
+    const type = view.getUint32(offset + 4, true);
+    const data = new Uint8Array(file.buffer, file.byteOffset + offset + 8, length);
+    if (type === CHUNK_JSON) json = JSON.parse(new TextDecoder().decode(data));
+    else if (type === CHUNK_BIN) bin = data;
+    offset += 8 + length;
+  }
+  if (!json) throw new Error(`${path} has no JSON chunk`);
+  return { json, bin };
+}
+
+async function bufferViews(json, bin) {
+  const unsupported = (json.extensionsRequired ?? []).filter((name) => !SUPPORTED.has(name));
+  if (unsupported.length) throw new Error(`unsupported required extension(s): ${unsupported.join(', ')}`);
+
+  const bufferData = (index) => {
+    if (json.buffers[index].uri !== undefined) throw new Error('external buffers are not supported');
+    return bin;
+  };
+
+  const views = [];
+  for (const bufferView of json.bufferViews ?? []) {
+    const compressed = bufferView.extensions?.[MESHOPT];
+    if (!compressed) {
+      const data = bufferData(bufferView.buffer);
+      views.push(data.subarray(bufferView.byteOffset ?? 0, (bufferView.byteOffset ?? 0) + bufferView.byteLength));
+      continue;
+    }
+
+    if (!meshoptDecoder) {
+      ({ MeshoptDecoder: meshoptDecoder } = await import('three/examples/jsm/libs/meshopt_decoder.module.js'));
+      await meshoptDecoder.ready;
+    }
+    const source = bufferData(compressed.buffer);
+    const start = compressed.byteOffset ?? 0;
+    const target = new Uint8Array(compressed.count * compressed.byteStride);
+    meshoptDecoder.decodeGltfBuffer(target, compressed.count, compressed.byteStride,
+      source.subarray(start, start + compressed.byteLength), compressed.mode, compressed.filter ?? 'NONE');
+    views.push(target);
+  }
+  return views;
+}
+
+function readAccessor(json, views, index) {
+  const accessor = json.accessors[index];
+  if (accessor.sparse) throw new Error('sparse accessors are not supported');
+  const components = COMPONENTS[accessor.type];
+  const values = new Float64Array(accessor.count * components);
+  if (accessor.bufferView === undefined) return values;
+
+  const TypedArray = TYPED_ARRAYS[accessor.componentType];
+  const data = views[accessor.bufferView];
+  const stride = json.bufferViews[accessor.bufferView].byteStride ?? components * TypedArray.BYTES_PER_ELEMENT;
+  const scale = accessor.normalized ? 1 / NORMALIZED_MAX[accessor.componentType] : 1;
+  const view = new DataView(data.buffer, data.byteOffset, data.byteLength);
+  const read = {
+    5120: (o) => view.getInt8(o), 5121: (o) => view.getUint8(o),
+    5122: (o) => view.getInt16(o, true), 5123: (o) => view.getUint16(o, true),
+    5125: (o) => view.getUint32(o, true), 5126: (o) => view.getFloat32(o, true)
+  }[accessor.componentType];
+
+  for (let i = 0; i < accessor.count; i++) {
+    const base = (accessor.byteOffset ?? 0) + i * stride;
+    for (let c = 0; c < components; c++) {
+      const value = read(base + c * TypedArray.BYTES_PER_ELEMENT) * scale;
+      values[i * components + c] = accessor.normalized ? Math.max(value, -1) : value;
+    }
+  }
+  return values;
+}
+
+// Column-major 4x4 matrices, as glTF stores them
+function multiply(a, b) {
+  const out = new Float64Array(16);
+  for (let c = 0; c < 4; c++) {
+    for (let r = 0; r < 4; r++) {
+      let sum = 0;
+      for (let k = 0; k < 4; k++) sum += a[k * 4 + r] * b[c * 4 + k];
+      out[c * 4 + r] = sum;
+    }
+  }
+  return out;
+}
+
+function localMatrix(node) {
+  if (node.matrix) return Float64Array.from(node.matrix);
+  const [tx, ty, tz] = node.translation ?? [0, 0, 0];
+  const [x, y, z, w] = node.rotation ?? [0, 0, 0, 1];
+  const [sx, sy, sz] = node.scale ?? [1, 1, 1];
+  return Float64Array.from([
+    (1 - 2 * (y * y + z * z)) * sx, 2 * (x * y + z * w) * sx, 2 * (x * z - y * w) * sx, 0,
+    2 * (x * y - z * w) * sy, (1 - 2 * (x * x + z * z)) * sy, 2 * (y * z + x * w) * sy, 0,
+    2 * (x * z + y * w) * sz, 2 * (y * z - x * w) * sz, (1 - 2 * (x * x + y * y)) * sz, 0,
+    tx, ty, tz, 1
+  ]);
+}
+
+function worldMatrices(json) {
+  const nodes = json.nodes ?? [];
+  const world = new Array(nodes.length).fill(null);
+  const visit = (index, parent) => {
+    world[index] = parent ? multiply(parent, localMatrix(nodes[index])) : localMatrix(nodes[index]);
+    for (const child of nodes[index].children ?? []) visit(child, world[index]);
+  };
+  const scene = json.scenes?.[json.scene ?? 0];
+  const roots = scene ? scene.nodes ?? [] : nodes.map((_, index) => index);
+  roots.forEach((root) => visit(root, null));
+  return world;
+}
+
+async function decodedBounds(path) {
+  const { json, bin } = readGlb(path);
+  const views = await bufferViews(json, bin);
+  const world = worldMatrices(json);
+  const min = [Infinity, Infinity, Infinity];
+  const max = [-Infinity, -Infinity, -Infinity];
+
+  const extend = (x, y, z) => {
+    [x, y, z].forEach((value, axis) => {
+      min[axis] = Math.min(min[axis], value);
+      max[axis] = Math.max(max[axis], value);
+    });
+  };
+  const transform = (m, x, y, z) => [
+    m[0] * x + m[4] * y + m[8] * z + m[12],
+    m[1] * x + m[5] * y + m[9] * z + m[13],
+    m[2] * x + m[6] * y + m[10] * z + m[14]
+  ];
+
+  (json.nodes ?? []).forEach((node, index) => {
+    if (node.mesh === undefined || !world[index]) return;
+
+    // Skinned vertices are placed by their joints (rest pose), not by the node
+    let joints = null;
+    if (node.skin !== undefined) {
+      const skin = json.skins[node.skin];
+      const inverseBind = skin.inverseBindMatrices !== undefined
+        ? readAccessor(json, views, skin.inverseBindMatrices) : null;
+      joints = skin.joints.map((joint, j) => {
+        const ibm = inverseBind ? inverseBind.subarray(j * 16, j * 16 + 16) : localMatrix({});
+        return multiply(world[joint], ibm);
+      });
+    }
+
+    for (const primitive of json.meshes[node.mesh].primitives) {
+      const positions = readAccessor(json, views, primitive.attributes.POSITION);
+      const jointIndices = joints && primitive.attributes.JOINTS_0 !== undefined
+        ? readAccessor(json, views, primitive.attributes.JOINTS_0) : null;
+      const weights = jointIndices ? readAccessor(json, views, primitive.attributes.WEIGHTS_0) : null;
+
+      for (let i = 0; i < positions.length; i += 3) {
+        const [x, y, z] = [positions[i], positions[i + 1], positions[i + 2]];
+        if (!jointIndices) {
+          extend(...transform(world[index], x, y, z));
+          continue;
+        }
+        const skinned = [0, 0, 0];
+        const v = i / 3;
+        for (let k = 0; k < 4; k++) {
+          const weight = weights[v * 4 + k];
+          if (!weight) continue;
+          const point = transform(joints[jointIndices[v * 4 + k]], x, y, z);
+          for (let axis = 0; axis < 3; axis++) skinned[axis] += point[axis] * weight;
+        }
+        extend(...skinned);
+      }
+    }
+  });
+
+  return min[0] === Infinity ? null : [min, max];
+}
+
+const results = [];
+let failed = false;
+for (const path of process.argv.slice(2)) {
+  try {
+    results.push(await decodedBounds(path));
+  } catch (error) {
+    console.error(`${path}: ${error.message}`);
+    failed = true;
+  }
+}
+if (failed) process.exit(1);
+console.log(JSON.stringify(results));
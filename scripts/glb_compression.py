@@ -0,0 +1,231 @@
+"""
+Geometry compression for exported GLBs, shared by the Blender conversion
+scripts (convert-trees.py, convert-bushes.py, convert-batch.py) and
+compress-models.py
+
+Two modes, with quantization bits per asset class (QUANTIZATION_PROFILES):
+- 'draco':   KHR_draco_mesh_compression via Blender's glTF exporter
+- 'meshopt': EXT_meshopt_compression + KHR_mesh_quantization via gltfpack
+             (meshoptimizer, found on PATH or $GLTFPACK); verified by decoding
+             with glb-bounds.mjs, which needs Node and three from node_modules
+
+Like build_trace, compression is off until configure() is called; export_glb()
+in the converters then hands each written GLB to compress_export(), which
+compresses it, verifies the decoded bounds against the source and
+records the size delta. Importing this module does not require Blender.
+"""
+
+import os
+import json
+import shutil
+import struct
+import subprocess
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+COMPRESSION_MODES = ('none', 'draco', 'meshopt')
+
+# Quantization bits per attribute; positions are relative to each mesh's bounds
+QUANTIZATION_PROFILES = {
+    'trees': {'position': 14, 'normal': 10, 'texcoord': 12},
+    'bushes': {'position': 12, 'normal': 8, 'texcoord': 12},  # Small alpha cards
+    'props': {'position': 14, 'normal': 10, 'texcoord': 12},
+    'creatures': {'position': 16, 'normal': 12, 'texcoord': 14}  # Skinned, seen up close
+}
+DRACO_LEVEL = 6  # Encoder effort 0-10; decode speed is unaffected
+GLTFPACK = os.environ.get('GLTFPACK', 'gltfpack')
+NODE = os.environ.get('NODE', 'node')
+BOUNDS_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'glb-bounds.mjs')
+
+GLB_MAGIC = 0x46546C67  # 'glTF'
+GLB_JSON_CHUNK = 0x4E4F534A  # 'JSON'
+
+_mode = 'none'
+_profile: Optional[str] = None
+
+# (glb, mode, asset class, bytes before, bytes after, bounds error, allowed error) per compressed export
+REPORT: List[Tuple[str, str, str, int, int, Optional[float], float]] = []
+
+
+def configure(mode: str, profile: str):
+    """Compress subsequent exports with `mode` using QUANTIZATION_PROFILES[profile]"""
+    global _mode, _profile
+    if mode not in COMPRESSION_MODES:
+        raise ValueError(f"Unknown compression mode {mode!r} (expected one of {', '.join(COMPRESSION_MODES)})")
+    if profile not in QUANTIZATION_PROFILES:
+        raise ValueError(f"Unknown asset class {profile!r} (expected one of {', '.join(QUANTIZATION_PROFILES)})")
+    _mode, _profile = mode, profile
+
+
+def enabled() -> bool:
+    return _mode != 'none'
+
+
+def draco_options(profile: str) -> Dict:
+    """Extra bpy.ops.export_scene.gltf arguments for Draco with the profile's quantization"""
+    bits = QUANTIZATION_PROFILES[profile]
+    return {
+        'export_draco_mesh_compression_enable': True,
+        'export_draco_mesh_compression_level': DRACO_LEVEL,
+        'export_draco_position_quantization': bits['position'],
+        'export_draco_normal_quantization': bits['normal'],
+        'export_draco_texcoord_quantization': bits['texcoord']
+    }
+
+
+def gltfpack_command(src: str, dst: str, profile: str) -> List[str]:
+    """gltfpack invocation for meshopt compression with the profile's quantization.
+
+    Node and material names are kept (-kn, -km) so colliders and shared atlas
+    materials can still be found by name at runtime. Positions stay floats
+    (-vpf, rounded to the profile's bits) so no dequantization transform is
+    put on the nodes and loaders can bake node matrices into the vertices.
+    """
+    bits = QUANTIZATION_PROFILES[profile]
+    return [GLTFPACK, '-i', src, '-o', dst, '-cc', '-kn', '-km', '-vpf',
+            '-vp', str(bits['position']), '-vn', str(bits['normal']), '-vt', str(bits['texcoord'])]
+
+
+def run_gltfpack(src: str, dst: str, profile: str):
+    """Compress src into dst with gltfpack; raises RuntimeError when it is missing or fails"""
+    if not shutil.which(GLTFPACK):
+        raise RuntimeError("gltfpack not found (install meshoptimizer's gltfpack or set $GLTFPACK)")
+    result = subprocess.run(gltfpack_command(src, dst, profile), capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"gltfpack failed: {result.stderr.strip() or result.stdout.strip()}")
+
+
+def read_glb_json(filepath: str) -> Dict:
+    """The JSON chunk of a GLB file"""
+    with open(filepath, 'rb') as f:
+        magic, _, _ = struct.unpack('<III', f.read(12))
+        if magic != GLB_MAGIC:
+            raise ValueError(f"{filepath} is not a GLB file")
+        length, chunk_type = struct.unpack('<II', f.read(8))
+        if chunk_type != GLB_JSON_CHUNK:
+            raise ValueError(f"{filepath} does not start with a JSON chunk")
+        return json.loads(f.read(length))
+
+
+def allowed_error(bounds: Tuple[List[float], List[float]], profile: str) -> float:
+    """Largest bounds error expected from position quantization (one step of the largest extent)"""
+    extent = max(high - low for low, high in zip(*bounds))
+    return extent / (2 ** QUANTIZATION_PROFILES[profile]['position'] - 1) * 2 + 1e-5
+
+
+def bounds_error(a: Tuple[List[float], List[float]], b: Tuple[List[float], List[float]]) -> float:
+    """Largest per-axis difference between two (min, max) bounds"""
+    return max(abs(x - y) for pair_a, pair_b in zip(a, b) for x, y in zip(pair_a, pair_b))
+
+
+def decoded_bounds(paths: List[str]) -> List[Optional[Tuple[List[float], List[float]]]]:
+    """Scene-space vertex bounds of GLBs decoded by glb-bounds.mjs (three's MeshoptDecoder, under Node).
+
+    Raises RuntimeError when Node is missing or any file cannot be decoded.
+    """
+    if not shutil.which(NODE):
+        raise RuntimeError("node not found (needed to decode meshopt GLBs for verification, or set $NODE)")
+    result = subprocess.run([NODE, BOUNDS_SCRIPT, *paths], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"decode failed: {result.stderr.strip() or result.stdout.strip()}")
+    return [tuple(bounds) if bounds else None for bounds in json.loads(result.stdout)]
+
+
+def imported_bounds(filepath: str):
+    """Import a GLB into the current Blender scene, measure its mesh bounds, then remove it"""
+    import bpy
+    from blender_scene import purge_orphans
+
+    existing = set(bpy.data.objects)
+    bpy.ops.import_scene.gltf(filepath=filepath)
+    imported = [obj for obj in bpy.data.objects if obj not in existing]
+    bounds = mesh_bounds([obj for obj in imported if obj.type == 'MESH'])
+    for obj in imported:
+        bpy.data.objects.remove(obj, do_unlink=True)
+    purge_orphans()
+    return bounds
+
+
+def mesh_bounds(objects) -> Optional[Tuple[List[float], List[float]]]:
+    """World-space (min, max) of Blender mesh objects' vertices"""
+    import numpy as np
+
+    points = []
+    for obj in objects:
+        co = np.empty(len(obj.data.vertices) * 3, dtype=np.float64)
+        obj.data.vertices.foreach_get('co', co)
+        matrix = np.array(obj.matrix_world, dtype=np.float64)
+        points.append(co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3])
+    if not points or not sum(len(p) for p in points):
+        return None
+    points = np.concatenate(points)
+    return points.min(axis=0).tolist(), points.max(axis=0).tolist()
+
+
+def compress_export(filepath: str, objects) -> bool:
+    """Compress a GLB the converter just exported (selection still active), verify and record it.
+
+    Draco output is re-imported with Blender's glTF importer and compared with
+    the source objects; meshopt output, which that importer cannot read, is
+    decoded by glb-bounds.mjs and compared with the uncompressed export.
+    Returns False if compression, decoding or verification failed; the
+    uncompressed file is then left in place.
+    """
+    import bpy
+
+    raw_bytes = os.path.getsize(filepath)
+    fd, tmp_path = tempfile.mkstemp(suffix='.glb')
+    os.close(fd)
+    try:
+        if _mode == 'draco':
+            bpy.ops.export_scene.gltf(filepath=tmp_path, use_selection=True, export_format='GLB',
+                                      export_materials='EXPORT', export_image_format='AUTO',
+                                      **draco_options(_profile))
+        else:
+            run_gltfpack(filepath, tmp_path, _profile)
+
+        try:
+            if _mode == 'draco':
+                source, decoded = mesh_bounds(objects), imported_bounds(tmp_path)
+            else:
+                source, decoded = decoded_bounds([filepath, tmp_path])
+            if not source or not decoded:
+                raise RuntimeError("no mesh vertices decoded")
+        except Exception as e:
+            print(f"    ✗ Could not verify {os.path.basename(filepath)}: {e}; keeping uncompressed file")
+            REPORT.append((os.path.basename(filepath), _mode, _profile, raw_bytes, raw_bytes, None, 0.0))
+            return False
+
+        error = bounds_error(source, decoded)
+        allowed = allowed_error(source, _profile)
+        if error > allowed:
+            print(f"    ✗ {_mode} bounds error {error:.5f} exceeds {allowed:.5f}, keeping uncompressed file")
+            REPORT.append((os.path.basename(filepath), _mode, _profile, raw_bytes, raw_bytes, error, allowed))
+            return False
+
+        shutil.move(tmp_path, filepath)
+        compressed_bytes = os.path.getsize(filepath)
+        REPORT.append((os.path.basename(filepath), _mode, _profile, raw_bytes, compressed_bytes, error, allowed))
+        print(f"    Compressed ({_mode}): {raw_bytes / 1024:.1f} KB -> {compressed_bytes / 1024:.1f} KB, "
+              f"bounds error {error:.5f}")
+        return True
+    except Exception as e:
+        print(f"    ✗ {_mode} compression failed: {e}")
+        return False
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def print_report():
+    """Per-GLB size delta and bounds error for this run's compressed exports"""
+    if not REPORT:
+        return
+    print("\nGeometry compression:")
+    for name, mode, profile, before, after, error, allowed in REPORT:
+        verified = f"err {error:.5f} (max {allowed:.5f})" if error is not None else "not decoded, kept uncompressed"
+        print(f"  {name:32s} {mode:7s} {profile:9s} {before / 1024:9.1f} KB -> {after / 1024:9.1f} KB  {verified}")
+    before = sum(entry[3] for entry in REPORT)
+    after = sum(entry[4] for entry in REPORT)
+    saved = (1 - after / before) * 100 if before else 0
+    print(f"  {'TOTAL':50s} {before / 1024:9.1f} KB -> {after / 1024:9.1f} KB ({saved:.0f}% smaller)")
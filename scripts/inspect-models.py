@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+GLB Inspector and Asset Budget Gate for The Nightman Cometh
+Reads every GLB under public/assets/models with the standard library only (no
+Blender, no Node). The JSON and BIN chunks are parsed through memoryview
+slices of the file, so buffers are never copied. For each model it reports:
+
+- triangles, vertices and draw calls (primitives per mesh instance);
+- vertex attribute layouts;
+- material, texture and image counts, and embedded/external image bytes;
+- animation tracks and keyframes;
+- scene bounds.
+
+Counts come from accessor metadata, so meshopt/Draco-compressed GLBs need no
+decoding.
+
+Usage:
+    python scripts/inspect-models.py                          # report + budget gate
+    python scripts/inspect-models.py --classes trees,props --verbose
+    python scripts/inspect-models.py --write-metadata         # refresh trees.json / TREE_METADATA.md
+    python scripts/inspect-models.py --budgets budgets.json --max-draw-calls 4 --report .cache/models.json
+
+Budgets are per asset class (BUDGETS); --budgets merges a JSON file of the
+same shape ({"trees": {"triangles": 6000}}), and --max-* applies a limit to
+every class. Exits 1 when any model is over budget or cannot be read.
+"""
+
+import re
+import json
+import struct
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+MODELS_DIR = Path('public/assets/models')
+ASSET_CLASSES = {
+    'trees': ['trees/*.glb'],
+    'bushes': ['bushes/*.glb'],
+    'props': ['props/*.glb'],
+    'creatures': ['creatures/*.glb']
+}
+TREES_JSON = Path('trees/trees.json')
+TREE_METADATA = Path('trees/TREE_METADATA.md')
+
+# Per-class limits; a model over any of them fails the gate
+BUDGETS = {
+    'trees': {'triangles': 8000, 'bytes': 400 * 1024, 'draw_calls': 4},
+    'bushes': {'triangles': 2000, 'bytes': 256 * 1024, 'draw_calls': 2},
+    'props': {'triangles': 4000, 'bytes': 1024 * 1024, 'draw_calls': 8},
+    'creatures': {'triangles': 20000, 'bytes': 8 * 1024 * 1024, 'draw_calls': 64}
+}
+BUDGET_METRICS = ('triangles', 'bytes', 'draw_calls')
+
+GLB_MAGIC = b'glTF'
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+COMPONENT_NAMES = {5120: 'i8', 5121: 'u8', 5122: 'i16', 5123: 'u16', 5125: 'u32', 5126: 'f32'}
+NORMALIZED_MAX = {5120: 127, 5121: 255, 5122: 32767, 5123: 65535}
+IDENTITY = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+INLINE_NUMBER_LIST = re.compile(r'\[\s*(-?[\d.eE+-]+(?:,\s*-?[\d.eE+-]+)*)\s*\]')  # e.g. lod_distances stay on one line
+METADATA_BEGIN = '<!-- inspect-models:begin (generated by scripts/inspect-models.py --write-metadata) -->'
+METADATA_END = '<!-- inspect-models:end -->'
+
+
+def read_glb(path: Path) -> Tuple[Dict, memoryview]:
+    """(glTF JSON, BIN chunk) of a GLB; the BIN chunk is a view into the file bytes"""
+    data = memoryview(path.read_bytes())
+    if bytes(data[:4]) != GLB_MAGIC:
+        raise ValueError(f"{path} is not a GLB")
+    _, length = struct.unpack_from('<II', data, 4)
+
+    gltf, binary, offset = None, data[0:0], 12
+    while offset + 8 <= min(length, len(data)):
+        chunk_length, chunk_type = struct.unpack_from('<II', data, offset)
+        chunk = data[offset + 8:offset + 8 + chunk_length]
+        if chunk_type == CHUNK_JSON:
+            gltf = json.loads(str(chunk, 'utf-8'))
+        elif chunk_type == CHUNK_BIN:
+            binary = chunk
+        offset += 8 + chunk_length
+    if gltf is None:
+        raise ValueError(f"{path} has no JSON chunk")
+    return gltf, binary
+
+
+def accessor_view(gltf: Dict, binary: memoryview, index: int) -> Optional[memoryview]:
+    """The bytes of an accessor's bufferView in the BIN chunk (None for external or sparse-only data)"""
+    accessor = gltf['accessors'][index]
+    if 'bufferView' not in accessor:
+        return None
+    view = gltf['bufferViews'][accessor['bufferView']]
+    if gltf['buffers'][view['buffer']].get('uri') is not None:
+        return None
+    start = view.get('byteOffset', 0) + accessor.get('byteOffset', 0)
+    return binary[start:view.get('byteOffset', 0) + view['byteLength']]
+
+
+def position_bounds(gltf: Dict, binary: memoryview, index: int) -> Optional[Tuple[List[float], List[float]]]:
+    """Min/max of a POSITION accessor: its declared min/max, else read from float data"""
+    accessor = gltf['accessors'][index]
+    if 'min' in accessor and 'max' in accessor:
+        low, high = list(accessor['min'][:3]), list(accessor['max'][:3])
+        if accessor.get('normalized') and accessor['componentType'] in NORMALIZED_MAX:
+            scale = NORMALIZED_MAX[accessor['componentType']]
+            low, high = [max(v / scale, -1.0) for v in low], [max(v / scale, -1.0) for v in high]
+        return low, high
+
+    view = accessor_view(gltf, binary, index)
+    if view is None or accessor['componentType'] != 5126 or accessor['count'] == 0:
+        return None
+    stride = gltf['bufferViews'][accessor['bufferView']].get('byteStride', 12) // 4
+    floats = view[:len(view) // 4 * 4].cast('f')
+    axes = [floats[axis:(accessor['count'] - 1) * stride + axis + 1:stride] for axis in range(3)]
+    return [min(values) for values in axes], [max(values) for values in axes]
+
+
+def multiply(a: List[float], b: List[float]) -> List[float]:
+    """Column-major 4x4 product a @ b"""
+    return [sum(a[k * 4 + row] * b[col * 4 + k] for k in range(4)) for col in range(4) for row in range(4)]
+
+
+def node_matrix(node: Dict) -> List[float]:
+    """Column-major local matrix of a node (matrix, or translation/rotation/scale)"""
+    if 'matrix' in node:
+        return list(node['matrix'])
+    tx, ty, tz = node.get('translation', (0.0, 0.0, 0.0))
+    x, y, z, w = node.get('rotation', (0.0, 0.0, 0.0, 1.0))
+    sx, sy, sz = node.get('scale', (1.0, 1.0, 1.0))
+    return [
+        (1 - 2 * (y * y + z * z)) * sx, (2 * (x * y + z * w)) * sx, (2 * (x * z - y * w)) * sx, 0.0,
+        (2 * (x * y - z * w)) * sy, (1 - 2 * (x * x + z * z)) * sy, (2 * (y * z + x * w)) * sy, 0.0,
+        (2 * (x * z + y * w)) * sz, (2 * (y * z - x * w)) * sz, (1 - 2 * (x * x + y * y)) * sz, 0.0,
+        tx, ty, tz, 1.0
+    ]
+
+
+def transform_box(matrix: List[float], low: List[float], high: List[float]) -> Tuple[List[float], List[float]]:
+    """Axis-aligned bounds of a box's eight corners after a transform"""
+    corners = [[(low, high)[(i >> axis) & 1][axis] for axis in range(3)] for i in range(8)]
+    points = [[matrix[row] * x + matrix[4 + row] * y + matrix[8 + row] * z + matrix[12 + row] for row in range(3)]
+              for x, y, z in corners]
+    return [min(p[axis] for p in points) for axis in range(3)], [max(p[axis] for p in points) for axis in range(3)]
+
+
+def primitive_triangles(gltf: Dict, primitive: Dict) -> int:
+    """Triangles drawn by a primitive (0 for points/lines)"""
+    accessors = gltf['accessors']
+    count = accessors[primitive['indices']]['count'] if 'indices' in primitive else \
+        accessors[primitive['attributes']['POSITION']]['count']
+    mode = primitive.get('mode', 4)
+    if mode == 4:
+        return count // 3
+    if mode in (5, 6):
+        return max(count - 2, 0)
+    return 0
+
+
+def attribute_layout(gltf: Dict, primitive: Dict) -> str:
+    """e.g. "POSITION:VEC3/f32 NORMAL:VEC3/f32 TEXCOORD_0:VEC2/f32 +u16 indices" """
+    parts = []
+    for name, index in sorted(primitive['attributes'].items(), key=lambda item: (item[0] != 'POSITION', item[0])):
+        accessor = gltf['accessors'][index]
+        normalized = 'n' if accessor.get('normalized') else ''
+        parts.append(f"{name}:{accessor['type']}/{normalized}{COMPONENT_NAMES.get(accessor['componentType'], '?')}")
+    if 'indices' in primitive:
+        parts.append(f"+{COMPONENT_NAMES.get(gltf['accessors'][primitive['indices']]['componentType'], '?')} indices")
+    return ' '.join(parts)
+
+
+def image_bytes(gltf: Dict, path: Path) -> Tuple[int, int]:
+    """(embedded, external) image bytes; external images are sized on disk next to the GLB"""
+    embedded = external = 0
+    for image in gltf.get('images', []):
+        if 'bufferView' in image:
+            embedded += gltf['bufferViews'][image['bufferView']]['byteLength']
+        elif image.get('uri', '').startswith('data:'):
+            embedded += len(image['uri']) * 3 // 4
+        elif image.get('uri'):
+            file = path.parent / image['uri']
+            external += file.stat().st_size if file.exists() else 0
+    return embedded, external
+
+
+def inspect_glb(path: Path) -> Dict:
+    """Everything the report and the budget gate need for one GLB"""
+    gltf, binary = read_glb(path)
+    meshes = gltf.get('meshes', [])
+    nodes = gltf.get('nodes', [])
+    stats = {'bytes': path.stat().st_size, 'bin_bytes': len(binary), 'nodes': len(nodes), 'meshes': len(meshes),
+             'draw_calls': 0, 'triangles': 0, 'vertices': 0, 'layouts': {},
+             'materials': len(gltf.get('materials', [])),
+             'material_names': [mat.get('name', f"material{i}") for i, mat in enumerate(gltf.get('materials', []))],
+             'textures': len(gltf.get('textures', [])), 'images': len(gltf.get('images', [])),
+             'skins': len(gltf.get('skins', [])), 'animations': len(gltf.get('animations', [])),
+             'tracks': 0, 'keyframes': 0, 'bounds': None, 'extensions': sorted(gltf.get('extensionsUsed', []))}
+    stats['image_bytes'], stats['external_image_bytes'] = image_bytes(gltf, path)
+
+    for animation in gltf.get('animations', []):
+        stats['tracks'] += len(animation.get('channels', []))
+        samplers = animation.get('samplers', [])
+        stats['keyframes'] += sum(gltf['accessors'][samplers[channel['sampler']]['input']]['count']
+                                  for channel in animation.get('channels', []))
+
+    low, high = [float('inf')] * 3, [float('-inf')] * 3
+    scene = gltf.get('scenes', [{}])[gltf.get('scene', 0)] if gltf.get('scenes') else {'nodes': range(len(nodes))}
+    stack = [(index, IDENTITY) for index in scene.get('nodes', [])]
+    while stack:
+        index, parent = stack.pop()
+        node = nodes[index]
+        matrix = multiply(parent, node_matrix(node))
+        stack.extend((child, matrix) for child in node.get('children', []))
+        if 'mesh' not in node:
+            continue
+        for primitive in meshes[node['mesh']].get('primitives', []):
+            stats['draw_calls'] += 1
+            stats['triangles'] += primitive_triangles(gltf, primitive)
+            layout = attribute_layout(gltf, primitive)
+            stats['layouts'][layout] = stats['layouts'].get(layout, 0) + 1
+            position = primitive['attributes'].get('POSITION')
+            if position is None:
+                continue
+            stats['vertices'] += gltf['accessors'][position]['count']
+            bounds = position_bounds(gltf, binary, position)
+            if bounds:
+                box_low, box_high = transform_box(matrix, *bounds)
+                low = [min(a, b) for a, b in zip(low, box_low)]
+                high = [max(a, b) for a, b in zip(high, box_high)]
+
+    if low[0] <= high[0]:
+        stats['bounds'] = {'min': [round(v, 4) for v in low], 'max': [round(v, 4) for v in high],
+                           'size': [round(b - a, 4) for a, b in zip(low, high)]}
+    return stats
+
+
+def find_models(models_dir: Path, classes: List[str]) -> List[Dict]:
+    """GLBs per asset class ({'class', 'path'})"""
+    models = []
+    for asset_class in classes:
+        for pattern in ASSET_CLASSES[asset_class]:
+            models.extend({'class': asset_class, 'path': path} for path in sorted(models_dir.glob(pattern)))
+    return models
+
+
+def load_budgets(path: Optional[Path], overrides: Dict[str, Optional[int]]) -> Dict[str, Dict[str, int]]:
+    """BUDGETS merged with a JSON budgets file and --max-* limits for every class"""
+    budgets = {asset_class: dict(limits) for asset_class, limits in BUDGETS.items()}
+    if path:
+        for asset_class, limits in json.loads(path.read_text()).items():
+            budgets.setdefault(asset_class, {}).update(limits)
+    for metric, limit in overrides.items():
+        if limit is not None:
+            for limits in budgets.values():
+                limits[metric] = limit
+    return budgets
+
+
+def over_budget(stats: Dict, limits: Dict[str, int]) -> List[str]:
+    """Human-readable list of exceeded limits"""
+    return [f"{metric} {stats[metric]} > {limits[metric]}" for metric in BUDGET_METRICS
+            if metric in limits and stats[metric] > limits[metric]]
+
+
+def format_bytes(size: int) -> str:
+    return f"{size / 1024:.1f} KB"
+
+
+def tree_stats(stats: Dict) -> Dict:
+    """Compact per-tree stats for trees.json"""
+    return {key: stats[key] for key in ('triangles', 'vertices', 'draw_calls', 'materials', 'textures',
+                                        'image_bytes', 'bounds')}
+
+
+def write_trees_json(models_dir: Path, results: List[Dict]) -> bool:
+    """Replace the hand-typed size_kb of every tree in trees.json and record measured stats"""
+    path = models_dir / TREES_JSON
+    if not path.exists():
+        print(f"[SKIP] {path} not found")
+        return False
+    stats_by_file = {result['path'].name: result['stats'] for result in results
+                     if result['class'] == 'trees' and result['stats']}
+    config = json.loads(path.read_text())
+    for entry in config.get('trees', {}).values():
+        stats = stats_by_file.get(entry.get('file'))
+        if stats:
+            entry['size_kb'] = round(stats['bytes'] / 1024)
+            entry['stats'] = tree_stats(stats)
+    text = INLINE_NUMBER_LIST.sub(lambda m: '[' + ', '.join(re.split(r',\s*', m.group(1))) + ']',
+                                  json.dumps(config, indent=2))
+    path.write_text(text + '\n')
+    print(f"[OK] Updated {path}")
+    return True
+
+
+def metadata_section(models_dir: Path, results: List[Dict]) -> str:
+    """Generated "Active Trees" section of TREE_METADATA.md, from trees.json and measured stats"""
+    config = json.loads((models_dir / TREES_JSON).read_text())
+    stats_by_file = {result['path'].name: result['stats'] for result in results
+                     if result['class'] == 'trees' and result['stats']}
+    trees = [(name, entry, stats_by_file.get(entry.get('file'))) for name, entry in config.get('trees', {}).items()]
+
+    lines = [f"## Active Trees ({len(trees)} variants)", "", METADATA_BEGIN, "",
+             "| Tree | File | Size | Triangles | Vertices | Draw calls | Materials | Images | Height |",
+             "|---|---|---|---|---|---|---|---|---|"]
+    for name, entry, stats in trees:
+        if stats is None:
+            lines.append(f"| {name} | `{entry.get('file')}` | missing | - | - | - | - | - | - |")
+            continue
+        height = f"{stats['bounds']['size'][1]:.1f} m" if stats['bounds'] else '-'
+        lines.append(f"| {name} | `{entry['file']}` | {format_bytes(stats['bytes'])} | {stats['triangles']} | "
+                     f"{stats['vertices']} | {stats['draw_calls']} | {', '.join(stats['material_names'])} | "
+                     f"{stats['images']} ({format_bytes(stats['image_bytes'])}) | {height} |")
+    lines.append("")
+    for name, entry, _ in trees:
+        lines.append(f"- **{name}** ({entry.get('species', 'unknown species')}, "
+                     f"density {entry.get('recommended_density', '-')}): {entry.get('description', '')}")
+    lines += ["", METADATA_END, "", ""]
+    return '\n'.join(lines)
+
+
+def write_tree_metadata(models_dir: Path, results: List[Dict]) -> bool:
+    """Regenerate the Active Trees section of TREE_METADATA.md (other sections are kept)"""
+    path = models_dir / TREE_METADATA
+    if not path.exists() or not (models_dir / TREES_JSON).exists():
+        print(f"[SKIP] {path} or {models_dir / TREES_JSON} not found")
+        return False
+    text = path.read_text()
+    section = metadata_section(models_dir, results)
+    pattern = re.compile(r'^## Active Trees.*?(?=^## )', re.MULTILINE | re.DOTALL)
+    text = pattern.sub(lambda _: section, text, count=1) if pattern.search(text) else text + '\n' + section
+    path.write_text(text)
+    print(f"[OK] Updated {path}")
+    return True
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Inspect GLB models and enforce asset budgets')
+    parser.add_argument('--models', type=Path, default=MODELS_DIR, help='Models directory')
+    parser.add_argument('--classes', default=','.join(ASSET_CLASSES),
+                        help=f"Comma-separated asset classes ({', '.join(ASSET_CLASSES)})")
+    parser.add_argument('--budgets', type=Path, help='JSON file of per-class budgets to merge over the defaults')
+    parser.add_argument('--max-triangles', type=int, help='Triangle limit for every class')
+    parser.add_argument('--max-bytes', type=int, help='File size limit in bytes for every class')
+    parser.add_argument('--max-draw-calls', type=int, help='Draw call limit for every class')
+    parser.add_argument('--write-metadata', action='store_true',
+                        help=f"Regenerate {TREES_JSON} sizes/stats and {TREE_METADATA}")
+    parser.add_argument('--verbose', action='store_true', help='Also list attribute layouts, bounds and animations')
+    parser.add_argument('--report', type=Path, help='Also write the results as JSON')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("="*100)
+    print("GLB INSPECTOR - The Nightman Cometh")
+    print("="*100)
+
+    classes = [name for name in args.classes.split(',') if name]
+    unknown = [name for name in classes if name not in ASSET_CLASSES]
+    if unknown:
+        print(f"[FAIL] Unknown asset class(es): {', '.join(unknown)}")
+        raise SystemExit(1)
+    budgets = load_budgets(args.budgets, {'triangles': args.max_triangles, 'bytes': args.max_bytes,
+                                          'draw_calls': args.max_draw_calls})
+
+    models = find_models(args.models, classes)
+    if not models:
+        print(f"[FAIL] No GLB files for {', '.join(classes)} in {args.models}")
+        raise SystemExit(1)
+
+    print(f"\n{'':6s} {'file':36s} {'class':9s} {'size':>10s} {'tris':>7s} {'verts':>7s} {'draws':>5s} "
+          f"{'mats':>4s} {'tex':>4s} {'images':>10s} {'anims':>5s}")
+    print("-"*100)
+    results = []
+    for model in models:
+        path, asset_class = model['path'], model['class']
+        result = {'file': str(path.relative_to(args.models)), 'path': path, 'class': asset_class,
+                  'stats': None, 'status': 'FAIL', 'problems': []}
+        try:
+            stats = inspect_glb(path)
+        except (OSError, ValueError, KeyError, IndexError, struct.error) as e:
+            result['problems'] = [f"unreadable: {e}"]
+            print(f"[FAIL] {result['file']:36s} {asset_class:9s} {e}")
+            results.append(result)
+            continue
+
+        result['stats'] = stats
+        result['problems'] = over_budget(stats, budgets.get(asset_class, {}))
+        result['status'] = 'FAIL' if result['problems'] else 'OK'
+        results.append(result)
+
+        print(f"[{result['status']}]".ljust(6) + f" {result['file']:36s} {asset_class:9s} "
+              f"{format_bytes(stats['bytes']):>10s} {stats['triangles']:7d} {stats['vertices']:7d} "
+              f"{stats['draw_calls']:5d} {stats['materials']:4d} {stats['textures']:4d} "
+              f"{format_bytes(stats['image_bytes'] + stats['external_image_bytes']):>10s} {stats['animations']:5d}")
+        for problem in result['problems']:
+            print(f"{'':7s}over budget: {problem}")
+        if args.verbose:
+            for layout, count in stats['layouts'].items():
+                print(f"{'':7s}{count}x {layout}")
+            if stats['bounds']:
+                print(f"{'':7s}bounds {stats['bounds']['min']} .. {stats['bounds']['max']} "
+                      f"(size {stats['bounds']['size']})")
+            if stats['animations']:
+                print(f"{'':7s}{stats['animations']} animation(s), {stats['tracks']} track(s), "
+                      f"{stats['keyframes']} keyframe(s)")
+            if stats['extensions']:
+                print(f"{'':7s}extensions: {', '.join(stats['extensions'])}")
+
+    inspected = [result['stats'] for result in results if result['stats']]
+    print("-"*100)
+    print(f"{len(inspected)} GLB(s): {format_bytes(sum(s['bytes'] for s in inspected))}, "
+          f"{sum(s['triangles'] for s in inspected)} triangles, {sum(s['draw_calls'] for s in inspected)} draw calls, "
+          f"{format_bytes(sum(s['image_bytes'] for s in inspected))} embedded images")
+
+    if args.write_metadata:
+        print()
+        write_trees_json(args.models, results)
+        write_tree_metadata(args.models, results)
+
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        rows = [{key: value for key, value in result.items() if key != 'path'} for result in results]
+        args.report.write_text(json.dumps({'budgets': budgets, 'models': rows}, indent=2))
+
+    failed = [result for result in results if result['status'] == 'FAIL']
+    if failed:
+        print(f"[FAIL] {len(failed)} GLB(s) over budget or unreadable")
+        raise SystemExit(1)
+    print("[OK] All models within budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,345 @@
+"""
+KTX2 / Basis Universal texture transcoding for exported GLBs, shared by the
+Blender conversion scripts (convert-trees.py, convert-bushes.py,
+convert-batch.py) and compress-models.py
+
+Embedded PNG/JPEG images are encoded with a locally installed toktx
+(KTX-Software, on PATH or $TOKTX) and the GLB is rewritten to reference them
+through KHR_texture_basisu:
+- ETC1S for opaque albedo (smallest, transcodes to BC1/ETC1 on the GPU)
+- UASTC for alpha-masked foliage and normal maps (keeps clean alpha edges)
+
+Like glb_compression, transcoding is off until configure() is called and runs
+after geometry compression, as the last step of export_glb(). The report
+compares each GLB's images before and after: bytes, estimated GPU memory and
+decode time. Importing this module does not require Blender.
+"""
+
+import os
+import json
+import shutil
+import struct
+import subprocess
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+TOKTX = os.environ.get('TOKTX', 'toktx')
+KTX = os.environ.get('KTX', 'ktx')  # KTX-Software's 'ktx' tool, used to time GPU transcoding when present
+EXTENSION = 'KHR_texture_basisu'
+
+ENCODER_OPTIONS = {
+    'etc1s': ['--encode', 'etc1s', '--clevel', '2', '--qlevel', '128'],
+    'uastc': ['--encode', 'uastc', '--uastc_quality', '2', '--zcmp', '18']
+}
+TRANSCODE_TARGETS = {'etc1s': 'bc1', 'uastc': 'bc7'}  # What a desktop GPU gets at runtime
+
+# GPU bytes per texel: browsers upload PNG/JPEG as RGBA8; Basis transcodes to
+# 4 bpp block formats (BC1/ETC1) when opaque, 8 bpp (BC3/BC7/ETC2/ASTC 4x4) with alpha.
+# No mip chain: the loaders sample model textures with NearestFilter, so none is generated or encoded.
+RGBA8_BYTES_PER_TEXEL = 4.0
+BLOCK_BYTES_PER_TEXEL = {False: 0.5, True: 1.0}
+
+GLB_MAGIC = 0x46546C67  # 'glTF'
+GLB_JSON_CHUNK = 0x4E4F534A  # 'JSON'
+GLB_BIN_CHUNK = 0x004E4942  # 'BIN\0'
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+_enabled = False
+
+# One dict per transcoded image: glb, image, mode, size, bytes/VRAM/decode ms before and after
+REPORT: List[Dict] = []
+
+
+def configure(enabled: bool):
+    """Transcode the images of subsequent exports to KTX2"""
+    global _enabled
+    _enabled = enabled
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def read_glb(filepath: str) -> Tuple[Dict, bytes]:
+    """(JSON, binary chunk) of a GLB file"""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    magic, _, length = struct.unpack_from('<III', data, 0)
+    if magic != GLB_MAGIC:
+        raise ValueError(f"{filepath} is not a GLB file")
+    gltf, binary = None, b''
+    offset = 12
+    while offset < length:
+        chunk_length, chunk_type = struct.unpack_from('<II', data, offset)
+        chunk = data[offset + 8:offset + 8 + chunk_length]
+        if chunk_type == GLB_JSON_CHUNK:
+            gltf = json.loads(chunk)
+        elif chunk_type == GLB_BIN_CHUNK:
+            binary = chunk
+        offset += 8 + chunk_length
+    if gltf is None:
+        raise ValueError(f"{filepath} has no JSON chunk")
+    return gltf, binary
+
+
+def write_glb(filepath: str, gltf: Dict, binary: bytes):
+    """Write a GLB with 4-byte aligned chunks (JSON padded with spaces, BIN with zeros)"""
+    json_chunk = json.dumps(gltf, separators=(',', ':')).encode('utf-8')
+    json_chunk += b' ' * (-len(json_chunk) % 4)
+    chunks = struct.pack('<II', len(json_chunk), GLB_JSON_CHUNK) + json_chunk
+    if binary:
+        binary += b'\0' * (-len(binary) % 4)
+        chunks += struct.pack('<II', len(binary), GLB_BIN_CHUNK) + binary
+    with open(filepath, 'wb') as f:
+        f.write(struct.pack('<III', GLB_MAGIC, 2, 12 + len(chunks)) + chunks)
+
+
+def image_info(data: bytes) -> Optional[Tuple[int, int, bool]]:
+    """(width, height, has alpha channel) from a PNG or JPEG header"""
+    if data.startswith(PNG_SIGNATURE):
+        width, height, _, color_type = struct.unpack_from('>IIBB', data, 16)
+        return width, height, color_type in (4, 6) or b'tRNS' in data[:data.find(b'IDAT')]
+    if data.startswith(b'\xff\xd8'):
+        offset = 2
+        while offset + 9 < len(data):
+            marker, length = struct.unpack_from('>HH', data, offset)
+            if 0xFFC0 <= marker <= 0xFFCF and marker not in (0xFFC4, 0xFFC8, 0xFFCC):
+                height, width = struct.unpack_from('>HH', data, offset + 5)
+                return width, height, False
+            offset += 2 + length
+    return None
+
+
+def gpu_bytes(width: int, height: int, bytes_per_texel: float) -> int:
+    return int(width * height * bytes_per_texel)
+
+
+def image_modes(gltf: Dict) -> Dict[int, str]:
+    """Basis mode per image index: UASTC for alpha-blended/masked base colour and normal maps"""
+    textures = gltf.get('textures', [])
+    modes = {}
+
+    def mark(texture_info, mode):
+        if texture_info and 'source' in textures[texture_info['index']]:
+            source = textures[texture_info['index']]['source']
+            if modes.get(source) != 'uastc':
+                modes[source] = mode
+
+    for material in gltf.get('materials', []):
+        alpha = material.get('alphaMode', 'OPAQUE') != 'OPAQUE'
+        mark(material.get('pbrMetallicRoughness', {}).get('baseColorTexture'), 'uastc' if alpha else 'etc1s')
+        mark(material.get('normalTexture'), 'uastc')
+        mark(material.get('emissiveTexture'), 'etc1s')
+    return modes
+
+
+def toktx_command(src: str, dst: str, mode: str, linear: bool) -> List[str]:
+    return [TOKTX, '--t2', '--assign_oetf', 'linear' if linear else 'srgb',
+            *ENCODER_OPTIONS[mode], dst, src]
+
+
+def encode(data: bytes, suffix: str, mode: str, linear: bool) -> bytes:
+    """KTX2 bytes for one PNG/JPEG image; raises RuntimeError when toktx is missing or fails"""
+    if not shutil.which(TOKTX):
+        raise RuntimeError("toktx not found (install KTX-Software or set $TOKTX)")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, f"image{suffix}")
+        dst = os.path.join(tmp, "image.ktx2")
+        with open(src, 'wb') as f:
+            f.write(data)
+        result = subprocess.run(toktx_command(src, dst, mode, linear), capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"toktx failed: {result.stderr.strip() or result.stdout.strip()}")
+        with open(dst, 'rb') as f:
+            return f.read()
+
+
+def decode_ms(data: bytes, suffix: str) -> Optional[float]:
+    """Time a full CPU decode of a PNG/JPEG, as the browser does before upload (needs Blender)"""
+    try:
+        import bpy
+    except ImportError:
+        return None
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    try:
+        start = time.perf_counter()
+        img = bpy.data.images.load(path)
+        img.pixels[0]  # Pixels are decoded on first access
+        elapsed = (time.perf_counter() - start) * 1000
+        bpy.data.images.remove(img)
+        return elapsed
+    finally:
+        os.remove(path)
+
+
+def _run_ms(command: List[str]) -> Optional[float]:
+    start = time.perf_counter()
+    if subprocess.run(command, capture_output=True).returncode != 0:
+        return None
+    return (time.perf_counter() - start) * 1000
+
+
+def transcode_ms(ktx2: bytes, mode: str) -> Optional[float]:
+    """Time transcoding KTX2 to its GPU block format with `ktx transcode`, minus process startup"""
+    if not shutil.which(KTX):
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "image.ktx2")
+        with open(src, 'wb') as f:
+            f.write(ktx2)
+        startup = _run_ms([KTX, '--version'])
+        elapsed = _run_ms([KTX, 'transcode', '--target', TRANSCODE_TARGETS[mode], src,
+                           os.path.join(tmp, "out.ktx2")])
+    if startup is None or elapsed is None:
+        return None
+    return max(elapsed - startup, 0.0)
+
+
+def _buffer_regions(gltf: Dict) -> List[Dict]:
+    """Every object that addresses the GLB binary buffer with byteOffset/byteLength"""
+    regions = []
+    for view in gltf.get('bufferViews', []):
+        if view.get('buffer', 0) == 0:
+            regions.append(view)
+        meshopt = view.get('extensions', {}).get('EXT_meshopt_compression')
+        if meshopt and meshopt.get('buffer', 0) == 0:
+            regions.append(meshopt)
+    return regions
+
+
+def repack_buffer(gltf: Dict, binary: bytes, replacements: Dict[int, bytes]) -> bytes:
+    """Rebuild the binary chunk with some bufferViews' data replaced, dropping unreferenced bytes.
+
+    `replacements` maps bufferView index -> new bytes. Regions stay in their
+    original order and 4-byte aligned; objects sharing a region keep sharing it.
+    """
+    views = gltf.get('bufferViews', [])
+    replaced = {id(views[index]): data for index, data in replacements.items()}
+    regions = sorted(_buffer_regions(gltf), key=lambda region: region.get('byteOffset', 0))
+
+    out = bytearray()
+    placed = {}  # (old offset, old length) -> new offset
+    last_end = 0
+    for region in regions:
+        start = region.get('byteOffset', 0)
+        key = (start, region['byteLength'])
+        if id(region) not in replaced and key in placed:
+            region['byteOffset'] = placed[key]
+            continue
+        if start < last_end:
+            raise ValueError("overlapping buffer views, can't repack")
+        last_end = start + region['byteLength']
+        data = replaced.get(id(region), binary[start:last_end])
+        out += b'\0' * (-len(out) % 4)
+        placed[key] = len(out)
+        region['byteOffset'] = len(out)
+        region['byteLength'] = len(data)
+        out += data
+
+    if gltf.get('buffers'):
+        gltf['buffers'][0]['byteLength'] = len(out)
+    return bytes(out)
+
+
+def transcode_glb(filepath: str, output: Optional[str] = None) -> List[Dict]:
+    """Re-encode a GLB's embedded PNG/JPEG images as KTX2 (KHR_texture_basisu).
+
+    Writes to `output` (default: in place) and returns one report entry per
+    image. Images that are already KTX2, external or unreadable are left alone.
+    """
+    gltf, binary = read_glb(filepath)
+    images = gltf.get('images', [])
+    views = gltf.get('bufferViews', [])
+    modes = image_modes(gltf)
+    linear = {gltf['textures'][material['normalTexture']['index']].get('source')
+              for material in gltf.get('materials', []) if 'normalTexture' in material}
+
+    replacements, entries = {}, []
+    for index, image in enumerate(images):
+        if 'bufferView' not in image or image.get('mimeType') not in ('image/png', 'image/jpeg'):
+            continue
+        view = views[image['bufferView']]
+        data = binary[view.get('byteOffset', 0):view.get('byteOffset', 0) + view['byteLength']]
+        info = image_info(data)
+        if info is None:
+            continue
+        width, height, alpha = info
+        mode = modes.get(index, 'uastc' if alpha else 'etc1s')
+        suffix = '.png' if image['mimeType'] == 'image/png' else '.jpg'
+
+        ktx2 = encode(data, suffix, mode, index in linear)
+        replacements[image['bufferView']] = ktx2
+        image['mimeType'] = 'image/ktx2'
+        entries.append({
+            'glb': os.path.basename(output or filepath),
+            'image': image.get('name', f"image{index}"),
+            'mode': mode,
+            'size': [width, height],
+            'bytes_before': len(data),
+            'bytes_after': len(ktx2),
+            'gpu_bytes_before': gpu_bytes(width, height, RGBA8_BYTES_PER_TEXEL),
+            'gpu_bytes_after': gpu_bytes(width, height, BLOCK_BYTES_PER_TEXEL[alpha or mode == 'uastc']),
+            'decode_ms_before': decode_ms(data, suffix),
+            'decode_ms_after': transcode_ms(ktx2, mode)
+        })
+
+    if not replacements:
+        return []
+
+    transcoded = {index for index, image in enumerate(images) if image.get('mimeType') == 'image/ktx2'}
+    for texture in gltf.get('textures', []):
+        if texture.get('source') in transcoded:
+            texture.setdefault('extensions', {})[EXTENSION] = {'source': texture.pop('source')}
+    for key in ('extensionsUsed', 'extensionsRequired'):
+        if EXTENSION not in gltf.setdefault(key, []):
+            gltf[key].append(EXTENSION)
+
+    binary = repack_buffer(gltf, binary, replacements)
+    write_glb(output or filepath, gltf, binary)
+    REPORT.extend(entries)
+    return entries
+
+
+def transcode_export(filepath: str) -> bool:
+    """transcode_glb() for a converter's export_glb(); logs instead of raising"""
+    try:
+        entries = transcode_glb(filepath)
+    except (RuntimeError, ValueError, OSError) as e:
+        print(f"    ✗ KTX2 transcoding failed: {e}")
+        return False
+    if entries:
+        before = sum(entry['gpu_bytes_before'] for entry in entries)
+        after = sum(entry['gpu_bytes_after'] for entry in entries)
+        print(f"    KTX2: {len(entries)} image(s), GPU memory {before / 1024:.1f} KB -> {after / 1024:.1f} KB (est.)")
+    return True
+
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value:.1f}" if value is not None else '-'
+
+
+def print_report(entries: Optional[List[Dict]] = None):
+    """Per-image bytes, estimated GPU memory and decode/transcode time, before -> after"""
+    entries = REPORT if entries is None else entries
+    if not entries:
+        return
+    print("\nKTX2 textures (file KB, GPU KB est., decode ms: before -> after):")
+    for entry in entries:
+        label = f"{entry['glb']}:{entry['image']}"
+        print(f"  {label[:40]:40s} {entry['mode']:5s} {entry['size'][0]:4d}x{entry['size'][1]:<4d} "
+              f"file {entry['bytes_before'] / 1024:7.1f} -> {entry['bytes_after'] / 1024:7.1f}  "
+              f"gpu {entry['gpu_bytes_before'] / 1024:7.1f} -> {entry['gpu_bytes_after'] / 1024:7.1f}  "
+              f"decode {_ms(entry['decode_ms_before'])} -> {_ms(entry['decode_ms_after'])}")
+
+    def total(key):
+        values = [entry[key] for entry in entries if entry[key] is not None]
+        return sum(values) if values else None
+
+    print(f"  {'TOTAL':40s} file {total('bytes_before') / 1024:.1f} -> {total('bytes_after') / 1024:.1f} KB, "
+          f"gpu {total('gpu_bytes_before') / 1024:.1f} -> {total('gpu_bytes_after') / 1024:.1f} KB, "
+          f"decode {_ms(total('decode_ms_before'))} -> {_ms(total('decode_ms_after'))} ms")
+    print("  GPU memory assumes RGBA8 uploads for PNG/JPEG and BC1/BC7-class formats for KTX2 (no mipmaps);")
+    print("  decode is a Blender PNG/JPEG decode vs `ktx transcode` to the GPU format ('-' when unavailable)")
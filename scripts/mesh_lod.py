@@ -0,0 +1,171 @@
+"""
+LOD mesh generation for the Blender conversion scripts (convert-trees.py)
+
+Each LOD is a copy of the tree with:
+- alpha-card foliage thinned rather than collapsed: whole cards (connected face
+  islands) are dropped smallest first and the survivors are scaled up so the
+  canopy keeps its coverage;
+- the remaining (bark) geometry reduced with Blender's collapse decimator, which
+  keeps UV seams and open boundaries intact. Vertices on the tree's outer
+  silhouette, and all foliage vertices, get low vertex-group weights so their
+  edges are collapsed last.
+"""
+
+import math
+import bpy
+import bmesh
+import numpy as np  # Bundled with Blender
+from mathutils import Vector
+
+import texture_atlas
+
+SILHOUETTE_SLICES = 16  # Height bands used to find the outer silhouette
+SILHOUETTE_PERCENTILE = 80  # Vertices beyond this radial percentile in their band are silhouette
+PROTECT_FACTOR = 100.0  # Decimate vertex group factor; higher keeps protected edges longer
+CARD_MAX_SCALE = 1.6  # Upper bound for scaling surviving foliage cards
+LOD_GROUP = "lod_protect"
+
+
+def triangle_count(mesh):
+    mesh.calc_loop_triangles()
+    return len(mesh.loop_triangles)
+
+
+def foliage_slots(obj):
+    """Material slots whose base colour image has alpha (alpha-card foliage)"""
+    slots = set()
+    for slot, mat in enumerate(obj.data.materials):
+        img = texture_atlas.material_image(mat)
+        if img is not None and texture_atlas.has_alpha(texture_atlas.image_pixels(img)):
+            slots.add(slot)
+    return slots
+
+
+def card_islands(faces):
+    """Group faces into connected islands (one alpha card each), via shared vertices"""
+    parent = {face.index: face.index for face in faces}
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    first_face = {}
+    for face in faces:
+        for vert in face.verts:
+            other = first_face.setdefault(vert.index, face.index)
+            if other != face.index:
+                parent[find(face.index)] = find(other)
+
+    islands = {}
+    for face in faces:
+        islands.setdefault(find(face.index), []).append(face)
+    return list(islands.values())
+
+
+def thin_foliage(bm, slots, ratio):
+    """Keep the largest `ratio` of foliage cards, scaling them up to cover the gaps.
+
+    Returns (cards before, cards kept).
+    """
+    bm.verts.index_update()
+    bm.faces.index_update()
+    faces = [face for face in bm.faces if face.material_index in slots]
+    if not faces:
+        return 0, 0
+    islands = sorted(card_islands(faces), key=lambda island: -sum(face.calc_area() for face in island))
+    keep = max(1, round(len(islands) * ratio))
+
+    dropped = [face for island in islands[keep:] for face in island]
+    if dropped:
+        bmesh.ops.delete(bm, geom=dropped, context='FACES')
+
+    scale = min(1.0 / math.sqrt(ratio), CARD_MAX_SCALE)
+    for island in islands[:keep]:
+        verts = {vert for face in island for vert in face.verts}
+        center = sum((vert.co for vert in verts), Vector()) / len(verts)
+        for vert in verts:
+            vert.co = center + (vert.co - center) * scale
+    return len(islands), keep
+
+
+def silhouette_weights(mesh, matrix_world, foliage_verts):
+    """Per-vertex decimation weights: 0 = protected (silhouette, foliage), 1 = free to collapse.
+
+    Bands are sliced along world Z, since FBX imports usually keep the axis
+    conversion in the object rotation rather than in the vertices.
+    """
+    count = len(mesh.vertices)
+    co = np.empty(count * 3, dtype=np.float64)
+    mesh.vertices.foreach_get('co', co)
+    matrix = np.array(matrix_world, dtype=np.float64)
+    co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+    weights = np.ones(count, dtype=np.float32)
+    if count == 0:
+        return weights
+    axis = np.median(co[:, :2], axis=0)  # Trunk axis in XY
+    radius = np.linalg.norm(co[:, :2] - axis, axis=1)
+    z = co[:, 2]
+    bands = np.minimum(((z - z.min()) / max(float(np.ptp(z)), 1e-6) * SILHOUETTE_SLICES).astype(np.int32),
+                       SILHOUETTE_SLICES - 1)
+    for band in np.unique(bands):
+        in_band = bands == band
+        cutoff = np.percentile(radius[in_band], SILHOUETTE_PERCENTILE)
+        weights[in_band & (radius >= cutoff)] = 0.5
+    weights[foliage_verts] = 0.0
+    return weights
+
+
+def generate_lod(obj, ratio, name):
+    """Create a reduced copy of obj with about `ratio` of its triangles; returns the new object"""
+    mesh = obj.data.copy()
+    lod = obj.copy()
+    lod.data = mesh
+    lod.name = name
+    for collection in obj.users_collection:
+        collection.objects.link(lod)
+
+    target = max(4, round(triangle_count(obj.data) * ratio))
+
+    # Foliage first: drop and enlarge whole cards
+    slots = foliage_slots(obj)
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    cards, kept = thin_foliage(bm, slots, ratio)
+    bm.verts.index_update()
+    foliage_verts = sorted({vert.index for face in bm.faces if face.material_index in slots for vert in face.verts})
+    bm.to_mesh(mesh)
+    bm.free()
+    if cards:
+        print(f"    foliage: kept {kept}/{cards} card(s)")
+
+    # Then collapse bark until the whole LOD reaches the triangle target
+    current = triangle_count(mesh)
+    if current > target:
+        group = lod.vertex_groups.new(name=LOD_GROUP)
+        weights = silhouette_weights(mesh, obj.matrix_world, foliage_verts)
+        for value in np.unique(weights):
+            group.add(np.flatnonzero(weights == value).tolist(), float(value), 'REPLACE')
+
+        modifier = lod.modifiers.new(name="LOD", type='DECIMATE')
+        modifier.decimate_type = 'COLLAPSE'
+        modifier.ratio = target / current
+        modifier.use_collapse_triangulate = True
+        modifier.vertex_group = LOD_GROUP
+        modifier.vertex_group_factor = PROTECT_FACTOR
+
+        # Apply through the depsgraph (no operator context needed in background mode)
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        reduced = bpy.data.meshes.new_from_object(lod.evaluated_get(depsgraph))
+        lod.modifiers.remove(modifier)
+        lod.vertex_groups.remove(group)
+        lod.data = reduced
+        reduced.name = name
+        bpy.data.meshes.remove(mesh)
+        if len(reduced.materials) != len(obj.data.materials):
+            reduced.materials.clear()
+            for mat in obj.data.materials:
+                reduced.materials.append(mat)
+    return lod
@@ -0,0 +1,153 @@
+"""
+Stump generation for the Blender conversion scripts (convert-trees.py)
+
+A stump is a copy of the tree cut horizontally at a fraction of its height:
+- vertex positions are read once with foreach_get and transformed to world
+  space with NumPy, so cut heights and the faces to drop (foliage cards, faces
+  entirely above the cut) are found without a per-vertex Python loop;
+- the remaining geometry is bisected exactly at the cut plane with bmesh (no
+  edit-mode toggles or bpy.ops), and every closed loop left on the plane is
+  capped with triangles so the cut trunk is solid. Caps reuse the bark material
+  of the faces around them with a planar UV projection.
+
+Several heights can be cut from one tree for chopping stages.
+"""
+
+import time
+import bmesh
+import numpy as np  # Bundled with Blender
+from mathutils import Vector
+
+import mesh_lod
+
+CUT_EPSILON = 1e-5  # Faces with every vertex above cut + epsilon are dropped before bisecting
+
+
+def world_coords(obj):
+    """(N, 3) world-space vertex positions, read in bulk"""
+    mesh = obj.data
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+    mesh.vertices.foreach_get('co', co)
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    return co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def cut_heights(obj, ratios):
+    """World Z of each cut, as a fraction of the tree's height from its base"""
+    z = world_coords(obj)[:, 2]
+    if len(z) == 0:
+        return []
+    return [float(z.min() + (z.max() - z.min()) * ratio) for ratio in ratios]
+
+
+def faces_to_drop(mesh, world_z, cut_height, foliage):
+    """Boolean mask of polygons to delete before bisecting: foliage cards and faces above the cut"""
+    count = len(mesh.polygons)
+    loop_vertex = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', loop_vertex)
+    loop_start = np.empty(count, dtype=np.int32)
+    mesh.polygons.foreach_get('loop_start', loop_start)
+    material_index = np.empty(count, dtype=np.int32)
+    mesh.polygons.foreach_get('material_index', material_index)
+
+    drop = np.isin(material_index, list(foliage)) if foliage else np.zeros(count, dtype=bool)
+    if count and len(loop_vertex):
+        # Lowest vertex of each polygon (loops of a polygon are contiguous from loop_start)
+        lowest = np.minimum.reduceat(world_z[loop_vertex], loop_start)
+        drop |= lowest > cut_height + CUT_EPSILON
+    return drop
+
+
+def closed_loops(edges):
+    """Group cut edges into connected components and keep those forming closed loops"""
+    remaining = set(edges)
+    loops = []
+    while remaining:
+        start = remaining.pop()
+        component, stack = {start}, [start]
+        while stack:
+            edge = stack.pop()
+            for vert in edge.verts:
+                for other in vert.link_edges:
+                    if other in remaining:
+                        remaining.discard(other)
+                        component.add(other)
+                        stack.append(other)
+        verts = {vert for edge in component for vert in edge.verts}
+        # Closed when every vertex joins exactly two edges of the component
+        if len(component) >= 3 and all(sum(1 for e in vert.link_edges if e in component) == 2 for vert in verts):
+            loops.append(component)
+    return loops
+
+
+def cap_loops(bm, loops, normal):
+    """Fill each closed cut loop with triangles facing `normal` (local space); returns the cap faces"""
+    uv_layer = bm.loops.layers.uv.active
+    caps = []
+    for edges in loops:
+        # Bark material of the faces that meet the loop
+        slots = [face.material_index for edge in edges for face in edge.link_faces]
+        material = max(set(slots), key=slots.count) if slots else 0
+
+        filled = bmesh.ops.triangle_fill(bm, use_beauty=True, use_dissolve=False, edges=list(edges), normal=normal)
+        faces = [elem for elem in filled['geom'] if isinstance(elem, bmesh.types.BMFace)]
+        for face in faces:
+            face.material_index = material
+            if face.normal.dot(normal) < 0:
+                face.normal_flip()
+        caps.extend(faces)
+
+        if uv_layer is not None and faces:
+            # Planar projection across the cut, centred on the loop
+            verts = {vert for edge in edges for vert in edge.verts}
+            center = sum((vert.co for vert in verts), Vector()) / len(verts)
+            radius = max(max((vert.co - center).length for vert in verts), 1e-6)
+            tangent = normal.orthogonal().normalized()
+            bitangent = normal.cross(tangent)
+            for face in faces:
+                for loop in face.loops:
+                    offset = loop.vert.co - center
+                    loop[uv_layer].uv = (0.5 + offset.dot(tangent) / (2 * radius),
+                                         0.5 + offset.dot(bitangent) / (2 * radius))
+    return caps
+
+
+def create_stump(obj, cut_height, name):
+    """Copy obj, cut it at world height `cut_height` and cap the trunk; returns the new object"""
+    start = time.perf_counter()
+    mesh = obj.data.copy()
+    stump = obj.copy()
+    stump.data = mesh
+    stump.name = name
+    mesh.name = name
+    for collection in obj.users_collection:
+        collection.objects.link(stump)
+
+    world_z = world_coords(obj)[:, 2]
+    drop = faces_to_drop(mesh, world_z, cut_height, mesh_lod.foliage_slots(obj))
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.faces.ensure_lookup_table()
+    if drop.any():
+        bmesh.ops.delete(bm, geom=[bm.faces[i] for i in np.flatnonzero(drop)], context='FACES')
+
+    # Cut plane in the object's local space (normals transform by the inverse transpose)
+    matrix = obj.matrix_world
+    inverse = matrix.inverted()
+    plane_co = inverse @ Vector((0.0, 0.0, cut_height))
+    plane_no = (matrix.to_3x3().transposed() @ Vector((0.0, 0.0, 1.0))).normalized()
+
+    result = bmesh.ops.bisect_plane(bm, geom=bm.verts[:] + bm.edges[:] + bm.faces[:], dist=CUT_EPSILON,
+                                    plane_co=plane_co, plane_no=plane_no, clear_outer=True)
+    cut_edges = [elem for elem in result['geom_cut'] if isinstance(elem, bmesh.types.BMEdge) and elem.is_valid]
+    loops = closed_loops(cut_edges)
+    caps = cap_loops(bm, loops, plane_no)
+
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.update()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  ✓ Created stump: {name} (cut at {cut_height:.2f}, {len(loops)} cap(s), "
+          f"{len(caps)} cap triangle(s), {mesh_lod.triangle_count(mesh)} triangles, {elapsed:.1f} ms)")
+    return stump
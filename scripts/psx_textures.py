@@ -0,0 +1,163 @@
+"""
+PSX texture reduction shared by the Blender conversion scripts
+(convert-trees.py, convert-bushes.py)
+
+Images are resampled to power-of-two sizes no larger than the PSX target and,
+optionally, reduced to an indexed-style palette (16 or 256 colours, median
+cut over the opaque pixels). Alpha is left as it is so the bushes' MASK
+textures keep their cut-outs. Resampled images are marked dirty, so the glTF
+exporter re-encodes them instead of embedding the original source file.
+"""
+
+import os
+import json
+import struct
+import bpy
+import numpy as np  # Bundled with Blender
+
+PALETTE_SIZES = (16, 256)
+ALPHA_OPAQUE = 0.5  # Pixels above this alpha drive the palette (matches the MASK cutoff)
+
+GLB_MAGIC = 0x46546C67  # 'glTF'
+GLB_JSON_CHUNK = 0x4E4F534A  # 'JSON'
+
+# (glb, texture bytes before, after) for every export_glb() call this run
+REPORT = []
+
+
+def floor_power_of_two(value):
+    """Largest power of two <= value (at least 1)"""
+    return 1 << (max(1, int(value)).bit_length() - 1)
+
+
+def target_size(width, height, max_size):
+    """Power-of-two size no larger than max_size on either axis, keeping the aspect ratio"""
+    scale = min(1.0, max_size / max(width, height, 1))
+    return floor_power_of_two(round(width * scale)), floor_power_of_two(round(height * scale))
+
+
+def median_cut_palette(rgb, colors):
+    """(colors, 3) palette from median cut over (N, 3) uint8 colours"""
+    if len(rgb) == 0:
+        return np.zeros((1, 3), dtype=np.float32)
+
+    boxes = [np.arange(len(rgb))]
+    while len(boxes) < colors:
+        # Split the box with the largest (range x population) along its widest channel
+        best, best_score, best_channel = None, 0, 0
+        for i, box in enumerate(boxes):
+            spans = rgb[box].max(axis=0).astype(np.int32) - rgb[box].min(axis=0)
+            channel = int(spans.argmax())
+            score = int(spans[channel]) * len(box)
+            if score > best_score:
+                best, best_score, best_channel = i, score, channel
+        if best is None:
+            break  # Every box holds a single colour
+        box = boxes.pop(best)
+        order = box[np.argsort(rgb[box, best_channel], kind='stable')]
+        half = len(order) // 2
+        boxes.extend([order[:half], order[half:]])
+
+    return np.array([rgb[box].mean(axis=0) for box in boxes], dtype=np.float32)
+
+
+def quantize_pixels(pixels, colors):
+    """Reduce (N, 4) float RGBA pixels to `colors` RGB values in place; alpha is untouched"""
+    rgb8 = np.clip(np.rint(pixels[:, :3] * 255), 0, 255).astype(np.uint8)
+    opaque = pixels[:, 3] > ALPHA_OPAQUE
+    source = rgb8[opaque] if opaque.any() else rgb8
+    palette = median_cut_palette(source, colors)
+
+    # Map every pixel (transparent ones too, for clean filtering edges) to its nearest entry
+    nearest = np.empty(len(rgb8), dtype=np.int32)
+    chunk = 4096  # Bounds the (chunk, palette, 3) distance array
+    for start in range(0, len(rgb8), chunk):
+        block = rgb8[start:start + chunk].astype(np.float32)
+        distances = ((block[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2)
+        nearest[start:start + chunk] = distances.argmin(axis=1)
+    pixels[:, :3] = np.rint(palette[nearest]) / 255.0
+    return len(palette)
+
+
+def reduce_image(img, max_size, palette_colors=None):
+    """Resample an image to a power-of-two PSX size and optionally palettize it.
+
+    Returns True when the image was changed.
+    """
+    width, height = img.size
+    if width == 0 or height == 0:
+        return False
+
+    changed = False
+    new_width, new_height = target_size(width, height, max_size)
+    if (new_width, new_height) != (width, height):
+        img.scale(new_width, new_height)
+        changed = True
+        print(f"  - Resampled texture: {img.name} {width}x{height} -> {new_width}x{new_height}")
+
+    if palette_colors:
+        pixels = np.empty(new_width * new_height * 4, dtype=np.float32)
+        img.pixels.foreach_get(pixels)
+        used = quantize_pixels(pixels.reshape(-1, 4), palette_colors)
+        img.pixels.foreach_set(pixels)
+        changed = True
+        print(f"  - Palettized: {img.name} ({used} colours)")
+
+    if changed:
+        img.update()
+    return changed
+
+
+def source_bytes(img):
+    """Bytes the image would embed unmodified: its source file, packed data or raw RGBA"""
+    if img.packed_file:
+        return img.packed_file.size
+    path = bpy.path.abspath(img.filepath) if img.filepath else ''
+    if path and os.path.exists(path):
+        return os.path.getsize(path)
+    return img.size[0] * img.size[1] * 4
+
+
+def object_images(obj):
+    """Images referenced by an object's material node trees"""
+    images = {}
+    for mat in obj.data.materials:
+        if mat and mat.use_nodes:
+            for node in mat.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image:
+                    images[node.image.name] = node.image
+    return list(images.values())
+
+
+def glb_image_bytes(filepath):
+    """Total bytes of images embedded in a GLB's binary chunk"""
+    with open(filepath, 'rb') as f:
+        magic, _, _ = struct.unpack('<III', f.read(12))
+        if magic != GLB_MAGIC:
+            return 0
+        length, chunk_type = struct.unpack('<II', f.read(8))
+        if chunk_type != GLB_JSON_CHUNK:
+            return 0
+        gltf = json.loads(f.read(length))
+    views = gltf.get('bufferViews', [])
+    return sum(views[image['bufferView']]['byteLength'] for image in gltf.get('images', []) if 'bufferView' in image)
+
+
+def record_export(filepath, before):
+    """Log and remember texture bytes before (source files) and after (embedded) for one GLB"""
+    after = glb_image_bytes(filepath)
+    REPORT.append((os.path.basename(filepath), before, after))
+    print(f"    Textures: {before / 1024:.1f} KB -> {after / 1024:.1f} KB")
+
+
+def print_report():
+    """Per-GLB and total texture bytes for this run's exports"""
+    if not REPORT:
+        return
+    print(f"\nTexture bytes (source -> embedded):")
+    for name, before, after in REPORT:
+        print(f"  {name:32s} {before / 1024:9.1f} KB -> {after / 1024:9.1f} KB")
+    before = sum(entry[1] for entry in REPORT)
+    after = sum(entry[2] for entry in REPORT)
+    saved = (1 - after / before) * 100 if before else 0
+    print(f"  {'TOTAL':32s} {before / 1024:9.1f} KB -> {after / 1024:9.1f} KB ({saved:.0f}% smaller)")
@@ -0,0 +1,269 @@
+"""
+Texture atlases shared by the Blender conversion scripts
+(convert-trees.py, convert-bushes.py)
+
+Packs every bark and foliage image the given objects use into at most two
+atlases (opaque bark, alpha-masked foliage) with skyline bin packing, pads
+each rectangle by replicating its edge pixels so nearest filtering never
+samples a neighbour, remaps the objects' UVs into atlas space and swaps their
+materials for one shared material per atlas. Every tree variant then renders
+with the same material and can be batched or instanced together.
+"""
+
+import bpy
+import numpy as np  # Bundled with Blender
+
+ATLAS_PADDING = 2  # Edge-replicated pixels around each image
+ATLAS_MAX_SIZE = 2048
+UV_TILE_EPSILON = 1e-3  # UVs further outside 0..1 mean a tiling texture, which can't be atlased
+ATLAS_GROUPS = ('bark', 'foliage')  # Opaque images, images with alpha
+
+
+def skyline_pack(sizes, width, height):
+    """Bottom-left skyline packing of (w, h) sizes into a width x height bin.
+
+    Returns one (x, y) per size in input order, or None when they don't fit.
+    """
+    skyline = [[0, 0, width]]  # Segments of [x, y, width], left to right
+    positions = [None] * len(sizes)
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+
+    for i in order:
+        w, h = sizes[i]
+        best = None
+        for start in range(len(skyline)):
+            x = skyline[start][0]
+            if x + w > width:
+                break
+            # Resting height over every segment the rectangle spans
+            y, end, covered = 0, start, 0
+            while covered < w:
+                y = max(y, skyline[end][1])
+                covered += skyline[end][2]
+                end += 1
+            if y + h <= height and (best is None or (y, x) < (best[1], best[0])):
+                best = (x, y, start)
+        if best is None:
+            return None
+
+        x, y, start = best
+        positions[i] = (x, y)
+        # Raise the skyline under the rectangle, trimming the segments it covers
+        new = [x, y + h, w]
+        right = x + w
+        rest = []
+        for segment in skyline[start:]:
+            seg_right = segment[0] + segment[2]
+            if seg_right <= right:
+                continue
+            if segment[0] < right:
+                segment = [right, segment[1], seg_right - right]
+            rest.append(segment)
+        skyline = skyline[:start] + [new] + rest
+
+        # Merge neighbours at the same height
+        merged = [skyline[0]]
+        for segment in skyline[1:]:
+            if segment[1] == merged[-1][1]:
+                merged[-1][2] += segment[2]
+            else:
+                merged.append(segment)
+        skyline = merged
+    return positions
+
+
+def pack_rects(sizes, max_size=ATLAS_MAX_SIZE):
+    """Smallest power-of-two atlas (width, height) and positions that fit all sizes"""
+    area = sum(w * h for w, h in sizes)
+    side = 1
+    while side * side < area or side < max(max(w, h) for w, h in sizes):
+        side *= 2
+    width = height = side
+    while width <= max_size and height <= max_size:
+        positions = skyline_pack(sizes, width, height)
+        if positions is not None:
+            return width, height, positions
+        # Grow alternately: double the width first, then square up
+        if width == height:
+            width *= 2
+        else:
+            height *= 2
+    raise ValueError(f"Textures do not fit in a {max_size}x{max_size} atlas")
+
+
+def image_pixels(img):
+    """(height, width, 4) float32 pixels of a Blender image, bottom row first"""
+    width, height = img.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    img.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, 4)
+
+
+def has_alpha(pixels):
+    return bool((pixels[:, :, 3] < 1.0).any())
+
+
+def material_image(mat):
+    """The base colour image of a material (first image texture node)"""
+    if mat and mat.use_nodes:
+        for node in mat.node_tree.nodes:
+            if node.type == 'TEX_IMAGE' and node.image and node.image.size[0] > 0:
+                return node.image
+    return None
+
+
+def loop_uvs(mesh):
+    """(loops, 2) UVs of the active UV layer and the material slot of each loop"""
+    uv_layer = mesh.uv_layers.active
+    uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+    uv_layer.data.foreach_get('uv', uvs)
+    material_index = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('material_index', material_index)
+    loop_total = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', loop_total)
+    return uvs.reshape(-1, 2), np.repeat(material_index, loop_total)
+
+
+def atlas_candidates(objects):
+    """Images that can go into an atlas, and those skipped because their UVs tile"""
+    images, tiled = {}, set()
+    for obj in objects:
+        if not obj.data.uv_layers.active:
+            continue
+        uvs, slots = loop_uvs(obj.data)
+        for slot, mat in enumerate(obj.data.materials):
+            img = material_image(mat)
+            if img is None:
+                continue
+            used = uvs[slots == slot]
+            if len(used) and (used.min() < -UV_TILE_EPSILON or used.max() > 1 + UV_TILE_EPSILON):
+                tiled.add(img.name)
+            images[img.name] = img
+    for name in tiled:
+        images.pop(name)
+    return images, sorted(tiled)
+
+
+def create_atlas_material(name, img, alpha):
+    """Principled material sampling the atlas with nearest filtering (alpha-masked for foliage)"""
+    mat = bpy.data.materials.new(name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    bsdf = nodes.get('Principled BSDF')
+    tex_node = nodes.new('ShaderNodeTexImage')
+    tex_node.image = img
+    tex_node.interpolation = 'Closest'
+    mat.node_tree.links.new(tex_node.outputs['Color'], bsdf.inputs['Base Color'])
+    if alpha:
+        # Same MASK setup as the bush importer
+        greater_than = nodes.new('ShaderNodeMath')
+        greater_than.operation = 'GREATER_THAN'
+        greater_than.inputs[1].default_value = 0.5
+        mat.node_tree.links.new(tex_node.outputs['Alpha'], greater_than.inputs[0])
+        mat.node_tree.links.new(greater_than.outputs[0], bsdf.inputs['Alpha'])
+        mat.use_backface_culling = False
+    return mat
+
+
+def build_atlas(group, images, padding=ATLAS_PADDING, max_size=ATLAS_MAX_SIZE):
+    """Pack images into one atlas image; returns (atlas image, {image name: (x, y, w, h)})"""
+    pixels = {name: image_pixels(img) for name, img in images.items()}
+    names = sorted(pixels)
+    sizes = [(pixels[name].shape[1] + 2 * padding, pixels[name].shape[0] + 2 * padding) for name in names]
+    width, height, positions = pack_rects(sizes, max_size)
+
+    atlas = np.zeros((height, width, 4), dtype=np.float32)
+    rects = {}
+    for name, (x, y) in zip(names, positions):
+        block = pixels[name]
+        h, w = block.shape[:2]
+        atlas[y:y + h + 2 * padding, x:x + w + 2 * padding] = np.pad(
+            block, ((padding, padding), (padding, padding), (0, 0)), mode='edge')
+        rects[name] = (x + padding, y + padding, w, h)
+
+    img = bpy.data.images.new(f"atlas_{group}", width, height, alpha=True)
+    img.pixels.foreach_set(atlas.ravel())
+    img.update()
+    print(f"  ✓ Built {group} atlas: {width}x{height} from {len(names)} image(s)")
+    return img, rects
+
+
+def remap_object(obj, image_rects, atlas_sizes, atlas_materials):
+    """Move an object's UVs into atlas space and replace atlased slots with the shared materials"""
+    mesh = obj.data
+    uvs, slots = loop_uvs(mesh)
+    old_materials = list(mesh.materials)
+
+    # New slot list: kept (non-atlased) materials first, then the shared atlas materials
+    atlased = {image_rects[img.name][0] for img in map(material_image, old_materials)
+               if img is not None and img.name in image_rects}
+    kept = [mat for mat in old_materials if not (material_image(mat) and material_image(mat).name in image_rects)]
+    new_materials = kept + [atlas_materials[group] for group in ATLAS_GROUPS if group in atlased]
+    slot_map = np.zeros(max(len(old_materials), 1), dtype=np.int32)
+
+    for slot, mat in enumerate(old_materials):
+        img = material_image(mat)
+        if img is None or img.name not in image_rects:
+            slot_map[slot] = new_materials.index(mat)
+            continue
+        group, (x, y, w, h) = image_rects[img.name]
+        atlas_w, atlas_h = atlas_sizes[group]
+        selected = slots == slot
+        uvs[selected, 0] = (x + uvs[selected, 0] * w) / atlas_w
+        uvs[selected, 1] = (y + uvs[selected, 1] * h) / atlas_h
+        slot_map[slot] = new_materials.index(atlas_materials[group])
+
+    mesh.uv_layers.active.data.foreach_set('uv', uvs.ravel())
+    material_index = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('material_index', material_index)
+
+    mesh.materials.clear()
+    for mat in new_materials:
+        mesh.materials.append(mat)
+    mesh.polygons.foreach_set('material_index', slot_map[material_index] if len(old_materials) else material_index)
+    mesh.update()
+    return [mat.name for mat in mesh.materials if mat in atlas_materials.values()]
+
+
+def atlas_objects(objects, padding=ATLAS_PADDING, max_size=ATLAS_MAX_SIZE, prefix='Atlas'):
+    """Atlas every image the objects use; returns the layout for trees.json.
+
+    The layout uses glTF/three.js UV orientation (origin top-left):
+    {group: {'material', 'size': [w, h], 'padding', 'images': {name: [x, y, w, h]}},
+     'skipped': [tiling images], 'objects': {object name: [atlas materials]}}
+    """
+    images, tiled = atlas_candidates(objects)
+    for name in tiled:
+        print(f"  ⚠ {name}: UVs tile outside 0..1, kept as its own material")
+
+    groups = {group: {} for group in ATLAS_GROUPS}
+    for name, img in images.items():
+        groups['foliage' if has_alpha(image_pixels(img)) else 'bark'][name] = img
+
+    layout = {'skipped': tiled, 'objects': {}}
+    image_rects, atlas_sizes, atlas_materials = {}, {}, {}
+    for group, group_images in groups.items():
+        if not group_images:
+            continue
+        img, rects = build_atlas(group, group_images, padding, max_size)
+        atlas_sizes[group] = tuple(img.size)
+        atlas_materials[group] = create_atlas_material(f"{prefix}_{group}", img, group == 'foliage')
+        width, height = img.size
+        layout[group] = {
+            'material': atlas_materials[group].name,
+            'size': [width, height],
+            'padding': padding,
+            # Flip to a top-left origin for the runtime
+            'images': {name: [x, height - y - h, w, h] for name, (x, y, w, h) in sorted(rects.items())}
+        }
+        image_rects.update((name, (group, rect)) for name, rect in rects.items())
+
+    remapped = {}
+    for obj in objects:
+        if not obj.data.uv_layers.active:
+            continue
+        # Objects sharing a mesh must only have its UVs moved once
+        if obj.data.name not in remapped:
+            remapped[obj.data.name] = remap_object(obj, image_rects, atlas_sizes, atlas_materials)
+        layout['objects'][obj.name] = remapped[obj.data.name]
+    return layout
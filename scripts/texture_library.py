@@ -0,0 +1,231 @@
+"""
+Shared external texture library for exported GLBs, used by the Blender
+conversion scripts (convert-trees.py, convert-bushes.py, convert-batch.py)
+
+Instead of every GLB embedding its own copy of the same bark/foliage image,
+each embedded image is hashed and written once to the library directory
+(public/assets/models/textures/<sha1>.<ext>). The GLB is rewritten to point
+at it by relative URI. manifest.json in the library records which assets use
+which images, so shared textures can be seen at a glance:
+
+    {"textures": {"<file>": {"bytes", "mimeType", "names": [...], "assets": [...]}},
+     "assets": {"trees/tree-fir-tall.glb": ["<file>", ...]}}
+
+Asset paths are relative to the library's parent (the models directory). At
+runtime, createGLTFLoader() caches textures by resolved URI, so variants that
+share an image share one Texture and one GPU upload.
+
+Like glb_compression, the library is off until configure() is called; it runs
+as the last step of export_glb(). Importing this module does not require Blender.
+"""
+
+import os
+import json
+import time
+import hashlib
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import ktx2_textures
+
+DEFAULT_LIBRARY = "public/assets/models/textures"
+MANIFEST = "manifest.json"
+HASH_LENGTH = 16  # Hex digits of the SHA-1 used in file names
+LOCK_TIMEOUT = 30.0  # Seconds to wait for another worker's manifest update
+EXTENSIONS = {'image/png': '.png', 'image/jpeg': '.jpg', 'image/ktx2': '.ktx2'}
+
+_library: Optional[str] = None
+
+# (library, glb, images externalized, bytes no longer embedded) for every export this run
+REPORT: List[tuple] = []
+
+
+def configure(library: Optional[str]):
+    """Externalize the images of subsequent exports into `library` (None turns it off)"""
+    global _library
+    _library = library
+
+
+def enabled() -> bool:
+    return _library is not None
+
+
+def texture_filename(data: bytes, mime_type: str) -> str:
+    return hashlib.sha1(data).hexdigest()[:HASH_LENGTH] + EXTENSIONS[mime_type]
+
+
+def write_texture(library: str, filename: str, data: bytes) -> bool:
+    """Write a library image unless it already exists; returns True when it was written"""
+    path = os.path.join(library, filename)
+    if os.path.exists(path):
+        return False
+    os.makedirs(library, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)  # Atomic, so parallel workers writing the same image can't collide
+    return True
+
+
+def remove_buffer_views(gltf: Dict, removed: set):
+    """Delete bufferViews and renumber every reference to the ones that remain"""
+    views = gltf.get('bufferViews', [])
+    remap, kept = {}, []
+    for index, view in enumerate(views):
+        if index not in removed:
+            remap[index] = len(kept)
+            kept.append(view)
+    gltf['bufferViews'] = kept
+
+    def renumber(obj):
+        if obj is not None and 'bufferView' in obj:
+            obj['bufferView'] = remap[obj['bufferView']]
+
+    for accessor in gltf.get('accessors', []):
+        renumber(accessor)
+        sparse = accessor.get('sparse')
+        if sparse:
+            renumber(sparse['indices'])
+            renumber(sparse['values'])
+    for image in gltf.get('images', []):
+        renumber(image)
+    for mesh in gltf.get('meshes', []):
+        for primitive in mesh.get('primitives', []):
+            renumber(primitive.get('extensions', {}).get('KHR_draco_mesh_compression'))
+
+
+def externalize_glb(filepath: str, library: str) -> Dict:
+    """Move a GLB's embedded images into the library and reference them by URI.
+
+    Returns {'files': {image name: library file}, 'bytes': embedded bytes removed}.
+    """
+    gltf, binary = ktx2_textures.read_glb(filepath)
+    views = gltf.get('bufferViews', [])
+    uri_base = os.path.relpath(library, os.path.dirname(os.path.abspath(filepath)))
+
+    files, removed, removed_bytes = {}, set(), 0
+    for index, image in enumerate(gltf.get('images', [])):
+        uri = image.get('uri', '')
+        if uri and not uri.startswith('data:'):
+            # Already in the library (e.g. a GLB processed twice): keep it in the manifest
+            path = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(filepath)), uri))
+            if os.path.dirname(path) == os.path.abspath(library):
+                files[image.get('name', f"image{index}")] = os.path.basename(path)
+            continue
+        if 'bufferView' not in image or image.get('mimeType') not in EXTENSIONS:
+            continue
+        view = views[image['bufferView']]
+        start = view.get('byteOffset', 0)
+        data = binary[start:start + view['byteLength']]
+        filename = texture_filename(data, image['mimeType'])
+        write_texture(library, filename, data)
+
+        removed.add(image.pop('bufferView'))
+        removed_bytes += len(data)
+        image['uri'] = f"{uri_base}/{filename}".replace(os.sep, '/')
+        files[image.get('name', f"image{index}")] = filename
+
+    if removed:
+        remove_buffer_views(gltf, removed)
+        binary = ktx2_textures.repack_buffer(gltf, binary, {})
+        write_glb_without_empty_buffer(filepath, gltf, binary)
+    return {'files': files, 'bytes': removed_bytes}
+
+
+def write_glb_without_empty_buffer(filepath: str, gltf: Dict, binary: bytes):
+    """write_glb(), dropping the binary buffer when no bufferView is left to use it"""
+    if not gltf.get('bufferViews'):
+        gltf.pop('bufferViews', None)
+        gltf.pop('buffers', None)
+        binary = b''
+    ktx2_textures.write_glb(filepath, gltf, binary)
+
+
+@contextmanager
+def manifest_lock(library: str):
+    """Exclusive lock on the manifest across processes (convert-parallel.py workers)"""
+    os.makedirs(library, exist_ok=True)
+    lock_path = os.path.join(library, MANIFEST + '.lock')
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{lock_path} held for over {LOCK_TIMEOUT:.0f}s (remove it if stale)")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(lock_path)
+
+
+def load_manifest(library: str) -> Dict:
+    path = os.path.join(library, MANIFEST)
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {'textures': {}, 'assets': {}}
+
+
+def update_manifest(library: str, asset: str, files: Dict[str, str]):
+    """Record the library images an asset uses, replacing what it used before"""
+    with manifest_lock(library):
+        manifest = load_manifest(library)
+        textures = manifest['textures']
+        for filename in manifest['assets'].pop(asset, []):
+            entry = textures.get(filename)
+            if entry and asset in entry['assets']:
+                entry['assets'].remove(asset)
+
+        for name, filename in files.items():
+            entry = textures.setdefault(filename, {
+                'bytes': os.path.getsize(os.path.join(library, filename)),
+                'mimeType': next(mime for mime, ext in EXTENSIONS.items() if filename.endswith(ext)),
+                'names': [],
+                'assets': []
+            })
+            if name not in entry['names']:
+                entry['names'].append(name)
+            if asset not in entry['assets']:
+                entry['assets'].append(asset)
+                entry['assets'].sort()
+        if files:
+            manifest['assets'][asset] = sorted(set(files.values()))
+
+        with open(os.path.join(library, MANIFEST), 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def externalize_export(filepath: str) -> bool:
+    """externalize_glb() and update_manifest() for a converter's export_glb(); logs instead of raising"""
+    try:
+        result = externalize_glb(filepath, _library)
+        asset = os.path.relpath(os.path.abspath(filepath), os.path.dirname(os.path.abspath(_library)))
+        update_manifest(_library, asset.replace(os.sep, '/'), result['files'])
+    except (ValueError, OSError, TimeoutError) as e:
+        print(f"    ✗ Texture library failed: {e}")
+        return False
+    REPORT.append((_library, os.path.basename(filepath), len(result['files']), result['bytes']))
+    if result['files']:
+        print(f"    Shared textures: {', '.join(sorted(set(result['files'].values())))}")
+    return True
+
+
+def print_report():
+    """Images moved out of this run's GLBs and how much the shared copies save"""
+    for library in sorted({entry[0] for entry in REPORT}):
+        exports = [entry for entry in REPORT if entry[0] == library]
+        manifest = load_manifest(library)
+        unique = {filename for files in manifest['assets'].values() for filename in files}
+        library_bytes = sum(manifest['textures'][filename]['bytes'] for filename in unique)
+        shared = {filename: entry for filename, entry in manifest['textures'].items() if len(entry['assets']) > 1}
+        print(f"\nShared texture library ({library}):")
+        print(f"  {sum(entry[2] for entry in exports)} embedded image(s), "
+              f"{sum(entry[3] for entry in exports) / 1024:.1f} KB, moved out of {len(exports)} GLB(s)")
+        print(f"  Library: {len(unique)} unique image(s), {library_bytes / 1024:.1f} KB for "
+              f"{len(manifest['assets'])} asset(s)")
+        for filename, entry in sorted(shared.items(), key=lambda item: -len(item[1]['assets'])):
+            print(f"  {filename} ({', '.join(entry['names'])}) shared by {len(entry['assets'])} assets")
@@ -1,16 +1,47 @@
 /**
- * Audio Map - Maps audio identifiers to file paths
- * Using properly encoded OGG files with libvorbis
+ * Audio Map - Generated by audio_processor.py
+ * Maps audio identifiers to optimized file paths
  */
 
 import { assetPath } from '../utils/assetPath';
+import { AudioSource, pickAudioSource } from '../utils/loaders';
 
 export type AudioCategory = 'combat' | 'nightman' | 'transformation' |
                             'environment' | 'items' | 'player' | 'ambient';
 
+export type AudioFormat = 'webm' | 'ogg';
+
+// Most preferred first: Opus where the browser decodes it, Vorbis otherwise
+export const AUDIO_FORMAT_PREFERENCE: { format: AudioFormat; mimeType: string }[] = [
+  { format: 'webm', mimeType: 'audio/webm; codecs="opus"' },
+  { format: 'ogg', mimeType: 'audio/ogg; codecs="vorbis"' }
+];
+
+export interface AudioSpriteRegion {
+  start: number;  // Seconds into the category sprite
+  end: number;
+}
+
+export interface AudioLoopPoints {
+  start: number;  // Seconds, zero-crossing aligned
+  end: number;
+}
+
+// critical: decoded at boot, lazy: decoded on first play, stream: media element, never decoded whole
+export type AudioPreloadTier = 'critical' | 'lazy' | 'stream';
+
 export interface AudioFile {
   path: string;
   category: AudioCategory;
+  formats?: Partial<Record<AudioFormat, string>>;  // Alternate encodings of path
+  tier?: AudioPreloadTier;
+  duration?: number;     // Seconds
+  channels?: number;
+  decodedSize?: number;  // KB as a decoded AudioBuffer
+  originalSize?: number;
+  optimizedSize?: number;
+  sprite?: AudioSpriteRegion;
+  loop?: AudioLoopPoints;
 }
 
 export const AUDIO_MAP: Record<string, AudioFile> = {
@@ -18,189 +49,504 @@ export const AUDIO_MAP: Record<string, AudioFile> = {
   // AMBIENT
   'forest_night_loop': {
     path: '/assets/audio/optimized/ambient/forest_night_loop.ogg',
-    category: 'ambient'
+    category: 'ambient',
+    tier: 'stream',
+    duration: 45.203,
+    channels: 2,
+    decodedSize: 16951.0,
+    originalSize: 606.3,
+    optimizedSize: 489.5
   },
   'stepdirt_1': {
     path: '/assets/audio/optimized/ambient/stepdirt_1.ogg',
-    category: 'ambient'
+    category: 'ambient',
+    tier: 'lazy',
+    duration: 0.528,
+    channels: 2,
+    decodedSize: 198.1,
+    originalSize: 92.1,
+    optimizedSize: 13.7
   },
   'stepdirt_2': {
     path: '/assets/audio/optimized/ambient/stepdirt_2.ogg',
-    category: 'ambient'
+    category: 'ambient',
+    tier: 'lazy',
+    duration: 0.528,
+    channels: 2,
+    decodedSize: 198.1,
+    originalSize: 92.1,
+    optimizedSize: 13.7
   },
   'stepwood_1': {
     path: '/assets/audio/optimized/ambient/stepwood_1.ogg',
-    category: 'ambient'
+    category: 'ambient',
+    tier: 'lazy',
+    duration: 0.528,
+    channels: 2,
+    decodedSize: 198.1,
+    originalSize: 92.1,
+    optimizedSize: 12.1
   },
   'stepwood_2': {
     path: '/assets/audio/optimized/ambient/stepwood_2.ogg',
-    category: 'ambient'
+    category: 'ambient',
+    tier: 'lazy',
+    duration: 0.418,
+    channels: 2,
+    decodedSize: 156.7,
+    originalSize: 73.1,
+    optimizedSize: 10.7
   },
   'wind_trees': {
     path: '/assets/audio/optimized/ambient/wind_trees.ogg',
-    category: 'ambient'
+    category: 'ambient',
+    tier: 'stream',
+    duration: 29.625,
+    channels: 2,
+    decodedSize: 11109.3,
+    originalSize: 422.1,
+    optimizedSize: 334.9
   },
 
   // COMBAT
-  'shotgun_empty': {
-    path: '/assets/audio/optimized/combat/shotgun_empty.ogg',
-    category: 'combat'
-  },
   'hatchet_swing': {
     path: '/assets/audio/optimized/combat/hatchet_swing.ogg',
-    category: 'combat'
+    category: 'combat',
+    tier: 'critical',
+    duration: 2.0,
+    channels: 2,
+    decodedSize: 750.0,
+    originalSize: 375.1,
+    optimizedSize: 30.7
+  },
+  'shotgun_empty': {
+    path: '/assets/audio/optimized/combat/shotgun_empty.ogg',
+    category: 'combat',
+    tier: 'critical',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 18.5
   },
   'shotgun_fire': {
     path: '/assets/audio/optimized/combat/shotgun_fire.ogg',
-    category: 'combat'
+    category: 'combat',
+    tier: 'critical',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 18.9
   },
   'shotgun_reload': {
     path: '/assets/audio/optimized/combat/shotgun_reload.ogg',
-    category: 'combat'
+    category: 'combat',
+    tier: 'critical',
+    duration: 2.0,
+    channels: 2,
+    decodedSize: 750.0,
+    originalSize: 375.1,
+    optimizedSize: 33.8
   },
 
   // ENVIRONMENT
-  'door_rattle': {
-    path: '/assets/audio/optimized/environment/door_rattle.ogg',
-    category: 'environment'
-  },
-  'door_pound': {
-    path: '/assets/audio/optimized/environment/door_pound.ogg',
-    category: 'environment'
+  'board_shatter': {
+    path: '/assets/audio/optimized/environment/board_shatter.ogg',
+    category: 'environment',
+    tier: 'lazy',
+    duration: 2.0,
+    channels: 2,
+    decodedSize: 750.0,
+    originalSize: 375.1,
+    optimizedSize: 38.5
   },
-  'door_tap': {
-    path: '/assets/audio/optimized/environment/door_tap.ogg',
-    category: 'environment'
+  'door_close': {
+    path: '/assets/audio/optimized/environment/door_close.ogg',
+    category: 'environment',
+    tier: 'critical',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 15.7,
+    optimizedSize: 16.5
   },
   'door_massive_impact': {
     path: '/assets/audio/optimized/environment/door_massive_impact.ogg',
-    category: 'environment'
-  },
-  'door_close': {
-    path: '/assets/audio/optimized/environment/qubodup-DoorClose08.ogg',
-    category: 'environment'
+    category: 'environment',
+    tier: 'lazy',
+    duration: 12.0,
+    channels: 2,
+    decodedSize: 4500.0,
+    originalSize: 2250.1,
+    optimizedSize: 151.2
   },
   'door_open': {
-    path: '/assets/audio/optimized/environment/qubodup-DoorOpen08.ogg',
-    category: 'environment'
+    path: '/assets/audio/optimized/environment/door_open.ogg',
+    category: 'environment',
+    tier: 'critical',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 16.0,
+    optimizedSize: 16.8
+  },
+  'door_pound': {
+    path: '/assets/audio/optimized/environment/door_pound.ogg',
+    category: 'environment',
+    tier: 'lazy',
+    duration: 2.0,
+    channels: 2,
+    decodedSize: 750.0,
+    originalSize: 375.1,
+    optimizedSize: 37.4
+  },
+  'door_rattle': {
+    path: '/assets/audio/optimized/environment/door_rattle.ogg',
+    category: 'environment',
+    tier: 'lazy',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 19.8
   },
   'door_scratch': {
     path: '/assets/audio/optimized/environment/door_scratch.ogg',
-    category: 'environment'
+    category: 'environment',
+    tier: 'lazy',
+    duration: 2.0,
+    channels: 2,
+    decodedSize: 750.0,
+    originalSize: 375.1,
+    optimizedSize: 43.8
   },
   'door_splinter': {
     path: '/assets/audio/optimized/environment/door_splinter.ogg',
-    category: 'environment'
+    category: 'environment',
+    tier: 'lazy',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 26.2
   },
-  'board_shatter': {
-    path: '/assets/audio/optimized/environment/board_shatter.ogg',
-    category: 'environment'
+  'door_tap': {
+    path: '/assets/audio/optimized/environment/door_tap.ogg',
+    category: 'environment',
+    tier: 'lazy',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 17.3
   },
 
   // ITEMS
   'board_hammer': {
     path: '/assets/audio/optimized/items/board_hammer.ogg',
-    category: 'items'
+    category: 'items',
+    tier: 'lazy',
+    duration: 2.0,
+    channels: 2,
+    decodedSize: 750.0,
+    originalSize: 375.1,
+    optimizedSize: 37.2
   },
   'pickup_ammo': {
     path: '/assets/audio/optimized/items/pickup_ammo.ogg',
-    category: 'items'
+    category: 'items',
+    tier: 'lazy',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 20.5
+  },
+  'pickup_wood': {
+    path: '/assets/audio/optimized/items/pickup_wood.ogg',
+    category: 'items',
+    tier: 'lazy',
+    duration: 2.0,
+    channels: 2,
+    decodedSize: 750.0,
+    originalSize: 375.1,
+    optimizedSize: 32.2
   },
   'tree_fall': {
     path: '/assets/audio/optimized/items/tree_fall.ogg',
-    category: 'items'
+    category: 'items',
+    tier: 'lazy',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 22.6
   },
-  'pickup_wood': {
-    path: '/assets/audio/optimized/items/pickup_wood.ogg',
-    category: 'items'
+
+  // NIGHTMAN
+  'nightman_arm_swing': {
+    path: '/assets/audio/optimized/nightman/nightman_arm_swing.ogg',
+    category: 'nightman',
+    tier: 'lazy',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 18.6
+  },
+  'nightman_death': {
+    path: '/assets/audio/optimized/nightman/nightman_death.ogg',
+    category: 'nightman',
+    tier: 'lazy',
+    duration: 2.0,
+    channels: 2,
+    decodedSize: 750.0,
+    originalSize: 375.1,
+    optimizedSize: 31.3
+  },
+  'nightman_footsteps': {
+    path: '/assets/audio/optimized/nightman/nightman_footsteps.ogg',
+    category: 'nightman',
+    tier: 'lazy',
+    duration: 2.0,
+    channels: 2,
+    decodedSize: 750.0,
+    originalSize: 375.1,
+    optimizedSize: 30.2
+  },
+  'nightman_growl': {
+    path: '/assets/audio/optimized/nightman/nightman_growl.ogg',
+    category: 'nightman',
+    tier: 'lazy',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 16.4
+  },
+  'nightman_hunt': {
+    path: '/assets/audio/optimized/nightman/nightman_hunt.ogg',
+    category: 'nightman',
+    tier: 'lazy',
+    duration: 2.0,
+    channels: 2,
+    decodedSize: 750.0,
+    originalSize: 375.1,
+    optimizedSize: 31.1
+  },
+  'nightman_impact': {
+    path: '/assets/audio/optimized/nightman/nightman_impact.ogg',
+    category: 'nightman',
+    tier: 'lazy',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 19.2
+  },
+  'nightman_pain': {
+    path: '/assets/audio/optimized/nightman/nightman_pain.ogg',
+    category: 'nightman',
+    tier: 'lazy',
+    duration: 2.0,
+    channels: 2,
+    decodedSize: 750.0,
+    originalSize: 375.1,
+    optimizedSize: 31.7
+  },
+  'nightman_stomp': {
+    path: '/assets/audio/optimized/nightman/nightman_stomp.ogg',
+    category: 'nightman',
+    tier: 'lazy',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 16.3
   },
 
   // PLAYER
   'player_death': {
     path: '/assets/audio/optimized/player/player_death.ogg',
-    category: 'player'
+    category: 'player',
+    tier: 'critical',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 20.1
   },
-  'player_hurt_light': {
-    path: '/assets/audio/optimized/player/player_hurt_light.ogg',
-    category: 'player'
+  'player_heartbeat': {
+    path: '/assets/audio/optimized/player/player_heartbeat.ogg',
+    category: 'player',
+    tier: 'critical',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 16.4
   },
   'player_hurt_heavy': {
     path: '/assets/audio/optimized/player/player_hurt_heavy.ogg',
-    category: 'player'
+    category: 'player',
+    tier: 'critical',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 18.7
   },
-  'player_heartbeat': {
-    path: '/assets/audio/optimized/player/player_heartbeat.ogg',
-    category: 'player'
+  'player_hurt_light': {
+    path: '/assets/audio/optimized/player/player_hurt_light.ogg',
+    category: 'player',
+    tier: 'critical',
+    duration: 0.48,
+    channels: 2,
+    decodedSize: 180.0,
+    originalSize: 90.1,
+    optimizedSize: 14.1
   },
 
   // TRANSFORMATION
-  'transform_whoosh': {
-    path: '/assets/audio/optimized/transformation/transform_whoosh.ogg',
-    category: 'transformation'
+  'transform_bones_break': {
+    path: '/assets/audio/optimized/transformation/transform_bones_break.ogg',
+    category: 'transformation',
+    tier: 'lazy',
+    duration: 3.0,
+    channels: 2,
+    decodedSize: 1125.0,
+    originalSize: 562.6,
+    optimizedSize: 62.3
   },
   'transform_bones_final': {
     path: '/assets/audio/optimized/transformation/transform_bones_final.ogg',
-    category: 'transformation'
+    category: 'transformation',
+    tier: 'lazy',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 20.0
   },
-  'transform_bones_break': {
-    path: '/assets/audio/optimized/transformation/transform_bones_break.ogg',
-    category: 'transformation'
+  'transform_bones_snap': {
+    path: '/assets/audio/optimized/transformation/transform_bones_snap.ogg',
+    category: 'transformation',
+    tier: 'lazy',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 29.9
   },
   'transform_rumble': {
     path: '/assets/audio/optimized/transformation/transform_rumble.ogg',
-    category: 'transformation'
+    category: 'transformation',
+    tier: 'lazy',
+    duration: 3.0,
+    channels: 2,
+    decodedSize: 1125.0,
+    originalSize: 562.6,
+    optimizedSize: 47.1
   },
-  'transform_bones_snap': {
-    path: '/assets/audio/optimized/transformation/transform_bones_snap.ogg',
-    category: 'transformation'
+  'transform_whoosh': {
+    path: '/assets/audio/optimized/transformation/transform_whoosh.ogg',
+    category: 'transformation',
+    tier: 'lazy',
+    duration: 1.0,
+    channels: 2,
+    decodedSize: 375.0,
+    originalSize: 187.6,
+    optimizedSize: 21.6
   },
+};
 
-  // NIGHTMAN (monster sounds - for future use)
-  'nightman_growl': {
-    path: '/assets/audio/optimized/nightman/nightman_growl.ogg',
-    category: 'nightman'
-  },
-  'nightman_footsteps': {
-    path: '/assets/audio/optimized/nightman/nightman_footsteps.ogg',
-    category: 'nightman'
-  },
-  'nightman_impact': {
-    path: '/assets/audio/optimized/nightman/nightman_impact.ogg',
-    category: 'nightman'
-  },
-  'nightman_arm_swing': {
-    path: '/assets/audio/optimized/nightman/nightman_arm_swing.ogg',
-    category: 'nightman'
-  },
-  'nightman_death': {
-    path: '/assets/audio/optimized/nightman/nightman_death.ogg',
-    category: 'nightman'
-  },
-  'nightman_stomp': {
-    path: '/assets/audio/optimized/nightman/nightman_stomp.ogg',
-    category: 'nightman'
-  },
-  'nightman_pain': {
-    path: '/assets/audio/optimized/nightman/nightman_pain.ogg',
-    category: 'nightman'
-  },
-  'nightman_hunt': {
-    path: '/assets/audio/optimized/nightman/nightman_hunt.ogg',
-    category: 'nightman'
-  },
+// Alternate names (duplicates and raw source filenames) -> AUDIO_MAP key
+export const AUDIO_ALIASES: Record<string, string> = {
+  'Dark_ethereal_whoosh_1763683876072': 'transform_whoosh',
+  'Deep_guttural_monste_1763683426669': 'nightman_growl',
+  'Door_handle_rattling_1763684186572': 'door_rattle',
+  'Dry_click_of_empty_s_1763683111170': 'shotgun_empty',
+  'Fast_whoosh_sound_of_1763683219815': 'hatchet_swing',
+  'Final_massive_bone_r_1763683841953': 'transform_bones_final',
+  'Hammering_nail_into__1763684400437': 'board_hammer',
+  'Heavy_double-barrel__1763683055686': 'shotgun_fire',
+  'Heavy_human-sized_fo_1763683393491': 'nightman_footsteps',
+  'Heavy_impact_of_mons_1763683663265': 'nightman_impact',
+  'Heavy_pounding_on_wo_1763684029508': 'door_pound',
+  'Light_tapping_on_woo_1763683991424': 'door_tap',
+  'Male_death_scream_fa_1763684477796': 'player_death',
+  'Male_grunt_of_pain,__1763684423615': 'player_hurt_light',
+  'Male_scream_of_agony_1763684450948': 'player_hurt_heavy',
+  'Massive_creature_arm_1763683621031': 'nightman_arm_swing',
+  'Massive_creature_dyi_1763683738671': 'nightman_death',
+  'Massive_creature_foo_1763683353068': 'nightman_stomp',
+  'Massive_impact_on_wo_1763684246255': 'door_massive_impact',
+  'Monster_pain_roar,_a_1763683706293': 'nightman_pain',
+  'Multiple_bones_break_1763683811146': 'transform_bones_break',
+  'Ominous_low_rumble_w_1763683913346': 'transform_rumble',
+  'Realistic_heartbeat__1763684522415': 'player_heartbeat',
+  'Sharp_claws_scratchi_1763684067918': 'door_scratch',
+  'Shotgun_shell_loadin_1763683158583': 'shotgun_reload',
+  'Wet_bone_snapping_an_1763683777763': 'transform_bones_snap',
+  'Wood_door_splinterin_1763684274266': 'door_splinter',
+  'guttural_demon_hunti_1763683577323': 'nightman_hunt',
+  'pickup_ammo_sound_1763684347169': 'pickup_ammo',
+  'qubodup-DoorClose08': 'door_close',
+  'qubodup-DoorOpen08': 'door_open',
+  'tree_falls_down_quic_1763683271220': 'tree_fall',
+  'wood_pickup_sound_1763684367832': 'pickup_wood',
+  'wooden_board_shatter_1763684119044': 'board_shatter',
 };
 
-export function getAudioPath(key: string): string {
-  const audio = AUDIO_MAP[key];
+// One file per category holding every clip with a sprite region. Empty when
+// the build made no sprites (--no-sprites, --manifest-only): sounds load per file.
+export const AUDIO_SPRITES: Partial<Record<AudioCategory, string>> = {
+};
+
+export function resolveAudioKey(key: string): string {
+  return AUDIO_MAP[key] ? key : (AUDIO_ALIASES[key] ?? key);
+}
+
+function toAssetPath(path: string): string {
+  // Remove leading slash and use assetPath for proper base URL handling
+  return assetPath(path.startsWith('/') ? path.slice(1) : path);
+}
+
+/**
+ * Every encoding of a sound in AUDIO_FORMAT_PREFERENCE order, for loadAudio
+ */
+export function getAudioSources(key: string): AudioSource[] {
+  const audio = AUDIO_MAP[resolveAudioKey(key)];
   if (!audio) {
+    return [];
+  }
+  const sources = AUDIO_FORMAT_PREFERENCE
+    .filter(({ format }) => audio.formats?.[format])
+    .map(({ format, mimeType }) => ({ path: toAssetPath(audio.formats![format]!), mimeType }));
+  return sources.length ? sources : [{ path: toAssetPath(audio.path), mimeType: 'audio/ogg' }];
+}
+
+export function getAudioPath(key: string): string {
+  if (!AUDIO_MAP[resolveAudioKey(key)]) {
     console.warn(`Audio file not found: ${key}`);
     return '';
   }
-  // Remove leading slash and use assetPath for proper base URL handling
-  const path = audio.path.startsWith('/') ? audio.path.slice(1) : audio.path;
-  return assetPath(path);
+  return pickAudioSource(getAudioSources(key));
 }
 
 export function getAudiosByCategory(category: AudioCategory): AudioFile[] {
   return Object.values(AUDIO_MAP).filter(a => a.category === category);
 }
+
+export function getAudioKeysByTier(tier: AudioPreloadTier): string[] {
+  return Object.keys(AUDIO_MAP).filter(key => (AUDIO_MAP[key].tier ?? 'lazy') === tier);
+}
+
+export function getAudioSpritePath(category: AudioCategory): string {
+  const path = AUDIO_SPRITES[category];
+  if (!path) {
+    return '';
+  }
+  return toAssetPath(path);
+}
@@ -1,5 +1,9 @@
 import * as THREE from 'three';
-import { AUDIO_MAP, AudioCategory, getAudioPath, getAudiosByCategory } from './AudioMap';
+import {
+  AUDIO_MAP, AudioCategory, getAudioKeysByTier, getAudioPath, getAudioSources, getAudioSpritePath,
+  getAudiosByCategory, resolveAudioKey
+} from './AudioMap';
+import { loadAudioSprite, pickAudioSource } from '../utils/loaders';
 
 /**
  * Enhanced Audio Manager for The Nightman Cometh
@@ -9,6 +13,7 @@ import { AUDIO_MAP, AudioCategory, getAudioPath, getAudiosByCategory } from './A
  * - Dynamic mixing and ducking
  * - Horror-specific effects (heartbeat, reverb, distortion)
  * - Audio sprites for multiple short sounds
+ * - Preload tiers: critical sounds decode at boot, long ambience streams
  */
 
 interface AudioPoolEntry {
@@ -42,6 +47,11 @@ export class EnhancedAudioManager {
   // Cached buffers
   private bufferCache: Map<string, AudioBuffer> = new Map();
   private loadingPromises: Map<string, Promise<AudioBuffer>> = new Map();
+  private spritePromises: Map<AudioCategory, Promise<void>> = new Map();
+
+  // 'stream' tier sounds play from media elements instead of decoded buffers
+  private streamElements: Map<THREE.Audio, HTMLAudioElement> = new Map();
+  private blockedStreams: HTMLAudioElement[] = [];
 
   // Active sounds tracking
   private activeSounds: Map<string, THREE.PositionalAudio | THREE.Audio> = new Map();
@@ -114,6 +124,8 @@ export class EnhancedAudioManager {
           console.log('[AudioContext] Resumed after user interaction');
         });
       }
+      this.blockedStreams.forEach(element => element.play().catch(() => undefined));
+      this.blockedStreams = [];
       document.removeEventListener('click', unlock);
       document.removeEventListener('touchstart', unlock);
       document.removeEventListener('keydown', unlock);
@@ -128,6 +140,9 @@ export class EnhancedAudioManager {
    * Preload audio buffer
    */
   public async preload(key: string): Promise<AudioBuffer | null> {
+    // Aliases share the canonical sound's buffer
+    key = resolveAudioKey(key);
+
     // Check cache first
     if (this.bufferCache.has(key)) {
       return this.bufferCache.get(key)!;
@@ -138,6 +153,19 @@ export class EnhancedAudioManager {
       return this.loadingPromises.get(key)!;
     }
 
+    // Sprite members are decoded together with the rest of their category
+    const entry = AUDIO_MAP[key];
+    if (entry?.sprite && getAudioSpritePath(entry.category)) {
+      try {
+        await this.preloadSprite(entry.category);
+        if (this.bufferCache.has(key)) {
+          return this.bufferCache.get(key)!;
+        }
+      } catch (error) {
+        console.warn(`[Audio] Sprite load failed, falling back to file: ${key}`, error);
+      }
+    }
+
     const path = getAudioPath(key);
     if (!path) {
       console.warn(`[Audio] No audio file found for key: ${key}`);
@@ -165,6 +193,47 @@ export class EnhancedAudioManager {
     return promise;
   }
 
+  /**
+   * Load a category sprite once and cache a buffer for each of its sounds
+   */
+  private preloadSprite(category: AudioCategory): Promise<void> {
+    const existing = this.spritePromises.get(category);
+    if (existing) {
+      return existing;
+    }
+
+    const regions: Record<string, { start: number; end: number }> = {};
+    for (const [key, file] of Object.entries(AUDIO_MAP)) {
+      if (file.category === category && file.sprite) {
+        regions[key] = file.sprite;
+      }
+    }
+
+    const promise = loadAudioSprite(getAudioSpritePath(category), regions).then(
+      (buffers) => {
+        buffers.forEach((buffer, key) => this.bufferCache.set(key, buffer));
+      },
+      (error) => {
+        // Allow a retry on the next request
+        this.spritePromises.delete(category);
+        throw error;
+      }
+    );
+
+    this.spritePromises.set(category, promise);
+    return promise;
+  }
+
+  /**
+   * Decode every 'critical' tier sound so its first play has no load latency
+   */
+  public async preloadCritical(): Promise<void> {
+    const keys = getAudioKeysByTier('critical');
+    const decodedKb = keys.reduce((total, key) => total + (AUDIO_MAP[key].decodedSize ?? 0), 0);
+    console.log(`[Audio] Preloading ${keys.length} critical sounds (~${(decodedKb / 1024).toFixed(1)} MB decoded)`);
+    await Promise.all(keys.map(key => this.preload(key)));
+  }
+
   /**
    * Preload entire category of sounds
    */
@@ -180,6 +249,16 @@ export class EnhancedAudioManager {
     console.log(`[Audio] Category loaded: ${category}`);
   }
 
+  /**
+   * Use the processor's zero-crossing loop points so loops wrap without a click.
+   * Pooled sources are reused, so points are always reset.
+   */
+  private applyLoopPoints(audio: THREE.Audio | THREE.PositionalAudio, key: string, loop: boolean): void {
+    const points = loop ? AUDIO_MAP[resolveAudioKey(key)]?.loop : undefined;
+    audio.setLoopStart(points?.start ?? 0);
+    audio.setLoopEnd(points?.end ?? 0);
+  }
+
   /**
    * Play 3D spatial audio
    */
@@ -201,13 +280,14 @@ export class EnhancedAudioManager {
     const audio = entry.audio as THREE.PositionalAudio;
     entry.inUse = true;
     entry.key = key;
-    entry.category = AUDIO_MAP[key]?.category || 'ambient';
+    entry.category = AUDIO_MAP[resolveAudioKey(key)]?.category || 'ambient';
 
     // Configure audio
     audio.setBuffer(buffer);
     audio.position.copy(position);
     audio.setVolume((config.volume ?? 1.0) * this.sfxVolume * this.masterVolume);
     audio.setLoop(config.loop ?? false);
+    this.applyLoopPoints(audio, key, config.loop ?? false);
 
     if (config.refDistance) audio.setRefDistance(config.refDistance);
     if (config.maxDistance) audio.setMaxDistance(config.maxDistance);
@@ -239,6 +319,79 @@ export class EnhancedAudioManager {
     return audio;
   }
 
+  /**
+   * Looping positional source outside the pool for long-lived emitters (wind).
+   * The caller owns it: add it to the scene and stop it when done.
+   */
+  public async createPositionalLoop(
+    key: string,
+    position: THREE.Vector3,
+    config: AudioConfig = {}
+  ): Promise<THREE.PositionalAudio | null> {
+    const buffer = await this.preload(key);
+    if (!buffer) return null;
+
+    const audio = new THREE.PositionalAudio(this.listener);
+    audio.setBuffer(buffer);
+    audio.position.copy(position);
+    audio.setVolume((config.volume ?? 1.0) * this.sfxVolume * this.masterVolume);
+    audio.setLoop(true);
+    this.applyLoopPoints(audio, key, true);
+
+    if (config.refDistance) audio.setRefDistance(config.refDistance);
+    if (config.maxDistance) audio.setMaxDistance(config.maxDistance);
+    if (config.rolloffFactor) audio.setRolloffFactor(config.rolloffFactor);
+
+    audio.play();
+    return audio;
+  }
+
+  /**
+   * Play a 'stream' tier sound through a media element; it is fetched and
+   * decoded incrementally instead of being held as a whole AudioBuffer.
+   * Media elements only wrap at the file ends, so loops with loop points
+   * never come here (see usesStream).
+   */
+  private playStream(key: string, config: AudioConfig): THREE.Audio {
+    const element = new window.Audio(pickAudioSource(getAudioSources(key)));
+    element.loop = config.loop ?? false;
+
+    const audio = new THREE.Audio(this.listener);
+    audio.setMediaElementSource(element);
+    const volume = (config.volume ?? 1.0) * this.sfxVolume * this.masterVolume;
+    audio.setVolume(config.fadeIn ? 0 : volume);
+
+    element.play().catch(() => {
+      // Autoplay policy: start on the first user interaction instead
+      this.blockedStreams.push(element);
+    });
+    if (config.fadeIn) {
+      this.fadeVolume(audio, volume, config.fadeIn);
+    }
+
+    element.addEventListener('ended', () => this.stopStream(audio));
+    this.streamElements.set(audio, element);
+    this.activeSounds.set(key, audio);
+    return audio;
+  }
+
+  /**
+   * Loops with loop points stay on the buffer path so they wrap sample-accurately
+   */
+  private usesStream(key: string, config: AudioConfig): boolean {
+    const audio = AUDIO_MAP[resolveAudioKey(key)];
+    return audio?.tier === 'stream' && !(config.loop && audio.loop);
+  }
+
+  private stopStream(audio: THREE.Audio): void {
+    const element = this.streamElements.get(audio);
+    if (!element) return;
+    element.pause();
+    element.removeAttribute('src');
+    audio.disconnect();
+    this.streamElements.delete(audio);
+  }
+
   /**
    * Play 2D audio (UI, music)
    */
@@ -246,6 +399,10 @@ export class EnhancedAudioManager {
     key: string,
     config: AudioConfig = {}
   ): Promise<THREE.Audio | null> {
+    if (this.usesStream(key, config)) {
+      return this.playStream(key, config);
+    }
+
     const buffer = await this.preload(key);
     if (!buffer) return null;
 
@@ -258,11 +415,12 @@ export class EnhancedAudioManager {
     const audio = entry.audio as THREE.Audio;
     entry.inUse = true;
     entry.key = key;
-    entry.category = AUDIO_MAP[key]?.category || 'ambient';
+    entry.category = AUDIO_MAP[resolveAudioKey(key)]?.category || 'ambient';
 
     audio.setBuffer(buffer);
     audio.setVolume((config.volume ?? 1.0) * this.sfxVolume * this.masterVolume);
     audio.setLoop(config.loop ?? false);
+    this.applyLoopPoints(audio, key, config.loop ?? false);
 
     if (config.randomPitch) {
       audio.setPlaybackRate(0.95 + Math.random() * 0.1);
@@ -312,11 +470,11 @@ export class EnhancedAudioManager {
    * Start ambient forest loop
    */
   public async startAmbientLoop(): Promise<void> {
-    if (this.ambientLoop && this.ambientLoop.isPlaying) {
+    if (this.ambientLoop && this.isActive(this.ambientLoop)) {
       return;
     }
 
-    await this.play2D('forest_night_loop', {
+    this.ambientLoop = await this.play2D('forest_night_loop', {
       volume: this.ambientVolume,
       loop: true,
       fadeIn: 2.0
@@ -327,7 +485,7 @@ export class EnhancedAudioManager {
    * Start heartbeat loop (low health)
    */
   public async startHeartbeat(): Promise<void> {
-    if (this.heartbeatLoop && this.heartbeatLoop.isPlaying) {
+    if (this.heartbeatLoop && this.isActive(this.heartbeatLoop)) {
       return;
     }
 
@@ -344,16 +502,47 @@ export class EnhancedAudioManager {
    * Stop heartbeat loop
    */
   public stopHeartbeat(): void {
-    if (this.heartbeatLoop && this.heartbeatLoop.isPlaying) {
+    if (this.heartbeatLoop && this.isActive(this.heartbeatLoop)) {
       this.fadeVolume(this.heartbeatLoop, 0, 1.0);
       setTimeout(() => {
-        this.heartbeatLoop?.stop();
+        if (this.heartbeatLoop) this.stop(this.heartbeatLoop);
         this.heartbeatLoop = null;
       }, 1000);
     }
     this.isLowHealth = false;
   }
 
+  /**
+   * Stop ambient forest loop
+   */
+  public stopAmbientLoop(): void {
+    if (this.ambientLoop) {
+      this.stop(this.ambientLoop);
+      this.ambientLoop = null;
+    }
+  }
+
+  /**
+   * Stop one sound returned by play2D/play3D, whether it plays from a buffer or a stream
+   */
+  public stop(audio: THREE.Audio | THREE.PositionalAudio): void {
+    if (this.streamElements.has(audio)) {
+      this.stopStream(audio);
+    } else if (audio.isPlaying) {
+      audio.stop();
+    }
+
+    const entry = this.pool2D.find(e => e.audio === audio) ?? this.pool3D.find(e => e.audio === audio);
+    if (entry) {
+      entry.inUse = false;
+      entry.key = '';
+    }
+  }
+
+  private isActive(audio: THREE.Audio | THREE.PositionalAudio): boolean {
+    return audio.isPlaying || this.streamElements.has(audio);
+  }
+
   /**
    * Play combat sound with spatial audio
    */
@@ -510,6 +699,8 @@ export class EnhancedAudioManager {
       entry.key = '';
     });
 
+    this.streamElements.forEach((_element, audio) => this.stopStream(audio));
+    this.ambientLoop = null;
     this.activeSounds.clear();
   }
 
@@ -532,6 +723,7 @@ export class EnhancedAudioManager {
     this.stopAll();
     this.bufferCache.clear();
     this.loadingPromises.clear();
+    this.spritePromises.clear();
   }
 
 }
@@ -1,6 +1,7 @@
 import './index.css';
 import * as THREE from 'three';
 import { SceneManager } from './world/SceneManager';
+import { enableKTX2 } from './utils/loaders';
 
 // Initialize WebGL renderer
 const renderer = new THREE.WebGLRenderer({
@@ -14,6 +15,7 @@ renderer.shadowMap.enabled = true;
 renderer.shadowMap.type = THREE.PCFSoftShadowMap;
 renderer.toneMapping = THREE.ACESFilmicToneMapping;
 renderer.toneMappingExposure = 0.6;
+enableKTX2(renderer);
 
 const appElement = document.querySelector<HTMLDivElement>('#app');
 if (appElement) {
@@ -1,8 +1,95 @@
-import { GLTFLoader } from 'three/examples/jsm/loaders/GLTFLoader.js';
-import { TextureLoader, AudioLoader } from 'three';
+import { GLTFLoader, GLTFLoaderPlugin, GLTFParser } from 'three/examples/jsm/loaders/GLTFLoader.js';
+import { DRACOLoader } from 'three/examples/jsm/loaders/DRACOLoader.js';
+import { KTX2Loader } from 'three/examples/jsm/loaders/KTX2Loader.js';
+import { MeshoptDecoder } from 'three/examples/jsm/libs/meshopt_decoder.module.js';
+import {
+  TextureLoader, AudioLoader, WebGLRenderer, Texture, LoaderUtils,
+  BufferAttribute, BufferGeometry, InterleavedBufferAttribute, Matrix4, Mesh
+} from 'three';
+import { assetPath } from './assetPath';
+
+// Draco decoder files, copied from three/examples/jsm/libs/draco/gltf/ by vite.config.js (only fetched for Draco GLBs)
+const DRACO_DECODER_PATH = 'draco/';
+// Basis transcoder files, copied from three/examples/jsm/libs/basis/ by vite.config.js (only fetched for KTX2 textures)
+const BASIS_TRANSCODER_PATH = 'basis/';
+
+let dracoLoader: DRACOLoader | null = null;
+let ktx2Loader: KTX2Loader | null = null;
+const gltfLoaders: GLTFLoader[] = [];
+
+// Textures of external images (scripts/texture_library.py), keyed by resolved URI and sampler
+const sharedTextures = new Map<string, Promise<Texture>>();
+
+/**
+ * Loads each externally referenced image once across every GLB, so variants that share
+ * a library texture also share its Texture and GPU upload. Embedded images and extension
+ * sources (KTX2) fall through to the loader's own per-file handling.
+ */
+class SharedTexturePlugin implements GLTFLoaderPlugin {
+  readonly name = 'SHARED_TEXTURES';
+
+  constructor(private parser: GLTFParser) {}
+
+  loadTexture(textureIndex: number): Promise<Texture> | null {
+    const json = this.parser.json;
+    const textureDef = json.textures[textureIndex];
+    const uri: string | undefined = json.images?.[textureDef.source]?.uri;
+    if (textureDef.source === undefined || !uri || uri.startsWith('data:')) {
+      return null;
+    }
+
+    const url = LoaderUtils.resolveURL(uri, this.parser.options.path);
+    const key = `${url}#${JSON.stringify(json.samplers?.[textureDef.sampler] ?? {})}`;
+    let texture = sharedTextures.get(key);
+    if (!texture) {
+      const imageLoader = (this.parser as any).textureLoader;
+      texture = this.parser.loadTextureImage(textureIndex, textureDef.source, imageLoader) as Promise<Texture>;
+      sharedTextures.set(key, texture);
+      texture.catch(() => sharedTextures.delete(key)); // Let a later load retry
+    }
+    return texture;
+  }
+}
+
+/**
+ * GLTFLoader that can decode compressed GLBs (meshopt and Draco, see scripts/glb_compression.py)
+ * and shares library textures between GLBs. All loaders share one DRACOLoader so its decoder
+ * workers are created once.
+ */
+export function createGLTFLoader(): GLTFLoader {
+  if (!dracoLoader) {
+    dracoLoader = new DRACOLoader();
+    dracoLoader.setDecoderPath(assetPath(DRACO_DECODER_PATH));
+  }
+  const loader = new GLTFLoader();
+  loader.setMeshoptDecoder(MeshoptDecoder);
+  loader.setDRACOLoader(dracoLoader);
+  loader.register(parser => new SharedTexturePlugin(parser));
+  if (ktx2Loader) {
+    loader.setKTX2Loader(ktx2Loader);
+  }
+  gltfLoaders.push(loader);
+  return loader;
+}
+
+/**
+ * Let GLTF loaders read KTX2 textures (KHR_texture_basisu, see scripts/ktx2_textures.py).
+ * Needs the renderer to pick the GPU format; applies to loaders created before and after.
+ */
+export function enableKTX2(renderer: WebGLRenderer): void {
+  if (ktx2Loader) {
+    return;
+  }
+  ktx2Loader = new KTX2Loader();
+  ktx2Loader.setTranscoderPath(assetPath(BASIS_TRANSCODER_PATH));
+  ktx2Loader.detectSupport(renderer);
+  for (const loader of gltfLoaders) {
+    loader.setKTX2Loader(ktx2Loader);
+  }
+}
 
 // Singleton loaders
-export const gltfLoader = new GLTFLoader();
+export const gltfLoader = createGLTFLoader();
 export const textureLoader = new TextureLoader();
 export const audioLoader = new AudioLoader();
 
@@ -37,16 +124,126 @@ export async function loadTexture(path: string): Promise<any> {
   });
 }
 
+// In-flight audio requests, so concurrent loads of one file share a fetch and decode
+const pendingAudio = new Map<string, Promise<AudioBuffer>>();
+
+export interface AudioSource {
+  path: string;
+  mimeType: string;
+}
+
+const playableTypes = new Map<string, boolean>();
+
 /**
- * Load an audio file
+ * Whether the browser reports it can decode a MIME type (memoized)
  */
-export async function loadAudio(path: string): Promise<AudioBuffer> {
-  return new Promise((resolve, reject) => {
+export function canPlayAudioType(mimeType: string): boolean {
+  let playable = playableTypes.get(mimeType);
+  if (playable === undefined) {
+    playable = typeof document !== 'undefined' &&
+      document.createElement('audio').canPlayType(mimeType) !== '';
+    playableTypes.set(mimeType, playable);
+  }
+  return playable;
+}
+
+/**
+ * First source the browser can play, falling back to the last (most compatible) one
+ */
+export function pickAudioSource(sources: AudioSource[]): string {
+  const source = sources.find(s => canPlayAudioType(s.mimeType)) ?? sources[sources.length - 1];
+  return source?.path ?? '';
+}
+
+/**
+ * Load an audio file, or the first playable of several encodings in preference order
+ */
+export async function loadAudio(source: string | AudioSource[]): Promise<AudioBuffer> {
+  const path = typeof source === 'string' ? source : pickAudioSource(source);
+  const pending = pendingAudio.get(path);
+  if (pending) {
+    return pending;
+  }
+
+  const promise = new Promise<AudioBuffer>((resolve, reject) => {
     audioLoader.load(
       path,
       (buffer) => resolve(buffer),
       undefined,
       (error) => reject(error)
     );
+  }).finally(() => pendingAudio.delete(path));
+
+  pendingAudio.set(path, promise);
+  return promise;
+}
+
+// Attributes applyMatrix4 rewrites; quantized (meshopt) GLBs store them as integers
+const TRANSFORMED_ATTRIBUTES = ['position', 'normal', 'tangent'];
+
+function toFloat32(attribute: BufferAttribute | InterleavedBufferAttribute): BufferAttribute {
+  const { count, itemSize } = attribute;
+  const array = new Float32Array(count * itemSize);
+  const getters = [attribute.getX, attribute.getY, attribute.getZ, attribute.getW].slice(0, itemSize);
+  for (let i = 0; i < count; i++) {
+    // Getters undo normalization, so values come back in model units
+    getters.forEach((get, c) => {
+      array[i * itemSize + c] = get.call(attribute, i);
+    });
+  }
+  return new BufferAttribute(array, itemSize);
+}
+
+/**
+ * Clone a loaded mesh's geometry with a transform baked in, for instancing (usually its
+ * node-to-scene matrixWorld). Integer attributes (gltfpack quantization) are widened to
+ * float first so the bake cannot truncate them.
+ */
+export function bakeMeshGeometry(mesh: Mesh, matrix: Matrix4): BufferGeometry {
+  const geometry = mesh.geometry.clone();
+  for (const name of TRANSFORMED_ATTRIBUTES) {
+    const attribute = geometry.getAttribute(name);
+    if (attribute && (attribute instanceof InterleavedBufferAttribute || !(attribute.array instanceof Float32Array))) {
+      geometry.setAttribute(name, toFloat32(attribute));
+    }
+  }
+  geometry.applyMatrix4(matrix);
+  return geometry;
+}
+
+/**
+ * Copy a time range of a decoded buffer into its own AudioBuffer
+ */
+export function sliceAudioBuffer(buffer: AudioBuffer, start: number, end: number): AudioBuffer {
+  const from = Math.max(0, Math.floor(start * buffer.sampleRate));
+  const to = Math.min(buffer.length, Math.ceil(end * buffer.sampleRate));
+  const slice = new AudioBuffer({
+    length: Math.max(1, to - from),
+    numberOfChannels: buffer.numberOfChannels,
+    sampleRate: buffer.sampleRate
   });
+
+  for (let channel = 0; channel < buffer.numberOfChannels; channel++) {
+    slice.copyToChannel(buffer.getChannelData(channel).subarray(from, to), channel);
+  }
+
+  return slice;
+}
+
+/**
+ * Load an audio sprite with one request and one decode, split into per-sound buffers.
+ * The full sprite buffer is not retained once sliced.
+ */
+export async function loadAudioSprite(
+  path: string,
+  regions: Record<string, { start: number; end: number }>
+): Promise<Map<string, AudioBuffer>> {
+  const sprite = await loadAudio(path);
+  const buffers = new Map<string, AudioBuffer>();
+
+  for (const [key, region] of Object.entries(regions)) {
+    buffers.set(key, sliceAudioBuffer(sprite, region.start, region.end));
+  }
+
+  return buffers;
 }
@@ -1,5 +1,6 @@
 import * as THREE from 'three';
 import { GLTFLoader } from 'three/examples/jsm/loaders/GLTFLoader.js';
+import { bakeMeshGeometry, createGLTFLoader } from '../utils/loaders';
 import { assetPath } from '../utils/assetPath';
 
 export interface BushMeshAsset {
@@ -27,7 +28,7 @@ export class BushLoader {
   private bushFiles = ['bush02', 'bush04', 'bush07', 'bush08'];
 
   constructor() {
-    this.loader = new GLTFLoader();
+    this.loader = createGLTFLoader();
   }
 
   /**
@@ -60,10 +61,9 @@ export class BushLoader {
           scene.traverse((child) => {
             if (!(child instanceof THREE.Mesh)) return;
 
-            // Update matrix and clone geometry
-            child.updateMatrix();
-            const geometry = child.geometry.clone();
-            geometry.applyMatrix4(child.matrix);
+            // Clone geometry with the full node-to-scene transform baked in
+            child.updateWorldMatrix(true, false);
+            const geometry = bakeMeshGeometry(child, child.matrixWorld);
 
             // Apply PSX-style texture settings
             const processMaterial = (mat: THREE.Material) => {
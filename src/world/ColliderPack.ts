@@ -0,0 +1,125 @@
+import * as THREE from 'three';
+import { CollisionWorld } from './CollisionWorld';
+
+/**
+ * Baked colliders written by the conversion scripts (scripts/collider_fit.py).
+ *
+ * colliders.bin sits next to the GLBs and is 4-byte aligned, so shapes are
+ * typed-array views into the fetched buffer: no geometry is processed on load.
+ * Hull vertices/indices are in the layout Rapier's ColliderDesc.convexMesh() takes.
+ */
+
+const PACK_MAGIC = 0x52444c43; // 'CLDR' little-endian
+const PACK_VERSION = 1;
+const SHAPE_TYPES = ['none', 'cylinder', 'capsule', 'hull'] as const;
+
+export type BakedColliderType = typeof SHAPE_TYPES[number];
+
+export interface BakedCollider {
+  type: BakedColliderType;
+  /** Shape centre in the model's frame (glTF axes, metres) */
+  center: Float32Array;
+  /** Cylinder/capsule radius; for hulls the XZ radius around the centre */
+  radius: number;
+  /** Total height (Y extent) */
+  height: number;
+  /** Hull vertices (x, y, z) */
+  vertices?: Float32Array;
+  /** Hull triangles (3 indices each, counter-clockwise seen from outside) */
+  indices?: Uint32Array;
+  /** Counter-clockwise XZ outline of the hull (x, z pairs) */
+  footprint?: Float32Array;
+}
+
+export function parseColliderPack(buffer: ArrayBuffer): Map<string, BakedCollider> {
+  const view = new DataView(buffer);
+  if (view.getUint32(0, true) !== PACK_MAGIC || view.getUint32(4, true) !== PACK_VERSION) {
+    throw new Error('Unsupported collider pack');
+  }
+
+  const decoder = new TextDecoder();
+  const colliders = new Map<string, BakedCollider>();
+  const count = view.getUint32(8, true);
+  let offset = 12;
+
+  for (let i = 0; i < count; i++) {
+    const nameLength = view.getUint32(offset, true);
+    const name = decoder.decode(new Uint8Array(buffer, offset + 4, nameLength));
+    offset += 4 + Math.ceil(nameLength / 4) * 4;
+
+    const collider: BakedCollider = {
+      type: SHAPE_TYPES[view.getUint32(offset, true)],
+      center: new Float32Array(buffer, offset + 4, 3),
+      radius: view.getFloat32(offset + 16, true),
+      height: view.getFloat32(offset + 20, true)
+    };
+    offset += 24;
+
+    if (collider.type === 'hull') {
+      const vertexCount = view.getUint32(offset, true);
+      const triangleCount = view.getUint32(offset + 4, true);
+      const footprintCount = view.getUint32(offset + 8, true);
+      offset += 12;
+      collider.vertices = new Float32Array(buffer, offset, vertexCount * 3);
+      offset += vertexCount * 12;
+      collider.indices = new Uint32Array(buffer, offset, triangleCount * 3);
+      offset += triangleCount * 12;
+      collider.footprint = new Float32Array(buffer, offset, footprintCount * 2);
+      offset += footprintCount * 8;
+    }
+
+    colliders.set(name, collider);
+  }
+
+  return colliders;
+}
+
+/**
+ * Fetch a collider pack; an empty map when it is missing (callers fall back to config values)
+ */
+export async function loadColliderPack(url: string): Promise<Map<string, BakedCollider>> {
+  try {
+    const response = await fetch(url);
+    if (!response.ok) return new Map();
+    return parseColliderPack(await response.arrayBuffer());
+  } catch (error) {
+    console.warn(`Collider pack ${url} not loaded:`, error);
+    return new Map();
+  }
+}
+
+/**
+ * Register a baked collider for one placed instance (Y rotation + uniform scale).
+ * Returns the obstacle id, or null for shapes without a collider.
+ */
+export function addBakedCollider(
+  world: CollisionWorld,
+  collider: BakedCollider,
+  position: THREE.Vector3,
+  rotationY: number,
+  scale: number
+): number | null {
+  if (collider.type === 'none') return null;
+
+  const cos = Math.cos(rotationY);
+  const sin = Math.sin(rotationY);
+  // Same rotation as Object3D.rotation.y: x' = x cos + z sin, z' = -x sin + z cos
+  const place = (x: number, z: number) => new THREE.Vector2(
+    position.x + (x * cos + z * sin) * scale,
+    position.z + (-x * sin + z * cos) * scale
+  );
+
+  const centerY = position.y + collider.center[1] * scale;
+  const height = collider.height * scale;
+
+  if (collider.type === 'hull' && collider.footprint && collider.footprint.length >= 6) {
+    const points: THREE.Vector2[] = [];
+    for (let i = 0; i < collider.footprint.length; i += 2) {
+      points.push(place(collider.footprint[i], collider.footprint[i + 1]));
+    }
+    return world.addPolygon(points, centerY - height * 0.5, centerY + height * 0.5);
+  }
+
+  const center = place(collider.center[0], collider.center[2]);
+  return world.addCircle(new THREE.Vector3(center.x, centerY, center.y), collider.radius * scale, height);
+}
@@ -7,6 +7,15 @@ type BoxObstacle = {
   maxY: number;
 };
 
+type PolygonObstacle = {
+  id: number;
+  /** Convex outline, counter-clockwise in XZ */
+  points: THREE.Vector2[];
+  bounds: THREE.Box2;
+  minY: number;
+  maxY: number;
+};
+
 type CircleObstacle = {
   id: number;
   center: THREE.Vector2;
@@ -17,13 +26,15 @@ type CircleObstacle = {
 
 /**
  * Lightweight collision world.
- * - Horizontal resolution only (XZ plane) with simple circles/boxes.
+ * - Horizontal resolution only (XZ plane) with simple circles/boxes and convex
+ *   outlines (baked rock hulls, see ColliderPack.ts).
  * - Used to keep the player from walking through trees/cabin walls.
  */
 export class CollisionWorld {
   private nextId = 1;
   private boxes: BoxObstacle[] = [];
   private circles: CircleObstacle[] = [];
+  private polygons: PolygonObstacle[] = [];
   private readonly tempVec2 = new THREE.Vector2();
   private readonly tempVec3 = new THREE.Vector3();
 
@@ -56,9 +67,33 @@ export class CollisionWorld {
     return id;
   }
 
+  /**
+   * Add a convex XZ outline (points in either winding order).
+   */
+  public addPolygon(points: THREE.Vector2[], minY: number, maxY: number): number {
+    const id = this.nextId++;
+    let area = 0;
+    for (let i = 0; i < points.length; i++) {
+      const a = points[i];
+      const b = points[(i + 1) % points.length];
+      area += a.x * b.y - b.x * a.y;
+    }
+    const ordered = area < 0 ? [...points].reverse() : points;
+
+    this.polygons.push({
+      id,
+      points: ordered,
+      bounds: new THREE.Box2().setFromPoints(ordered),
+      minY,
+      maxY
+    });
+    return id;
+  }
+
   public remove(id: number): void {
     this.boxes = this.boxes.filter((b) => b.id !== id);
     this.circles = this.circles.filter((c) => c.id !== id);
+    this.polygons = this.polygons.filter((p) => p.id !== id);
   }
 
   /**
@@ -98,6 +133,15 @@ export class CollisionWorld {
           obstacle.radius
         );
       }
+
+      // Convex outlines
+      for (const obstacle of this.polygons) {
+        if (capsuleTopY < obstacle.minY || capsuleBottomY > obstacle.maxY + 0.4) {
+          continue;
+        }
+
+        this.resolveCirclePolygon(target, radius, obstacle);
+      }
     }
 
     return target;
@@ -129,6 +173,71 @@ export class CollisionWorld {
     }
   }
 
+  private resolveCirclePolygon(position: THREE.Vector3, radius: number, polygon: PolygonObstacle): void {
+    const { bounds, points } = polygon;
+    if (
+      position.x < bounds.min.x - radius || position.x > bounds.max.x + radius ||
+      position.z < bounds.min.y - radius || position.z > bounds.max.y + radius
+    ) {
+      return;
+    }
+
+    // Closest point on the outline, and the edge the centre is least deep behind
+    let inside = true;
+    let closestDistSq = Infinity;
+    let closestX = 0;
+    let closestZ = 0;
+    let leastDepth = Infinity;
+    let exitX = 0;
+    let exitZ = 0;
+
+    for (let i = 0; i < points.length; i++) {
+      const a = points[i];
+      const b = points[(i + 1) % points.length];
+      const ex = b.x - a.x;
+      const ez = b.y - a.y;
+      const lengthSq = ex * ex + ez * ez;
+      if (lengthSq < 1e-12) continue;
+
+      const t = Math.max(0, Math.min(1, ((position.x - a.x) * ex + (position.z - a.y) * ez) / lengthSq));
+      const px = a.x + ex * t;
+      const pz = a.y + ez * t;
+      const distSq = (position.x - px) ** 2 + (position.z - pz) ** 2;
+      if (distSq < closestDistSq) {
+        closestDistSq = distSq;
+        closestX = px;
+        closestZ = pz;
+      }
+
+      // Outward normal of a counter-clockwise edge is (ez, -ex)
+      const length = Math.sqrt(lengthSq);
+      const nx = ez / length;
+      const nz = -ex / length;
+      const depth = -((position.x - a.x) * nx + (position.z - a.y) * nz);
+      if (depth < 0) {
+        inside = false;
+      } else if (depth < leastDepth) {
+        leastDepth = depth;
+        exitX = nx;
+        exitZ = nz;
+      }
+    }
+
+    if (inside) {
+      // Push out through the nearest edge
+      position.x += exitX * (leastDepth + radius);
+      position.z += exitZ * (leastDepth + radius);
+      return;
+    }
+
+    if (closestDistSq < radius * radius) {
+      const dist = Math.sqrt(Math.max(closestDistSq, 1e-12));
+      const penetration = radius - dist;
+      position.x += ((position.x - closestX) / dist) * penetration;
+      position.z += ((position.z - closestZ) / dist) * penetration;
+    }
+  }
+
   private resolveCircleCircle(
     center: THREE.Vector3,
     radius: number,
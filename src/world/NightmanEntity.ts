@@ -1,5 +1,5 @@
 import * as THREE from 'three';
-import { GLTFLoader } from 'three/examples/jsm/loaders/GLTFLoader.js';
+import { createGLTFLoader } from '../utils/loaders';
 import { assetPath } from '../utils/assetPath';
 
 /**
@@ -59,7 +59,7 @@ export class NightmanEntity {
   public async initialize(): Promise<void> {
     console.log('👹 Loading Nightman model...');
 
-    const loader = new GLTFLoader();
+    const loader = createGLTFLoader();
 
     return new Promise((resolve, reject) => {
       loader.load(
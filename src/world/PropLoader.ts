@@ -1,6 +1,8 @@
 import * as THREE from 'three';
 import { GLTFLoader } from 'three/examples/jsm/loaders/GLTFLoader.js';
+import { bakeMeshGeometry, createGLTFLoader } from '../utils/loaders';
 import { assetPath } from '../utils/assetPath';
+import { BakedCollider, loadColliderPack } from './ColliderPack';
 
 export interface PropMeshAsset {
   geometry: THREE.BufferGeometry;
@@ -13,6 +15,8 @@ export interface PropAsset {
   meshes: PropMeshAsset[];
   colliderRadius: number;
   colliderHeight: number;
+  /** Convex hull fitted by convert-batch.py (colliders.bin), when present */
+  collider?: BakedCollider;
 }
 
 /**
@@ -24,13 +28,15 @@ export class PropLoader {
   private loadedProps: Map<string, PropAsset> = new Map();
 
   constructor() {
-    this.loader = new GLTFLoader();
+    this.loader = createGLTFLoader();
   }
 
   /**
    * Load rock variations from the multi-rock GLB file
    */
   async loadRocks(): Promise<Map<string, PropAsset>> {
+    const colliders = await loadColliderPack(assetPath('assets/models/props/colliders.bin'));
+
     return new Promise((resolve, reject) => {
       this.loader.load(
         assetPath('assets/models/props/rocks.glb'),
@@ -62,10 +68,10 @@ export class PropLoader {
               colliderHeight = 0.8;
             }
 
-            // Update matrix and clone geometry
+            // Update matrix and clone geometry; only the local transform is baked
+            // so each rock variation keeps its own origin
             child.updateMatrix();
-            const geometry = child.geometry.clone();
-            geometry.applyMatrix4(child.matrix);
+            const geometry = bakeMeshGeometry(child, child.matrix);
 
             // Apply PSX-style texture settings
             const processMaterial = (mat: THREE.Material) => {
@@ -94,7 +100,8 @@ export class PropLoader {
               name: propName,
               meshes: [meshAsset],
               colliderRadius,
-              colliderHeight
+              colliderHeight,
+              collider: colliders.get(child.name)
             };
 
             rockVariations.set(propName, asset);
@@ -2,6 +2,7 @@ import * as THREE from 'three';
 import { PropLoader, PropAsset } from './PropLoader';
 import { PropPlacementSystem } from './Systems/PropPlacementSystem';
 import { CollisionWorld } from './CollisionWorld';
+import { addBakedCollider } from './ColliderPack';
 import { FoliagePlacementCoordinator } from './Systems/FoliagePlacementCoordinator';
 
 interface PropInstancedMeshGroup {
@@ -122,7 +123,7 @@ export class PropManager {
   }
 
   /**
-   * Add collision obstacles for all props (XZ circles)
+   * Add collision obstacles for all props (baked hull outlines, else XZ circles)
    */
   private addPhysicsColliders(): void {
     if (!this.collisionWorld) {
@@ -140,6 +141,11 @@ export class PropManager {
       if (!asset) return;
 
       instances.forEach(instance => {
+        if (asset.collider) {
+          const id = addBakedCollider(this.collisionWorld, asset.collider, instance.position, instance.rotation, instance.scale);
+          if (id !== null) colliderCount++;
+          return;
+        }
         this.collisionWorld.addCircle(
           new THREE.Vector3(instance.position.x, asset.colliderHeight * 0.5, instance.position.z),
           asset.colliderRadius,
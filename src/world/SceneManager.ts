@@ -10,7 +10,7 @@ import { VolumetricSpotlight } from '../rendering/effects/VolumetricSpotlight';
 import { PlayerController } from './PlayerController';
 import { CameraController } from './CameraController';
 import { InputManager } from '../utils/InputManager';
-import { loadTexture } from '../utils/loaders';
+import { loadTexture, createGLTFLoader } from '../utils/loaders';
 import { assetPath } from '../utils/assetPath';
 import { world as ecsWorld } from './ECS';
 import {
@@ -189,7 +189,7 @@ export class SceneManager {
     this.scene.add(ambientLight);
 
     // Initialize GLTF loader
-    this.gltfLoader = new GLTFLoader();
+    this.gltfLoader = createGLTFLoader();
 
     // Initialize post-processing
     const composer = new EffectComposer(renderer);
@@ -1002,6 +1002,10 @@ export class SceneManager {
     // Initialize Enhanced Audio Manager (replaces old AudioManager for new features)
     console.log('🔊 Initializing Enhanced Audio System...');
     this.enhancedAudioManager = new EnhancedAudioManager(this.camera);
+    // Weapon and player sounds are decoded up front; everything else loads on first play
+    this.enhancedAudioManager.preloadCritical().catch((error) => {
+      console.warn('⚠️ Failed to preload critical audio', error);
+    });
 
     // Initialize Combat System
     console.log('⚔️ Initializing Combat System...');
@@ -1111,16 +1115,11 @@ export class SceneManager {
     try {
       console.log('🔊 Loading ambient forest audio...');
 
-      // Use old audio manager for now (if it exists)
-      if (this.audioManager) {
-        await this.audioManager.loadAmbient(assetPath('assets/audio/optimized/ambient/forest_night_loop.ogg'), 0.6);
-        this.setupWindAudio();
-      }
-
-      // Also start ambient loop with new enhanced audio manager
+      // Ambient loops go through the enhanced manager so AUDIO_MAP loop points apply
       if (this.enhancedAudioManager) {
-        this.enhancedAudioManager.startAmbientLoop();
+        await this.enhancedAudioManager.startAmbientLoop();
         console.log('✅ Enhanced ambient audio started');
+        this.setupWindAudio();
       }
     } catch (error) {
       console.warn('⚠️ Failed to load ambient audio', error);
@@ -1164,14 +1163,12 @@ export class SceneManager {
       const z = Math.sin(angle) * windRadius;
 
       try {
-        const windSound = await this.audioManager.play3D(
-          `wind_${i}`,
-          assetPath('assets/audio/optimized/ambient/wind_trees.ogg'),
+        const windSound = await this.enhancedAudioManager.createPositionalLoop(
+          'wind_trees',
           new THREE.Vector3(x, 2, z),
-          0.0, // Start at 0 volume
-          12.0, // Reference distance
-          true // Loop
+          { volume: 0.0, refDistance: 12.0 } // Start at 0 volume
         );
+        if (!windSound) continue; // preload() already warned
 
         // Keep playing at 0 volume (will increase during gusts)
         windSound.setVolume(0);
@@ -1396,6 +1393,11 @@ export class SceneManager {
     if (this.propManager) this.propManager.dispose();
     if (this.bushManager) this.bushManager.dispose();
     if (this.audioManager) this.audioManager.dispose();
+    this.windAudioSources.forEach(sound => {
+      if (sound.isPlaying) sound.stop();
+    });
+    this.windAudioSources = [];
+    if (this.enhancedAudioManager) this.enhancedAudioManager.dispose();
 
     // Dispose survival systems
     if (this.inventorySystem) this.inventorySystem.dispose();
@@ -8,7 +8,7 @@ import { world as ecsWorld } from '../ECS';
 import { AudioManager } from '../../audio/AudioManager';
 import { interactionPrompt } from '../../ui/InteractionPrompt';
 import { CollisionWorld } from '../CollisionWorld';
-import { assetPath } from '../../utils/assetPath';
+import { getAudioPath } from '../../audio/AudioMap';
 
 interface DoorSpawnConfig {
   openAngle: number;
@@ -104,10 +104,10 @@ async function loadDoorAudio(): Promise<void> {
   try {
     const [openBuf, closeBuf] = await Promise.all([
       new Promise<AudioBuffer>((resolve, reject) => {
-        loader.load(assetPath('assets/audio/optimized/environment/qubodup-DoorOpen08.ogg'), resolve, undefined, reject);
+        loader.load(getAudioPath('door_open'), resolve, undefined, reject);
       }),
       new Promise<AudioBuffer>((resolve, reject) => {
-        loader.load(assetPath('assets/audio/optimized/environment/qubodup-DoorClose08.ogg'), resolve, undefined, reject);
+        loader.load(getAudioPath('door_close'), resolve, undefined, reject);
       })
     ]);
 
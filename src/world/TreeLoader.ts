@@ -1,6 +1,8 @@
 import * as THREE from 'three';
 import { GLTFLoader } from 'three/examples/jsm/loaders/GLTFLoader.js';
+import { bakeMeshGeometry, createGLTFLoader } from '../utils/loaders';
 import { assetPath } from '../utils/assetPath';
+import { BakedCollider, loadColliderPack } from './ColliderPack';
 
 export interface TreeMeshAsset {
   geometry: THREE.BufferGeometry;
@@ -13,6 +15,8 @@ export interface TreeAsset {
   scale: number;
   colliderRadius: number;
   colliderHeight: number;
+  /** Trunk shape fitted by convert-trees.py (colliders.bin), when present */
+  collider?: BakedCollider;
 }
 
 export interface TreeConfig {
@@ -33,21 +37,36 @@ export interface TreeConfig {
     type: string;
     radius: number;
     height: number;
+    /** Shape centre in the model's frame (set when fitted by convert-trees.py) */
+    center?: number[];
+    fitted?: boolean;
   };
+  /** Shared atlas materials used by this variant (set by convert-trees.py --atlas) */
+  atlas_materials?: string[];
+  /** Generated LOD levels, LOD0 first (set by convert-trees.py --lods) */
+  lods?: {
+    level: number;
+    file: string;
+    triangles: number;
+    ratio: number;
+    distance?: number;
+  }[];
 }
 
 export class TreeLoader {
   private loader: GLTFLoader;
   private loadedTrees: Map<string, TreeAsset> = new Map();
+  // Atlas materials are identical in every variant's GLB, so all variants reuse the first copy
+  private sharedMaterials: Map<string, THREE.Material> = new Map();
 
   constructor() {
-    this.loader = new GLTFLoader();
+    this.loader = createGLTFLoader();
   }
 
   /**
    * Load a single tree model
    */
-  async loadTree(name: string, path: string, config: TreeConfig): Promise<TreeAsset> {
+  async loadTree(name: string, path: string, config: TreeConfig, collider?: BakedCollider): Promise<TreeAsset> {
     return new Promise((resolve, reject) => {
       this.loader.load(
         path,
@@ -66,10 +85,9 @@ export class TreeLoader {
               return;
             }
 
-            child.updateMatrix(); // ensure local matrix is up to date
-
-            const baseGeometry = child.geometry.clone();
-            baseGeometry.applyMatrix4(child.matrix);
+            // Bake the full node-to-scene transform, parents included
+            child.updateWorldMatrix(true, false);
+            const baseGeometry = bakeMeshGeometry(child, child.matrixWorld);
 
             // Apply PSX-style texture settings
             const processMaterial = (mat: THREE.Material) => {
@@ -80,19 +98,30 @@ export class TreeLoader {
               }
             };
 
+            const shareMaterial = (mat: THREE.Material): THREE.Material => {
+              if (!config.atlas_materials?.includes(mat.name)) return mat;
+              const shared = this.sharedMaterials.get(mat.name);
+              if (shared) {
+                mat.dispose();
+                return shared;
+              }
+              this.sharedMaterials.set(mat.name, mat);
+              return mat;
+            };
+
             if (Array.isArray(child.material)) {
               child.material.forEach(processMaterial);
               child.material.forEach(mat => {
                 meshes.push({
                   geometry: baseGeometry.clone(),
-                  material: mat
+                  material: shareMaterial(mat)
                 });
               });
             } else {
               processMaterial(child.material);
               meshes.push({
                 geometry: baseGeometry,
-                material: child.material
+                material: shareMaterial(child.material)
               });
             }
           });
@@ -107,7 +136,8 @@ export class TreeLoader {
             meshes,
             scale: 1.0,
             colliderRadius: config.physics_collider.radius,
-            colliderHeight: config.physics_collider.height
+            colliderHeight: config.physics_collider.height,
+            collider
           };
 
           this.loadedTrees.set(name, asset);
@@ -126,14 +156,16 @@ export class TreeLoader {
    * Load all tree models from config
    */
   async loadAllTrees(): Promise<Map<string, TreeAsset>> {
-    const response = await fetch(assetPath('assets/models/trees/trees.json'));
-    const config = await response.json();
+    const [config, colliders] = await Promise.all([
+      fetch(assetPath('assets/models/trees/trees.json')).then(response => response.json()),
+      loadColliderPack(assetPath('assets/models/trees/colliders.bin'))
+    ]);
 
     const treeNames = Object.keys(config.trees);
     const promises = treeNames.map(name => {
       const treeConfig = config.trees[name];
       const path = assetPath(`assets/models/trees/${treeConfig.file}`);
-      return this.loadTree(name, path, treeConfig);
+      return this.loadTree(name, path, treeConfig, colliders.get(treeConfig.file));
     });
 
     await Promise.all(promises);
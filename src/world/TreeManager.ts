@@ -3,6 +3,7 @@ import { computeBoundsTree, disposeBoundsTree, acceleratedRaycast } from 'three-
 import { TreeLoader, TreeAsset } from './TreeLoader';
 import { TreePlacementSystem } from './Systems/TreePlacementSystem';
 import { CollisionWorld } from './CollisionWorld';
+import { addBakedCollider } from './ColliderPack';
 import { WindSystem } from './Systems/WindSystem';
 import { FoliagePlacementCoordinator } from './Systems/FoliagePlacementCoordinator';
 
@@ -35,7 +36,7 @@ export interface TreeInstanceEntry {
  * - BVH acceleration via three-mesh-bvh (already in dependencies)
  * - Frustum culling (built-in to Three.js)
  * - Fog-based distance culling
- * - Physics collider generation for Rapier
+ * - Collision obstacles from baked trunk colliders (colliders.bin)
  */
 export class TreeManager {
   private scene: THREE.Scene;
@@ -180,11 +181,14 @@ export class TreeManager {
       if (!asset) return;
 
       instances.forEach((instance, index) => {
-        const colliderId = this.collisionWorld.addCircle(
-          new THREE.Vector3(instance.position.x, asset.colliderHeight * 0.5, instance.position.z),
-          asset.colliderRadius,
-          asset.colliderHeight
-        );
+        const colliderId = asset.collider
+          ? addBakedCollider(this.collisionWorld, asset.collider, instance.position, instance.rotation, instance.scale)
+          : this.collisionWorld.addCircle(
+            new THREE.Vector3(instance.position.x, asset.colliderHeight * 0.5, instance.position.z),
+            asset.colliderRadius,
+            asset.colliderHeight
+          );
+        if (colliderId === null) return;
         const entry = this.instancedEntryMap.get(`${treeType}:${index}`);
         if (entry) {
           entry.colliderId = colliderId;
@@ -1,5 +1,6 @@
 import * as THREE from 'three';
 import { GLTFLoader } from 'three/examples/jsm/loaders/GLTFLoader.js';
+import { createGLTFLoader } from '../utils/loaders';
 import { InputManager } from '../utils/InputManager';
 import { assetPath } from '../utils/assetPath';
 
@@ -38,7 +39,7 @@ export class WeaponManager {
     this.scene = scene;
     this.camera = camera;
     this.inputManager = inputManager;
-    this.gltfLoader = new GLTFLoader();
+    this.gltfLoader = createGLTFLoader();
 
     // Initialize viewmodel scene (rendered on top)
     this.viewmodelScene = new THREE.Scene();
@@ -1,7 +1,31 @@
+import { cpSync, existsSync } from 'node:fs';
 import glsl from 'vite-plugin-glsl';
 
+// Decoder/transcoder files the GLTF loaders fetch at runtime (src/utils/loaders.ts),
+// copied from three into public/ so dev and build both serve them
+const THREE_LIBS = 'node_modules/three/examples/jsm/libs';
+const DECODER_DIRS = {
+  'draco/gltf': 'public/draco',
+  'basis': 'public/basis'
+};
+
+function copyThreeDecoders() {
+  return {
+    name: 'copy-three-decoders',
+    buildStart() {
+      for (const [source, target] of Object.entries(DECODER_DIRS)) {
+        const from = `${THREE_LIBS}/${source}`;
+        if (!existsSync(from)) {
+          this.error(`${from} not found; run npm install`);
+        }
+        cpSync(from, target, { recursive: true });
+      }
+    }
+  };
+}
+
 export default {
-  plugins: [glsl()],
+  plugins: [glsl(), copyThreeDecoders()],
   assetsInclude: ['**/*.glb', '**/*.hdr', '**/*.ktx2', '**/*.wav', '**/*.ogg'],
   server: { open: true },
   base: '/the-nightman-cometh/'